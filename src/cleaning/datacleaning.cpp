@@ -241,9 +241,8 @@ namespace cleaning
         float _test(ExtentRule const & self, size_t sz, float const *data)
         {   return _test_extent(self, sz, data); }
 
-        float _test(PingPongRule const & self, size_t sz, float const *data)
+        float _pingpong(PingPongRule const & self, float ext, size_t sz, float const *data)
         {
-            auto ext = _test_extent(self, sz, data);
             if(!std::isfinite(ext) || ext == 0.0f)
                 return std::numeric_limits<float>::quiet_NaN();
 
@@ -259,6 +258,9 @@ namespace cleaning
             return conv;
         }
 
+        float _test(PingPongRule const & self, size_t sz, float const *data)
+        { return _pingpong(self, _test_extent(self, sz, data), sz, data); }
+
         float _test(PhaseJumpRule const &self, size_t sz, float const *data)
         {
             int num_jumps = 0;
@@ -274,21 +276,24 @@ namespace cleaning
             return float(num_jumps);
         }
 
+        template <typename T>
+        void _set(T const & self, DataOutput & out, size_t icyc, float value)
+        {
+            out.values[icyc] = value;
+            if(_testmin(self, value))
+                out.minv.push_back((int) icyc);
+            if(_testmax(self, value))
+                out.maxv.push_back((int) icyc);
+        }
+
         template <typename T>
         DataOutput _apply(T const & self, DataInfo const & info)
         {
             DataOutput out(info.ncycles);
             for(size_t icyc = 0; icyc < info.ncycles; ++icyc)
-            {
-                auto value = _test(self,
-                                   info.stop[icyc]-info.start[icyc],
-                                   info.data+info.start[icyc]);
-                out.values[icyc] = value;
-                if(_testmin(self, value))
-                    out.minv.push_back((int) icyc);
-                if(_testmax(self, value))
-                    out.maxv.push_back((int) icyc);
-            }
+                _set(self, out, icyc, _test(self,
+                                            info.stop[icyc]-info.start[icyc],
+                                            info.data+info.start[icyc]));
             return out;
         }
     }
@@ -342,4 +347,29 @@ namespace cleaning
         }
         return out;
     }
+
+    std::vector<DataOutput> fusedapply(DataCleaning const & self,
+                                       DataInfo     const & info,
+                                       DataInfo     const & initial,
+                                       DataInfo     const & measures)
+    {
+        bool samepercentiles = self.extent.minpercentile == self.pingpong.minpercentile
+                            && self.extent.maxpercentile == self.pingpong.maxpercentile;
+
+        std::vector<DataOutput> out(4, DataOutput(info.ncycles));
+        for(size_t icyc = 0; icyc < info.ncycles; ++icyc)
+        {
+            size_t sz   = info.stop[icyc]-info.start[icyc];
+            auto   data = info.data+info.start[icyc];
+            auto   ext  = _test(self.extent, sz, data);
+            _set(self.population, out[0], icyc, _test(self.population, sz, data));
+            _set(self.hfsigma,    out[1], icyc, _test(self.hfsigma,    sz, data));
+            _set(self.extent,     out[2], icyc, ext);
+            _set(self.pingpong,   out[3], icyc,
+                 samepercentiles ? _pingpong(self.pingpong, ext, sz, data)
+                                 : _test   (self.pingpong,      sz, data));
+        }
+        out.emplace_back(self.saturation.apply(initial, measures));
+        return out;
+    }
 }
@@ -149,4 +149,18 @@ namespace cleaning {
         PingPongRule       pingpong;
         SaturationRule     saturation;
     };
+
+    /* Evaluates the population, hfsigma, extent, pingpong and saturation rules
+     * with the loops interchanged: the first 4 rules are applied one cycle at
+     * a time rather than one rule at a time. Each rule still scans the cycle
+     * itself, but it does so while the cycle is in cache. The extent is shared
+     * with the pingpong rule when their percentiles are the same. The first 4
+     * rules use *cycles*.
+     *
+     * Outputs are in that order and identical to those of each rule's apply.
+     */
+    std::vector<DataOutput> fusedapply(DataCleaning const &,
+                                       DataInfo     const & cycles,
+                                       DataInfo     const & initial,
+                                       DataInfo     const & measures);
 }
@@ -477,6 +477,36 @@ namespace cleaning::datacleaning::rules { namespace {
                                          _toinput(bead, measstart, measstop));
                     return _totuple(partial, "saturation", x);
                 });
+
+        cls.def("fused",
+                [partial](CLS const & self,
+                          ndarray<float> bead,
+                          ndarray<int>   start,
+                          ndarray<int>   stop,
+                          ndarray<int>   initstart,
+                          ndarray<int>   initstop,
+                          ndarray<int>   measstart,
+                          ndarray<int>   measstop)
+                {
+                    std::vector<DataOutput> x;
+                    {
+                        py::gil_scoped_release _;
+                        x = fusedapply(self,
+                                       _toinput(bead, start, stop),
+                                       _toinput(bead, initstart, initstop),
+                                       _toinput(bead, measstart, measstop));
+                    }
+                    return py::make_tuple(_totuple(partial, "population", x[0]),
+                                          _totuple(partial, "hfsigma",    x[1]),
+                                          _totuple(partial, "extent",     x[2]),
+                                          _totuple(partial, "pingpong",   x[3]),
+                                          _totuple(partial, "saturation", x[4]));
+                },
+                R"_(Evaluates the population, hfsigma, extent, pingpong and saturation
+rules in a single call. The first 4 rules are applied one cycle at a time, using
+the cycles in [start, stop). The saturation uses the others.
+
+Returns the same partials as calling each rule in that order.)_");
         _defaults(cls);
     }
 }}
@@ -11,7 +11,7 @@ from   itertools                    import repeat
 import numpy                        as     np
 
 from   taskcontrol.processor        import Processor
-from   data.views                   import Cycles, Beads
+from   data.views                   import Cycles, Beads, allocates
 from   taskmodel                    import Task, Level
 from   signalfilter.noisereduction  import Filter
 from   utils                        import initdefaults
@@ -47,7 +47,7 @@ class BeadSubtractionTask(Task):
 class BeadSubtractionProcessor(Processor[BeadSubtractionTask]):
     "Processor for subtracting beads"
     @classmethod
-    def _action(cls, task, cache, frame, info):
+    def _action(cls, task, cache, frame, info, copy = True):
         key = info[0][1] if isinstance(info[0], tuple) else None
         sub = None if cache is None else cache.get(key, None)
         if sub is None:
@@ -55,7 +55,7 @@ class BeadSubtractionProcessor(Processor[BeadSubtractionTask]):
             if cache is not None:
                 cache[key] = sub
 
-        out             = np.copy(info[1])
+        out             = np.copy(info[1]) if copy else info[1]
         _cleaningcst(task, out)
         out[:len(sub)] -= sub[:len(out)]
         return info[0], out
@@ -71,12 +71,15 @@ class BeadSubtractionProcessor(Processor[BeadSubtractionTask]):
             return toframe
 
         toframe = toframe.new().discarding(task.beads)
-        return toframe.withaction(partial(cls._action, task, cache))
+        return toframe.withaction(allocates(
+            partial(cls._action, task, cache),
+            partial(cls._action, task, cache, copy = False)
+        ))
 
     def run(self, args):
         "updates frames"
         if self.task.beads:
-            cache = args.data.setcachedefault(self, {})
+            cache = args.data.setcachedefault(self, self.boundedcache())
             args.apply(self.apply(cache = cache, **self.config()))
 
     def beads(self, _, selected: Iterable[int]) -> Iterable[int]:  # type: ignore
@@ -160,7 +163,7 @@ class FixedBeadDetectionProcessor(Processor[FixedBeadDetectionTask]):
 
     def run(self, args):
         "updates frames"
-        cache = args.data.setcachedefault(self, {})
+        cache = args.data.setcachedefault(self, self.boundedcache())
         args.apply(self.apply(cache = cache, **self.config()))
 
     @classmethod
@@ -5,6 +5,7 @@ from   functools                import partial
 from   typing                   import Optional
 import numpy                    as     np
 from   data                     import Track
+from   data.views               import inplace
 from   taskmodel                import Level, PHASE, Task
 from   taskcontrol.processor    import Processor
 from   utils                    import initdefaults
@@ -149,7 +150,7 @@ class ClippingProcessor(Processor[ClippingTask]):
         "applies the task to a frame or returns a method that will"
         if toframe is None:
             return partial(cls.apply, **cnf)
-        return toframe.withaction(partial(cls._action, ClippingTask(**cnf)))
+        return toframe.withaction(inplace(partial(cls._action, ClippingTask(**cnf))))
 
     def run(self, args):
         "updates the frames"
@@ -11,6 +11,7 @@ from    typing       import (
 
 import  numpy             as     np
 
+from    data.views              import allocates
 from    taskcontrol.processor   import Processor, ProcessorException
 from    taskmodel               import Task, Level, PHASE, InstrumentType
 from    utils                   import initdefaults
@@ -229,6 +230,7 @@ CleaningTaskType = TypeVar('CleaningTaskType', bound = DataCleaningTaskBase)
 class DataCleaningProcessorBase(Processor[CleaningTaskType]):
     "Processor for cleaning the data"
     tasktype: Type[DataCleaningTaskBase]  # type: ignore
+    FUSED_RULES: ClassVar[Tuple[str, ...]] = ('population', 'hfsigma', 'extent', 'pingpong')
 
     @classmethod
     def __get(cls, name, cnf):
@@ -249,38 +251,55 @@ class DataCleaningProcessorBase(Processor[CleaningTaskType]):
 
     @classmethod
     def __precorrectiontest(cls, frame, bead, cnf) -> Iterator[Partial]:
-        phases = frame.track.phase.select
-        sel    = cls.tasktype(**cnf).core
-        pha    = cycs = None
-        rules = (
+        rules = [
             name for name in cls.tasktype.PRE_CORRECTION_CYCLES
             if cls._doesapply(name, frame)
-        )
-        for name in rules:
-            cur = cls.__get(name+'phases', cnf)
-            if cycs is None or pha != cur:
-                pha, cycs = cur, (phases(..., cur[0]), phases(..., cur[1]+1))
-            yield getattr(sel, name)(bead, *cycs)
+        ]
+        yield from cls.__rules(frame, bead, cnf, cls.tasktype(**cnf).core, rules)
 
     @classmethod
     def __postcorrectiontest(cls, frame, bead, cnf) -> Iterator[Partial]:
         phases = frame.track.phase.select
         sel    = cls.tasktype(**cnf).core
-        pha    = cycs = None
-        rules = (
+        rules  = [
             name for name in cls.tasktype.POST_CORRECTION_CYCLES
             if cls._doesapply(name, frame)
-        )
+        ]
+
+        fused = cls.FUSED_RULES
+        if (
+                tuple(rules[:len(fused)]) == fused
+                and len({tuple(cls.__get(i+'phases', cnf)) for i in fused}) == 1
+        ):
+            # all rules are computed in a single native call, cycle by cycle
+            cur  = cls.__get(fused[0]+'phases', cnf)
+            sat  = cls.__get('saturationphases', cnf)
+            out  = sel.fused(
+                bead,
+                phases(..., cur[0]), phases(..., cur[1]+1),
+                *(phases(..., i) for i in (sat[0], sat[0]+1, sat[1], sat[1]+1))
+            )
+            yield from out[:-1]
+            yield from cls.__rules(frame, bead, cnf, sel, rules[len(fused):])
+            yield out[-1]
+            return
+
+        yield from cls.__rules(frame, bead, cnf, sel, rules)
+
+        cur = cls.__get('saturationphases', cnf)
+        tmp = (phases(..., i) for i in (cur[0], cur[0]+1, cur[1], cur[1]+1))
+        yield sel.saturation(bead, *tmp)
+
+    @classmethod
+    def __rules(cls, frame, bead, cnf, sel, rules) -> Iterator[Partial]:
+        phases = frame.track.phase.select
+        pha    = cycs = None
         for name in rules:
             cur = cls.__get(name+'phases', cnf)
             if cycs is None or pha != cur:
                 pha, cycs = cur, (phases(..., cur[0]), phases(..., cur[1]+1))
             yield getattr(sel, name)(bead, *cycs)
 
-        cur = cls.__get('saturationphases', cnf)
-        tmp = (phases(..., i) for i in (cur[0], cur[0]+1, cur[1], cur[1]+1))
-        yield sel.saturation(bead, *tmp)
-
     @classmethod
     def __removebadcycles(cls, frame, cnf, val, arr):
         bad = cls.tasktype.badcycles(val)
@@ -297,8 +316,9 @@ class DataCleaningProcessorBase(Processor[CleaningTaskType]):
         return False
 
     @classmethod
-    def _compute(cls, cnf, frame, info):
-        info = info[0], np.copy(info[1])
+    def _compute(cls, cnf, frame, info, copy = True):
+        if copy:
+            info = info[0], np.copy(info[1])
         res  = cls.compute(frame, info, **cnf)
         if isinstance(res, Exception):
             raise res  # pylint: disable=raising-bad-type
@@ -329,11 +349,14 @@ class DataCleaningProcessorBase(Processor[CleaningTaskType]):
     @classmethod
     def apply(cls, toframe = None, **cnf):
         "applies the task to a frame or returns a method that will"
-        return toframe.withaction(partial(cls._compute, cnf))
+        return toframe.withaction(allocates(
+            partial(cls._compute, cnf),
+            partial(cls._compute, cnf, copy = False)
+        ))
 
     def run(self, args):
         "updates the frames"
-        cache = args.data.setcachedefault(self, dict())
+        cache = args.data.setcachedefault(self, self.boundedcache())
         return args.apply(partial(self.apply, cache = cache, **self.config()))
 
 class DataCleaningProcessor(DataCleaningProcessorBase[DataCleaningTask]):
@@ -54,6 +54,7 @@ class CleaningDataFrameFactory(DataFrameFactory[Beads]):
     extra *status* column. The latter contains one dataframe relative to the
     row's bead. That dataframe is the one produced when no options are provided.
     """
+    BATCHED = False  # the cleaning actions are applied in `dataframe`, item per item
     def __init__(self, task, buffers, frame):
         self.__status  = task.measures.get('status', False)
         self.__fixed   = (
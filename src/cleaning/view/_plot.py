@@ -117,6 +117,12 @@ class GuiDataCleaningProcessor(DataCleaningProcessor):
         cache['gui'] = np.isnan(curr)
         cache['exc'] = exc
 
+    def run(self, args):
+        "updates the frames"
+        # the gui results are not recomputed when missing: these cannot be evicted
+        cache = args.data.setcachedefault(self, dict())
+        return args.apply(partial(self.apply, cache = cache, **self.config()))
+
     @classmethod
     def computeall(
             cls,
@@ -22,7 +22,7 @@ class ScriptAnaIO(TrackIO):
 
     @staticmethod
     def __open(path):
-        mdl = taskstore.load(str(path))['tasks'][0]
+        mdl = taskstore.memoload(str(path))['tasks'][0]
         cnf = mdl[0].config()
         rep = lambda x: x
         if sys.platform == 'linux':
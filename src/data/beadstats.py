@@ -2,13 +2,15 @@
 # -*- coding: utf-8 -*-
 "Compute raw precision"
 from typing       import (
-    Dict, Union, Optional, Iterable, Iterator, Tuple, Callable, Type, TYPE_CHECKING,
+    Dict, List, Union, Optional, Iterable, Iterator, Tuple, Type, TYPE_CHECKING,
     overload, cast
 )
 
 import numpy as np
 
 from signalfilter import nanhfsigma, PrecisionAlg
+# pylint: disable=no-name-in-module,import-error
+from signalfilter._core.stats import batchnanhfsigma, batchnanextent, batchnanmedian
 
 if TYPE_CHECKING:
     from .track import Track
@@ -36,7 +38,56 @@ def phaseposition(track, phase: int, ibead: Union[int, np.ndarray]) -> float:
     return np.nanmedian(vals) if len(vals) else np.NaN
 
 
-RawPrecisionTypes = Union[Type['PhaseRangeRawPrecision'], Type['NormalizedRawPrecision']]
+def _batchbeads(
+        track:  'Track',
+        ibeads: Optional[Iterable[int]],
+        inds:   Tuple[int, int]
+) -> Tuple[List[int], List[np.ndarray], np.ndarray, np.ndarray]:
+    keys  = list(track.beads.keys() if ibeads is None or ibeads is Ellipsis else ibeads)
+    beads = track.beads
+    first = track.phases[0,0]
+    return (
+        keys,
+        [np.asarray(beads[i], dtype = 'f4') for i in keys],
+        np.ascontiguousarray(track.phases[:, inds[0]] - first, dtype = 'i4'),
+        np.ascontiguousarray(track.phases[:, inds[1]] - first, dtype = 'i4')
+    )
+
+def beadextensions(
+        track:    'Track',
+        ibeads:   Optional[Iterable[int]] = None,
+        rng                               = (5., 95.),
+        nthreads: int                     = 0
+) -> Dict[int, float]:
+    """
+    Return the median bead extension (phase 3 - phase 1) for all beads at once.
+
+    Beads are computed in parallel, *nthreads* <= 0 meaning all cores.
+    """
+    phase = track.phase[...]
+    keys, data, starts, stops = _batchbeads(track, ibeads, (phase.initial, phase.pull+1))
+    if not keys:
+        return {}
+    return dict(zip(keys, batchnanextent(data, starts, stops, *rng, nthreads)))
+
+def phasepositions(
+        track,
+        phase:    int,
+        ibeads:   Optional[Iterable[int]] = None,
+        nthreads: int                     = 0
+) -> Dict[int, float]:
+    """
+    Return the median position for a given phase for all beads at once.
+
+    Beads are computed in parallel, *nthreads* <= 0 meaning all cores.
+    """
+    keys, data, starts, stops = _batchbeads(track, ibeads, (phase, phase+1))
+    if not keys:
+        return {}
+    return dict(zip(keys, batchnanmedian(data, starts, stops, nthreads)))
+
+RawPrecisionTypes    = Union[Type['PhaseRangeRawPrecision'], Type['NormalizedRawPrecision']]
+RawPrecisionComputer = Union['PhaseRangeRawPrecision', 'NormalizedRawPrecision']
 
 
 class RawPrecisionCache:
@@ -131,12 +182,10 @@ class RawPrecisionCache:
                     beads.keys() if ibead is None or ibead is Ellipsis else ibead
                 ))
                 if phases is not None:
-                    return ((i, fcn(i)) for i in keys)
+                    return iter(fcn.batch(keys).items())
 
-                if len(keys-set(cache)) > 0 and phases is None:
-                    cache.update(
-                        (i, fcn(i)) for i in keys-set(cache)
-                    )
+                if len(keys-set(cache)) > 0:
+                    cache.update(fcn.batch(keys-set(cache)))
                 return iter((i, cache[i]) for i in keys)
         return val
 
@@ -166,15 +215,20 @@ class PhaseRangeRawPrecision:
             nanhfsigma(self.beads[ibead], zip(*self.phases), self.rate)
         )
 
+    def batch(self, ibeads: Iterable[int], nthreads: int = 0) -> Dict[int, float]:
+        "computes all beads at once, in parallel"
+        keys = list(ibeads)
+        if not keys:
+            return {}
+        vals = _batchhfsigma(self.beads, keys, self.phases, self.rate, nthreads)
+        return dict(zip(keys, np.maximum(vals, PrecisionAlg.MINPRECISION).tolist()))
+
     @classmethod
-    def function(cls, beads, phase) -> Callable[[int], float]:
+    def function(cls, beads, phase) -> 'RawPrecisionComputer':
         "return an instance able to compute raw precisions"
-        return cast(
-            Callable[[int], float],
-            (
-                cls if isinstance(phase, tuple) or phase is None else NormalizedRawPrecision
-            )(beads, phase)
-        )
+        return (
+            cls if isinstance(phase, tuple) or phase is None else NormalizedRawPrecision
+        )(beads, phase)
 
 class NormalizedRawPrecision:
     """
@@ -207,15 +261,32 @@ class NormalizedRawPrecision:
             sum(nanhfsigma(self.beads[ibead], zip(*i), self.rate)*j for i, j in self.phases)
         )
 
-    @classmethod
-    def function(cls, beads, phase) -> Callable[[int], float]:
-        "return an instance able to compute raw precisions"
-        return cast(
-            Callable[[int], float],
-            (
-                cls if isinstance(phase, dict) or phase is None else PhaseRangeRawPrecision
-            )(beads, phase)
+    def batch(self, ibeads: Iterable[int], nthreads: int = 0) -> Dict[int, float]:
+        "computes all beads at once, in parallel"
+        keys = list(ibeads)
+        if not keys:
+            return {}
+        vals = sum(
+            _batchhfsigma(self.beads, keys, i, self.rate, nthreads) * j
+            for i, j in self.phases
         )
+        return dict(zip(keys, np.maximum(vals, PrecisionAlg.MINPRECISION).tolist()))
 
+    @classmethod
+    def function(cls, beads, phase) -> 'RawPrecisionComputer':
+        "return an instance able to compute raw precisions"
+        return (
+            cls if isinstance(phase, dict) or phase is None else PhaseRangeRawPrecision
+        )(beads, phase)
+
+def _batchhfsigma(beads, keys, phases, rate, nthreads) -> np.ndarray:
+    # the single-bead computation includes the first frame of the next phase
+    return batchnanhfsigma(
+        [np.asarray(beads[i], dtype = 'f4') for i in keys],
+        np.ascontiguousarray(phases[0], dtype = 'i4'),
+        np.ascontiguousarray(phases[1], dtype = 'i4')+1,
+        rate,
+        nthreads
+    )
 
 _RAWPRECION_RATE: float = 10.
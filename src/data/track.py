@@ -20,8 +20,10 @@ from   .views           import Beads, Cycles, isellipsis, TrackView
 from   .trackio         import opentrack, PATHTYPES, instrumentinfo
 from   .beadstats       import (
     RawPrecisionCache  as _RawPrecisionCache,
-    beadextension as _beadextension,
-    phaseposition as _phaseposition,
+    beadextension  as _beadextension,
+    phaseposition  as _phaseposition,
+    beadextensions as _beadextensions,
+    phasepositions as _phasepositions,
 )
 
 IDTYPE       = Union[None, int, range]  # missing Ellipsys as mypy won't accept it
@@ -590,10 +592,19 @@ class Track:
         "returns whether the data was already acccessed"
         return self._data is not None
 
-    def load(self, cycles: Optional[slice] = None) -> 'Track':
-        "Loads the data"
+    def load(
+            self,
+            cycles: Optional[slice]         = None,
+            beads:  Optional[Sequence[int]] = None
+    ) -> 'Track':
+        """
+        Loads the data.
+
+        If the IO handler allows it, only the first *cycles* and the *beads*
+        requested are read.
+        """
         if self._data is None and self._path is not None:
-            opentrack(self, cycles)
+            opentrack(self, cycles, beads)
         return self
 
     def unload(self):
@@ -646,8 +657,10 @@ class Track:
     if __doc__ is not None:
         setattr(rawprecision, '__doc__', getattr(_RawPrecisionCache.get, '__doc__', None))
 
-    beadextension = _beadextension
-    phaseposition = _phaseposition
+    beadextension  = _beadextension
+    phaseposition  = _phaseposition
+    beadextensions = _beadextensions
+    phasepositions = _phasepositions
 
     def shallowcopy(self):
         "make a shallow copy of the track: different containers but for the true data"
@@ -33,7 +33,8 @@ def globfiles(path:str):
 
 class TrackIO(ABC):
     "interface class for Track IO"
-    PRIORITY = 1000
+    PRIORITY    = 1000
+    PARTIALREAD = False  # whether `open` honours the `cycles` and `beads` keywords
     @classmethod
     @abstractmethod
     def check(cls, path:PATHTYPES, **_) -> Optional[PATHTYPES]:
@@ -3,7 +3,7 @@
 # pylint: disable=arguments-differ
 "Loading and save tracks"
 import  sys
-from    typing    import Any, Union, Dict, Optional, TYPE_CHECKING
+from    typing    import Any, Union, Dict, Optional, Sequence, TYPE_CHECKING
 from    pathlib   import Path
 import  numpy     as     np
 
@@ -23,7 +23,12 @@ class Handler:
         self.path    = path
         self.handler = handler
 
-    def __call__(self, track = None, cycles: Optional[slice] = None) -> "Track":
+    def __call__(
+            self,
+            track                           = None,
+            cycles: Optional[slice]         = None,
+            beads:  Optional[Sequence[int]] = None
+    ) -> "Track":
         path = self.path
         if (not isinstance(path, (str, Path))) and len(path) == 1:
             path = path[0]
@@ -32,11 +37,13 @@ class Handler:
             from .track import Track as _Track
             track = _Track()
 
+        opts   = {} if beads is None or not self.partialread else {'beads': beads}
         kwargs = self.handler.open(
             path,
             notall = getattr(track, 'notall', True),
             axis   = getattr(track, 'axis',   'Zaxis'),
-            cycles = cycles
+            cycles = cycles,
+            **opts
         )
         state  = track.__getstate__()
         self.__instrument(state, kwargs)
@@ -51,6 +58,11 @@ class Handler:
         track.__setstate__(state)
         return track
 
+    @property
+    def partialread(self) -> bool:
+        "whether the handler can read only the first cycles or some beads of a track"
+        return getattr(self.handler, 'PARTIALREAD', False)
+
     def instrumenttype(self) -> str:
         "return the instrument type"
         path = self.path[0] if isinstance(self.path, (list, tuple)) else self.path
@@ -196,9 +208,9 @@ def checkpath(track, **opts) -> Handler:
     """
     return Handler.check(track, **opts)
 
-def opentrack(track, cycles: Optional[slice] = None):
+def opentrack(track, cycles: Optional[slice] = None, beads: Optional[Sequence[int]] = None):
     "Opens a track depending on its extension"
-    checkpath(track)(track, cycles = cycles)
+    checkpath(track)(track, cycles = cycles, beads = beads)
 
 def instrumenttype(track) -> str:
     "return the instrument type"
@@ -13,8 +13,9 @@ from    ._pickle           import PickleIO
 
 class LegacyTrackIO(TrackIO):
     "checks and opens legacy track paths"
-    PRIORITY = -1000
-    TRKEXT   = '.trk'
+    PRIORITY    = -1000
+    PARTIALREAD = True
+    TRKEXT      = '.trk'
     @classmethod
     def check(cls, path:PATHTYPES, **_) -> Optional[PATHTYPES]:
         "checks the existence of a path"
@@ -28,7 +29,8 @@ class LegacyTrackIO(TrackIO):
         stop   = cycles.stop+5 if cycles else -1
         axis   = kwa.pop('axis', 'Z')
         axis   = getattr(axis, 'value', axis)[0]
-        return readtrack(str(path), kwa.pop('notall', True), axis, start, stop)
+        beads  = sorted(kwa.pop('beads', None) or ())
+        return readtrack(str(path), kwa.pop('notall', True), axis, start, stop, beads)
 
     @staticmethod
     def instrumentinfo(path: str) -> Dict[str, Any]:
@@ -2,11 +2,15 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=arguments-differ
 "Loading and save tracks"
+from    collections              import OrderedDict
+from    concurrent.futures       import ThreadPoolExecutor
+from    threading                import Lock
 from    typing                   import Tuple, Optional, Dict, Any, List, cast
 from    pathlib                  import Path
+import  re
+import  sys
 import  numpy                    as     np
 from    numpy.lib.stride_tricks  import as_strided
-from    scipy.interpolate        import interp1d
 import  pandas                   as     pd
 from    legacy                   import readtrack  # pylint: disable=no-name-in-module
 from    utils                    import initdefaults
@@ -19,6 +23,7 @@ class LIAFilesIOConfiguration:
     sep:             str       = "[;,]"
     header:          int       = 4
     engine:          str       = "python"
+    fastparse:       bool      = True
     indexbias:       int       = -7
     colnames:        str       = '% Time (s), Amplitude (V)'
     maxcycles:       float     = 1.3
@@ -46,12 +51,71 @@ class LIAFilesIOConfiguration:
 
         return MuWellsFilesIO.open(lst, **self.config())
 
+class _LIACache:
+    """
+    Parsed LIA files, kept for as long as the files are unchanged.
+
+    Keys include the file's modification time and size. The least recently
+    used items are discarded once their total size exceeds `maxbytes`.
+    """
+    maxbytes = 256 << 20
+
+    def __init__(self):
+        self._lock  = Lock()
+        self._items: OrderedDict = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def nbytes(value) -> int:
+        "returns the memory used by an item"
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index = True).sum())
+        if isinstance(value, (list, tuple)):
+            return sum(sys.getsizeof(i) for i in value)
+        return sys.getsizeof(value)
+
+    @staticmethod
+    def key(path: PATHTYPE, *args) -> tuple:
+        "returns the key for a file"
+        stat = Path(path).stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size) + args
+
+    def get(self, key, default = None):
+        "returns a cached item"
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def set(self, key, value):
+        "adds a cached item, unless it is bigger than the cache itself"
+        size = self.nbytes(value)
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._items.pop(key)[1]
+            if size > self.maxbytes:
+                return value
+
+            self._items[key] = (value, size)
+            self._bytes     += size
+            while self._bytes > self.maxbytes:
+                self._bytes -= self._items.popitem(last = False)[1][1]
+        return value
+
+    def clear(self):
+        "clears the cache"
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
 class MuWellsFilesIO(TrackIO):
     "checks and opens legacy GR files"
     LEGACY  = -500
     DEFAULT = LIAFilesIOConfiguration()
     TRKEXT  = '.trk'
     LIAEXT  = '.txt'
+    CACHE   = _LIACache()
     @classmethod
     def check(cls, path:PATHTYPES, **kwa) -> Optional[PATHTYPES]:
         "checks the existence of paths"
@@ -79,15 +143,14 @@ class MuWellsFilesIO(TrackIO):
         trk = next(i for i in allpaths if i.suffix == cls.TRKEXT)
         lia: Tuple[Path, ...] = ()
         for itm in (i for i in allpaths if i.suffix  == cls.LIAEXT):
-            with open(itm, "r", encoding = "utf-8") as stream:
-                lines = [line.strip() for __, line in zip(range(cnf.header+2), stream)]
-                if not (
-                        len(lines) != cnf.header+2
-                        or any(line[0] != '%' for line in lines[:-1])
-                        or lines[-1][0] == '%'
-                        or cnf.colnames not in lines
-                ):
-                    lia += (itm,)
+            lines = cls.__headlines(itm, cnf.header+2)
+            if not (
+                    len(lines) != cnf.header+2
+                    or any(line[0] != '%' for line in lines[:-1])
+                    or lines[-1][0] == '%'
+                    or cnf.colnames not in lines
+            ):
+                lia += (itm,)
 
         if len(lia) == 0:
             return None
@@ -121,9 +184,13 @@ class MuWellsFilesIO(TrackIO):
         output['instrument'] = cls.instrumentinfo(paths)
         output['sequencelength']     = {}
         output['experimentallength'] = {}
-        for i, liapath in enumerate(paths[1:]):
-            if Path(liapath).suffix == cls.LIAEXT:
-                cls.__update(output, i, str(liapath), cnf)
+
+        # files are parsed in parallel but synchronized one after the other
+        lias = [(i, str(j)) for i, j in enumerate(paths[1:]) if Path(j).suffix == cls.LIAEXT]
+        with ThreadPoolExecutor(max(1, min(len(lias), 4))) as pool:
+            frames = list(pool.map(lambda i: cls.readframes(i[1], cnf), lias))
+        for (i, liapath), frame in zip(lias, frames):
+            cls.__update(output, i, liapath, frame, cnf)
 
         if not any(isinstance(i, int) for i in output):
             raise TrackIOError("Could not add µwells data to the current track")
@@ -149,22 +216,80 @@ class MuWellsFilesIO(TrackIO):
                 )
 
             elif key == 'zmag':
-                output[key] = interp1d(
+                output[key] = np.interp(
+                    np.arange(nframes),
                     np.arange(len(output[key]))*ratio,
                     output[key],
-                    assume_sorted = True,
-                    fill_value    = np.NaN,
-                    bounds_error  = False
-                )(np.arange(nframes))
+                    left  = np.NaN,
+                    right = np.NaN
+                ).astype(output[key].dtype)
 
-    @staticmethod
-    def __seqlen(path):
-        with open(path) as stream:
-            for line in stream:
-                if line[0] != '%':
-                    break
-                if 'sequence:' in line:
-                    return int(line[line.rfind(':')+1:].strip())
+    @classmethod
+    def __headlines(cls, path: PATHTYPE, nlines: int) -> List[str]:
+        "returns the first lines of a file"
+        key = cls.CACHE.key(path, 'head', nlines)
+        out = cls.CACHE.get(key)
+        if out is None:
+            with open(path, "r", encoding = "utf-8") as stream:
+                out = [line.strip() for __, line in zip(range(nlines), stream)]
+            cls.CACHE.set(key, out)
+        return list(out)
+
+    @classmethod
+    def __fastsep(cls, path: PATHTYPE, cnf: LIAFilesIOConfiguration) -> Optional[str]:
+        """
+        returns the single character separating columns in the data, or None
+        if the layout is unexpected
+        """
+        match = re.fullmatch(r"\[([^\]\\^]+)\]", cnf.sep)
+        chars = match.group(1) if match else cnf.sep if len(cnf.sep) == 1 else None
+        if not chars:
+            return None
+
+        lines = cls.__headlines(path, cnf.header+2)
+        if len(lines) != cnf.header+2 or not lines[-1] or lines[-1][0] == '%':
+            return None
+
+        found = {i for i in chars if i in lines[-1]}
+        return next(iter(found)) if len(found) == 1 else None
+
+    @classmethod
+    def readframes(cls, path: PATHTYPE, cnf: LIAFilesIOConfiguration) -> pd.DataFrame:
+        """
+        Reads a LIA file.
+
+        The known layout, a single separator in the data, is read using the
+        pandas C engine. Results are cached until the file changes.
+        """
+        key   = cls.CACHE.key(path, 'frames', cnf.sep, cnf.header, cnf.engine, cnf.fastparse)
+        frame = cls.CACHE.get(key)
+        if frame is None:
+            sep = cls.__fastsep(path, cnf) if cnf.fastparse else None
+            if sep is None:
+                frame = pd.read_csv(path, sep = cnf.sep, header = cnf.header, engine = cnf.engine)
+            else:
+                names = re.split(cnf.sep, cls.__headlines(path, cnf.header+1)[-1])
+                frame = pd.read_csv(
+                    path,
+                    sep              = sep,
+                    header           = None,
+                    names            = names,
+                    skiprows         = cnf.header+1,
+                    skipinitialspace = True,
+                    engine           = 'c'
+                )
+            cls.CACHE.set(key, frame)
+
+        # the synchronization replaces columns but never writes into them
+        return frame.copy(deep = False)
+
+    @classmethod
+    def __seqlen(cls, path, cnf:LIAFilesIOConfiguration):
+        for line in cls.__headlines(path, cnf.header+2):
+            if not line or line[0] != '%':
+                break
+            if 'sequence:' in line:
+                return int(line[line.rfind(':')+1:].strip())
         return None
 
     @staticmethod
@@ -177,14 +302,10 @@ class MuWellsFilesIO(TrackIO):
         ])
 
     @classmethod
-    def __update(cls, trk:dict, index, path:str, cnf:LIAFilesIOConfiguration):
+    def __update(
+            cls, trk:dict, index, path:str, frames: pd.DataFrame, cnf:LIAFilesIOConfiguration
+    ):
         "verifies one gr"
-        frames = pd.read_csv(
-            path,
-            sep    = cnf.sep,
-            header = cnf.header,
-            engine = cnf.engine
-        )
         if not frames.shape[0]:
             return
 
@@ -206,7 +327,7 @@ class MuWellsFilesIO(TrackIO):
             'framerate':          frate,
             'phases':             phases,
         })
-        trk['sequencelength'][index]     = cls.__seqlen(path)
+        trk['sequencelength'][index]     = cls.__seqlen(path, cnf)
         trk['experimentallength'][index] = cls.__explen(phases, arr, cnf)
 
     @staticmethod
@@ -268,15 +389,19 @@ class MuWellsFilesIO(TrackIO):
                     return out
             return None
 
-        inds1        = _extract()
-        name         = tuple(frames)[1]
-        frames[name] = -frames[name]
-        inds2        = _extract()
+        def _flip():
+            # replace the column rather than write into one shared with the cache
+            name = tuple(frames)[1]
+            frames.insert(1, name, -frames.pop(name))
+
+        inds1 = _extract()
+        _flip()
+        inds2 = _extract()
         if inds2 is None and inds1 is None:
             raise TrackIOError("Could not extract peak threshold")
         if inds2 is not None and (inds1 is None or len(inds1) < len(inds2)):
             return inds2
-        frames[name] = -frames[name]
+        _flip()
         return inds1
 
     @staticmethod
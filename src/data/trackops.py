@@ -13,6 +13,7 @@ import  pandas      as     pd
 
 from   .track       import Track
 from   .tracksdict  import TracksDict
+from   .trackio     import checkpath
 from   .views       import Beads
 
 TRACKS = TypeVar('TRACKS', Track, TracksDict)
@@ -28,9 +29,16 @@ def dropbeads(trk:TRACKS, *beads:int) -> TRACKS:
     if isinstance(trk, TracksDict):
         return _applytodict(dropbeads, trk, beads, {})
 
-    trk.load()
     if len(beads) == 1 and isinstance(beads[0], (tuple, list, set, frozenset)):
         beads = tuple(beads[0])
+
+    if _canloadbeads(trk):
+        # only read the first cycles to find the beads, then the beads which are kept
+        good = frozenset(trk.shallowcopy().load(slice(0, 1)).data.keys()) - frozenset(beads)
+        if good:
+            return trk.shallowcopy().load(beads = sorted(good))
+
+    trk.load()
     cpy           = shallowcopy(trk)
     good          = frozenset(trk.data.keys()) - frozenset(beads)
     cpy.data      = {i: trk.data[i] for i in good}
@@ -62,12 +70,68 @@ def selectbeads(trk:TRACKS, *beads:int) -> TRACKS:
 
     if len(beads) == 1 and isinstance(beads[0], (tuple, list, set, frozenset)):
         beads = tuple(beads[0])
+    if beads and _canloadbeads(trk):
+        return trk.shallowcopy().load(beads = sorted(beads))
     return dropbeads(trk, *(set(trk.beads.keys()) - set(beads)))
 
+def _canloadbeads(trk: Track) -> bool:
+    "whether the track is not loaded yet and its IO handler can read only some beads"
+    return (
+        isinstance(trk, Track)
+        and not trk.isloaded
+        and bool(trk.path)
+        and checkpath(trk).partialread
+    )
+
+def _partialload(trk: Union[Track, Beads], indexes) -> Track:
+    """
+    Returns the root track or, if the latter is not loaded yet and its IO
+    handler allows it, a copy loaded with only the cycles required.
+    """
+    root: Track  = trk if isinstance(trk, Track) else trk.track
+    if not isinstance(trk, Track) or root.isloaded or not root.path:
+        return root
+
+    if isinstance(indexes, (range, slice)):
+        if indexes.stop is None or indexes.stop < 0:
+            return root
+        stop = indexes.stop
+    else:
+        if len(indexes) == 0 or min(indexes) < 0:
+            return root
+        stop = max(indexes)+1
+
+    if not checkpath(root).partialread:
+        return root
+
+    cpy = root.shallowcopy()
+    cpy.load(slice(0, stop+1))
+    # make sure the next cycle is available: its start is the selection's end
+    return cpy if cpy.ncycles > stop else root
+
+def _contiguouscycles(track: Track, indexes) -> Optional[Tuple[int, int]]:
+    "returns the cycle range if the selection is a contiguous block of cycles"
+    if isinstance(indexes, (range, slice)):
+        if indexes.step not in (None, 1):
+            return None
+        start, stop, _ = slice(indexes.start, indexes.stop).indices(track.ncycles)
+        return (start, stop) if stop > start else None
+
+    inds = np.asarray(indexes, dtype = 'i4')
+    if len(inds) and inds[0] >= 0 and np.all(np.diff(inds) == 1):
+        return int(inds[0]), min(track.ncycles, int(inds[-1])+1)
+    return None
+
 def selectcycles(trk:Union[TRACKS, Beads], indexes:Union[slice, range, List[int]]) -> TRACKS:
     """
-    Returns a copy of a Track or TracksDict instance with only a limited number
-    of its cycles.
+    Returns a Track or TracksDict instance with only a limited number of its
+    cycles.
+
+    When the cycles selected are contiguous, the new track's arrays are views
+    of the original ones: no data is copied and in-place changes to either
+    track, such as those of `inplace` actions, are seen by the other. Otherwise
+    the arrays are copies. When the original track has not been loaded yet and
+    its file format allows it, only the cycles needed are read from disk.
 
     Parameters
     ----------
@@ -85,40 +149,53 @@ def selectcycles(trk:Union[TRACKS, Beads], indexes:Union[slice, range, List[int]
         return _applytodict(selectcycles, trk, indexes, {})
 
     root: Track  = trk if isinstance(trk, Track) else trk.track
-    if isinstance(indexes, (range, slice)):
+    src:  Track  = _partialload(trk, indexes)
+    if src is root and isinstance(indexes, (range, slice)):
         # if no changes required: send back the track unchanged
         rng: range = cast(range, indexes)
         if (
                 not rng.start
                 and rng.stop and rng.stop >= root.ncycles
-                and rng.step == 1
+                and rng.step in (None, 1)
         ):
             return trk
-    root.load()
-
-    inds, phases = root.phase.cut(indexes)
-    vals         = np.zeros(root.nframes, dtype = 'bool')
-    vals[inds]   = True
+    src.load()
+
+    first   = src.phases[0,0]
+    cycles  = _contiguouscycles(src, indexes)
+    sel: Union[slice, np.ndarray]
+    if cycles is None:
+        inds, phases = src.phase.cut(indexes)
+        vals         = np.zeros(src.nframes, dtype = 'bool')
+        vals[inds]   = True
+        sel          = inds
+        insel        = vals.__getitem__
+    else:
+        i1     = src.phases[cycles[0], 0]-first
+        i2     = src.phases[cycles[1], 0]-first if cycles[1] < src.ncycles else src.nframes
+        phases = src.phases[cycles[0]:cycles[1]] - src.phases[cycles[0], 0]
+        sel    = slice(i1, i2)
+        insel  = lambda x: (x >= i1) & (x < i2)  # noqa
 
-    track: Dict[str, Any] = root.__getstate__()
+    track: Dict[str, Any] = src.__getstate__()
     track.update(
         phases = phases.astype('i4'),
         data   = (
-            trk.withaction(lambda _, info: (info[0], info[1][vals]))
+            trk.withaction(lambda _, info: (info[0], info[1][sel]))
             if isinstance(trk, Beads) else
-            {i: j[vals] for i, j in root.beads}
+            {i: j[sel] for i, j in src.beads}
         )
     )
 
-    track['secondaries'] = secs = {i: root.secondaries.data[i][inds] for i in ('t', 'zmag')}
-    for i, j in root.secondaries.data.items():
+    track['secondaries'] = secs = {i: src.secondaries.data[i][sel] for i in ('t', 'zmag')}
+    for i, j in src.secondaries.data.items():
         if i not in secs:
-            inds = np.clip(np.int32(j['index']-root.phases[0,0]), 0, len(vals)-1)
-            secs[i] = j[vals[inds]]
+            inds = np.clip(np.int32(j['index']-first), 0, src.nframes-1)
+            secs[i] = j[insel(inds)]
 
     start: Optional[int] = None
-    if root.path:
-        path  = Path(str(root.path[0] if isinstance(root.path, (list, tuple)) else root.path))
+    if src.path:
+        path  = Path(str(src.path[0] if isinstance(src.path, (list, tuple)) else src.path))
         start = (
             cast(slice, indexes).stop    if getattr(indexes, 'stop',  None) is not None else
             cast(slice, indexes).start   if getattr(indexes, 'start', None) else
@@ -127,9 +204,9 @@ def selectcycles(trk:Union[TRACKS, Beads], indexes:Union[slice, range, List[int]
         )
     if start is not None:
         track['_modificationdate'] = (
-            path.stat().st_ctime + root.nframes/root.framerate
-            if start >= root.phases.shape[0] else
-            path.stat().st_ctime + root.phases[start,0]/root.framerate
+            path.stat().st_ctime + src.nframes/src.framerate
+            if start >= src.phases.shape[0] else
+            path.stat().st_ctime + src.phases[start,0]/src.framerate
         )
 
     out: Track = Track(**track)
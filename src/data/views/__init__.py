@@ -3,6 +3,7 @@
 "Adds easy access to cycles and events"
 from ._dict         import (ITrackView, TransformedTrackView, createTrackView,
                             isellipsis)
+from ._config       import inplace, allocates, viewing
 from ._view         import TrackView, selectparent
 from ._cycles       import Cycles, CYCLEKEY
 from ._beads        import Beads
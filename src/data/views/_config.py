@@ -16,6 +16,66 @@ def _m_copy(_, item):
     "Copies the data"
     return (item[0],
             np.copy(item[1]) if isinstance(item[1], np.ndarray) else deepcopy(item[1]))
+_m_copy.bufferuse = 'copy'  # type: ignore
+
+def inplace(fcn: Callable) -> Callable:
+    "declares an action which mutates the data it receives and returns that same buffer"
+    fcn.bufferuse = 'inplace'  # type: ignore
+    return fcn
+
+def allocates(fcn: Callable, owned: Optional[Callable] = None) -> Callable:
+    """
+    declares an action which leaves the data it receives untouched and returns
+    a newly allocated buffer.
+
+    *owned* is an equivalent action which works in place: it is used instead
+    whenever the data received is already private to the action chain.
+    """
+    fcn.bufferuse = 'allocates'  # type: ignore
+    if owned is not None:
+        fcn.owned = inplace(owned)  # type: ignore
+    return fcn
+
+def viewing(fcn: Callable) -> Callable:
+    "declares an action which neither mutates nor copies the data: it may return a view"
+    fcn.bufferuse = 'view'  # type: ignore
+    return fcn
+
+def _m_elide(actions: List[Callable], owned: bool) -> Tuple[List[Callable], bool]:
+    """
+    Removes unneeded copies from a list of actions and returns whether the
+    final data is private to the action chain.
+
+    Copies are delayed until an action might mutate the data. They are dropped
+    if the data already is private or if the next action allocates a new
+    buffer anyway. Actions without any declaration are expected to mutate their
+    data and return buffers of unknown ownership.
+    """
+    out:     List[Callable]     = []
+    pending: Optional[Callable] = None
+    for fcn in actions:
+        use = getattr(fcn, 'bufferuse', None)
+        if use == 'copy':
+            if not owned:
+                pending = fcn
+            continue
+
+        if use == 'allocates':
+            pending = None
+            if owned:
+                fcn = getattr(fcn, 'owned', fcn)
+            owned = True
+        elif use != 'view':
+            if pending is not None:
+                out.append(pending)
+                pending, owned = None, True
+            owned = owned and use == 'inplace'
+        out.append(fcn)
+
+    if pending is not None:
+        out.append(pending)
+        owned = True
+    return out, owned
 
 def _m_torange(sli):
     start, stop, step = sli.start, sli.stop, sli.step
@@ -54,7 +114,10 @@ class TrackViewConfigMixin:
     with ids outside that slice.
 
     * `withcopy` takes a boolean as argument and  will make a copy of the data
-    before passing it on. This is the default configuration.
+    before passing it on. This is the default configuration. The copy is
+    delayed until an action might mutate the data and it is skipped if the data
+    already is a private copy: see `inplace`, `allocates` and `viewing` for
+    declaring how actions use their buffers.
 
     * `withdata` allows setting data on which to iterate. To be used sparingly.
 
@@ -70,6 +133,8 @@ class TrackViewConfigMixin:
     actions:   List[Callable]         = []
     parents:   Union[Tuple, Hashable] = tuple()
     _COPY:     Optional[bool]         = None
+    elidecopies                       = True
+    batchsize                         = 64
     def __init__(self, **kw) -> None:
         super().__init__()
         get = lambda x: kw.get(x, shallowcopy(getattr(self.__class__, x)))
@@ -85,7 +150,7 @@ class TrackViewConfigMixin:
 
         if kw.get('samples', None) is not None:
             samples = kw['samples']
-            self.actions.append(partial(self._f_samples, samples))
+            self.actions.append(viewing(partial(self._f_samples, samples)))
 
     @staticmethod
     def __format_doc__(more, **kwa):
@@ -114,7 +179,7 @@ class TrackViewConfigMixin:
         if samples is not None:
             if isinstance(samples, range):
                 samples = slice(samples.start, samples.stop, samples.step) # type: ignore
-            self.actions.append(partial(self._f_samples, samples))
+            self.actions.append(viewing(partial(self._f_samples, samples)))
         return self
 
     def withcopy(self:CSelf, cpy:bool = True, index:Optional[int] = None) -> CSelf:
@@ -133,6 +198,10 @@ class TrackViewConfigMixin:
     def _f_all(_, fcn, items):
         return items[0], fcn(items[1])
 
+    @staticmethod
+    def _f_batch(fcn, _, items):
+        return list(zip([i for i, _ in items], fcn([j for _, j in items])))
+
     def withfunction(self:CSelf, fcn = None, clear = False) -> CSelf:
         "Adds an action with fcn taking a value as single argument"
         if clear:
@@ -147,7 +216,14 @@ class TrackViewConfigMixin:
             msg = f'Function {fcn} should have a single positional argument'
             raise TypeError(msg) from exc
 
-        self.actions.append(partial(self._f_all, fcn))
+        act = partial(self._f_all, fcn)
+        if hasattr(fcn, 'bufferuse'):
+            act.bufferuse = fcn.bufferuse  # type: ignore
+        if hasattr(fcn, 'owned'):
+            act.owned = inplace(partial(self._f_all, fcn.owned))  # type: ignore
+        if callable(getattr(fcn, 'batch', None)):
+            act.batch = partial(self._f_batch, fcn.batch)  # type: ignore
+        self.actions.append(act)
         return self
 
     def withaction(self:CSelf, fcn = None, clear = False) -> CSelf:
@@ -225,11 +301,33 @@ class TrackViewConfigMixin:
             item = action(frame, item)
         return item
 
+    def ownsdata(self) -> bool:
+        "whether the items provided by the data are private copies"
+        data = self.data
+        if not (self.elidecopies and isinstance(data, TrackViewConfigMixin)):
+            return False
+        return _m_elide(data.actions, data.ownsdata())[1]
+
+    def getbatchaction(self) -> Tuple[Optional[Callable], Optional[Callable]]:
+        """
+        returns a function performing all actions but the last one and the
+        batched version of the latter, if it has any: it takes the view and a
+        list of (key, value) pairs.
+        """
+        actions = self.__elide(self.actions)
+        batch   = getattr(actions[-1], 'batch', None) if actions else None
+        if batch is None:
+            return self.__compose(actions), None
+        return self.__compose(actions[:-1]), batch
+
     def getaction(self, actions = None):
         "returns a function performing all actions"
-        if actions is None:
-            actions = self.actions
+        return self.__compose(self.__elide(self.actions if actions is None else actions))
+
+    def __elide(self, actions):
+        return _m_elide(actions, self.ownsdata())[0] if self.elidecopies else actions
 
+    def __compose(self, actions):
         return (partial(self.__act, actions) if len(actions) > 1  else
                 actions[0]                   if len(actions) == 1 else
                 None)
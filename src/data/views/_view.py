@@ -45,12 +45,31 @@ class TrackView(TrackViewConfigMixin, ITrackView):
 
     def __iter__(self) -> Iterator[Tuple[Any, np.ndarray]]:
         self.__unlazyfy()
-        act = self.getaction()
-        if act is None:
+        act, batch = self.getbatchaction()
+        if batch is not None:
+            yield from self.__batchiter(act, batch)
+        elif act is None:
             yield from (col      for col in self._iter())
         else:
             yield from (act(self, col) for col in self._iter())
 
+    def __batchiter(self, act, batch) -> Iterator[Tuple[Any, np.ndarray]]:
+        "applies the last action to `batchsize` items at a time"
+        items: list = []
+        try:
+            for col in self._iter():
+                items.append(col if act is None else act(self, col))
+                if len(items) >= self.batchsize:
+                    yield from batch(self, items)
+                    items = []
+        except Exception:
+            # items prior to the failing one are provided as when not batching
+            if items:
+                yield from batch(self, items)
+            raise
+        if items:
+            yield from batch(self, items)
+
     def __getitem__(self:TSelf, keys) -> Union[TSelf, np.ndarray]:
         if (isellipsis(keys)
                 or (isinstance(keys, tuple) and all(isellipsis(i) for i in keys))):
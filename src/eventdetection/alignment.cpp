@@ -1,5 +1,7 @@
 #include <vector>
 #include <algorithm>
+#include <cmath>
+#include <limits>
 #include "signalfilter/accumulators.hpp"
 #include "eventdetection/alignment.h"
 
@@ -150,4 +152,88 @@ void medianthreshold(DataInfo const && data, float minv, float * bias)
         if(std::isfinite(values[i]) && values[i] < med)
             bias[i] = std::numeric_limits<float>::quiet_NaN();
 }
+
+namespace {
+    float _phasemean(float const * data, size_t size, int first, int last, int range)
+    {
+        size_t i0 = std::min(size_t(std::max(first, 0)), size);
+        size_t i1 = std::max(std::min(size_t(std::max(last, 0)), size), i0);
+        if(range < 0)
+            i0 = i1 - std::min(i1-i0, size_t(-range));
+        else
+            i0 += std::min(i1-i0, size_t(range));
+
+        double sum = 0.;
+        size_t cnt = 0u;
+        for(auto ptr = data+i0, end = data+i1; ptr != end; ++ptr)
+            if(std::isfinite(*ptr))
+            {
+                sum += *ptr;
+                ++cnt;
+            }
+        return cnt == 0u ? std::numeric_limits<float>::quiet_NaN() : float(sum/cnt);
+    }
+}
+
+std::vector<info_t> BeadAlignment::compute(size_t        size,
+                                           float const * data,
+                                           size_t        ncycles,
+                                           size_t        nrows,
+                                           int   const * phases) const
+{
+    std::vector<info_t> out;
+    for(size_t i = 0u, e = std::min(nrows/2, size_t(3)); i < e; ++i)
+    {
+        DataInfo info = { size, data, ncycles, phases+2*i*ncycles, phases+(2*i+1)*ncycles };
+        if(i < 2 && extremum)
+        {
+            ExtremumAlignment align;
+            align.binsize = window;
+            align.mode    = i == 1 ? ExtremumAlignment::min : ExtremumAlignment::max;
+            out.emplace_back(align.compute(std::move(info)));
+        }
+        else
+        {
+            PhaseEdgeAlignment align;
+            align.window     = window;
+            align.mode       = i == 2 ? PhaseEdgeAlignment::right : edge;
+            align.percentile = i == 1 ? 100.-percentile : percentile;
+            out.emplace_back(align.compute(std::move(info)));
+        }
+    }
+    return out;
+}
+
+info_t MeasureEndAlignment::compute(size_t      size,
+                                    float     * data,
+                                    size_t      ncycles,
+                                    size_t      nrows,
+                                    int const * phases) const
+{
+    if(ncycles == 0 || nrows < 3)
+        return info_t();
+
+    auto cycle = [&](size_t i, size_t j)
+                 { return phases[j*ncycles+i]; };
+    for(size_t i = 0u; i < ncycles; ++i)
+    {
+        auto bias  = _phasemean(data, size, cycle(i, 1), cycle(i, 2), biasrange);
+        auto first = std::min(size_t(std::max(cycle(i, 0), 0)), size);
+        auto last  = i+1 < ncycles ? std::min(size_t(std::max(cycle(i+1, 0), 0)), size) : size;
+        if(std::isfinite(bias))
+            for(auto ptr = data+first, end = data+std::max(first, last); ptr != end; ++ptr)
+                *ptr -= bias;
+        else
+            std::fill(data+first, data+std::max(first, last),
+                      std::numeric_limits<float>::quiet_NaN());
+    }
+
+    if(nrows < 5)
+        return info_t();
+
+    info_t out(ncycles);
+    for(size_t i = 0u; i < ncycles; ++i)
+        out[i] = _phasemean(data, size, cycle(i, 3), cycle(i, 4), discardrange);
+    return out;
+}
 }}
@@ -1,5 +1,6 @@
 #include <valarray>
 #include <utility>
+#include <vector>
 namespace eventdetection { namespace alignment {
 
     struct DataInfo
@@ -33,6 +34,39 @@ namespace eventdetection { namespace alignment {
         info_t compute(DataInfo const &&) const;
     };
 
+    /* Computes the biases of a bead for the initial, pull and, possibly,
+     * measure phases in a single call.
+     *
+     * *phases* contains 2 rows per phase, each with *ncycles* values: the
+     * first and last frame of that phase for every cycle. The initial and pull
+     * phases are aligned using `PhaseEdgeAlignment` or `ExtremumAlignment`
+     * if *extremum* is set. The measure phase always uses the right edge.
+     */
+    struct BeadAlignment
+    {
+        size_t                   window     = 15;
+        bool                     extremum   = false;
+        PhaseEdgeAlignment::Mode edge       = PhaseEdgeAlignment::right;
+        double                   percentile = 25.;
+
+        std::vector<info_t> compute(size_t, float const *, size_t, size_t, int const *) const;
+    };
+
+    /* Aligns a bead on the mean of the end of a phase and returns the mean
+     * of the end of another phase, for every cycle.
+     *
+     * *phases* contains 3 or 5 rows, each with *ncycles* values: the first
+     * frame of every cycle, the first and last frames of the bias phase and,
+     * possibly, the first and last frames of the discard phase.
+     */
+    struct MeasureEndAlignment
+    {
+        int biasrange    = -10;
+        int discardrange = -30;
+
+        info_t compute(size_t, float *, size_t, size_t, int const *) const;
+    };
+
     void translate      (DataInfo const &&, bool,  float *);
     void medianthreshold(DataInfo const &&, float, float *);
 }}
@@ -1,17 +1,108 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Finds peak positions on a bead"
-from copy             import deepcopy
+from copy             import deepcopy, copy as shallowcopy
 from functools        import wraps
 from itertools        import chain
-from typing           import Iterator, Tuple, Sequence, Optional, cast
+from typing           import Iterator, Iterable, Tuple, Sequence, Optional, Dict, List, cast
+import pickle
 
 import numpy          as     np
 
-from taskmodel        import PHASE, Level
-from data.views       import ITrackView, Cycles, CYCLEKEY, Beads
-from utils            import EVENTS_TYPE, EVENTS_DTYPE, asview, EventsArray
-from .                import EventDetectionConfig
+from taskmodel                    import PHASE, Level
+from taskcontrol.processor.budget import BoundedCache
+from data.views                   import ITrackView, Cycles, CYCLEKEY, Beads
+from utils                        import EVENTS_TYPE, EVENTS_DTYPE, asview, EventsArray
+from .                            import EventDetectionConfig
+
+class EventIndex:
+    """
+    A flat summary of a bead's events: there is one entry per event in arrays
+    *cycle*, *start*, *length*, *mean* and *std*. Events for the i-th cycle in
+    *cycles* are at `offsets[i]:offsets[i+1]`. *mean* and *std* discard
+    non-finite values.
+
+    The `EventsArray` for each cycle are in *events*.
+    """
+    def __init__(self, items: Iterable[Tuple[int, EventsArray]]) -> None:
+        lst          = list(items)
+        sizes        = np.array([len(j) for _, j in lst], dtype = 'i8')
+        self.cycles  = np.array([i for i, _ in lst], dtype = 'i4')
+        self.offsets = np.insert(np.cumsum(sizes), 0, 0)
+        self.events  = np.empty(len(lst), dtype = 'O')
+        for i, (_, j) in enumerate(lst):
+            self.events[i] = j
+
+        data         = [k for _, j in lst for k in j['data']]
+        self.cycle   = np.repeat(self.cycles, sizes)
+        self.start   = np.array([k for _, j in lst for k in j['start']], dtype = 'i4')
+        self.length  = np.array([len(k) for k in data], dtype = 'i4')
+        self.mean, self.std = self.__moments(data, self.length)
+        self.__rows  = {j: i for i, j in enumerate(self.cycles.tolist())}
+
+    def __len__(self) -> int:
+        return len(self.cycle)
+
+    def cycleslice(self, cycle: int) -> Optional[slice]:
+        "returns the slice of events for a given cycle"
+        row = self.__rows.get(cycle, None)
+        return None if row is None else slice(self.offsets[row], self.offsets[row+1])
+
+    def readonlyevents(self) -> List[EventsArray]:
+        """
+        returns copies of *events* whose data are read-only views of those in
+        *events*: no event data is copied. Changes must replace the views.
+        """
+        out = []
+        for evts in self.events:
+            cpy = evts.copy()
+            for k, arr in enumerate(cpy['data']):
+                view                 = arr.view()
+                view.flags.writeable = False
+                cpy['data'][k]       = view
+            out.append(cpy)
+        return out
+
+    def percycle(self, name: str = 'mean') -> np.ndarray:
+        "returns an object array with a copy of the field's values per cycle"
+        vals = getattr(self, name)
+        out  = np.empty(len(self.cycles), dtype = 'O')
+        for i in range(len(out)):
+            out[i] = vals[self.offsets[i]:self.offsets[i+1]].copy()
+        return out
+
+    @staticmethod
+    def __moments(data, length) -> Tuple[np.ndarray, np.ndarray]:
+        if len(data) == 0:
+            return np.empty(0, dtype = 'f4'), np.empty(0, dtype = 'f4')
+
+        vals = np.concatenate(data).astype('f8')
+        good = np.isfinite(vals)
+        ref  = np.median(vals[good]) if good.any() else 0.  # limits rounding errors
+        vals = np.where(good, vals-ref, 0.)
+        inds = np.insert(np.cumsum(length, dtype = 'i8'), 0, 0)
+
+        cnt  = np.diff(np.insert(np.cumsum(good),    0, 0)[inds])
+        sum1 = np.diff(np.insert(np.cumsum(vals),    0, 0.)[inds])
+        sum2 = np.diff(np.insert(np.cumsum(vals**2), 0, 0.)[inds])
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            mean = sum1/cnt
+            std  = np.sqrt(np.maximum(sum2/cnt-mean**2, 0.))
+        return (mean+ref).astype('f4'), std.astype('f4')
+
+class EventIndexCache(BoundedCache):
+    """
+    Event indexes per bead, shared by all copies of a view. These count
+    against the global memory budget: evicted indexes are recomputed.
+    """
+    def __init__(self, items = (), name: str = 'EventIndexCache', cost: float = 1., **kwa):
+        super().__init__(items, name, cost, **kwa)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many-ancestors
     """
@@ -30,13 +121,18 @@ class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many
     ...     assert all(isinstance(i, np.ndarray) for i in data['data'].dtype)
     ```
 
+    Events for a whole bead, as provided by `bead`, are detected natively over
+    all cycles at once using *nthreads* threads.
+
     It can be configured as a `Cycles` object:
     """
     if __doc__:
         __doc__ += '\n'.join(Cycles.__doc__.split('\n'))
-    level = Level.event
-    first = PHASE.measure
-    last  = PHASE.measure
+    level                                         = Level.event
+    first                                         = PHASE.measure
+    last                                          = PHASE.measure
+    indexcache: Optional[Dict[tuple, EventIndex]] = None
+    nthreads:   int                               = 1
 
     def __init__(self, **kw) -> None:
         super().__init__(**kw)
@@ -57,6 +153,41 @@ class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many
                         self.__simpleiter(itrs, tmp))
             break
 
+    def eventindex(self, ibead: int) -> EventIndex:
+        """
+        Return the bead's `EventIndex`. It is computed once per bead and
+        configuration when the view has an `indexcache`. Actions are ignored.
+        """
+        key = self.__indexkey(ibead)
+        out = None if key is None else cast(dict, self.indexcache).get(key, None)
+        if out is None:
+            cpy = shallowcopy(self)
+            if self.__isfastbead():
+                # with an action, items come with their keys
+                cpy.actions = [lambda _, info: info]
+                itr         = cpy.bead(ibead)
+            else:
+                cpy.actions = []
+                itr         = cpy[ibead, ...]
+            out = EventIndex((i[1], j) for i, j in itr)
+            if key is not None:
+                cast(dict, self.indexcache)[key] = out
+        return out
+
+    def __indexkey(self, ibead: int) -> Optional[tuple]:
+        if self.indexcache is None:
+            return None
+        try:
+            return ibead, pickle.dumps(
+                (
+                    self.selected, self.discarded, self.first, self.last,
+                    self.precision, self.events, self.filter
+                ),
+                pickle.HIGHEST_PROTOCOL
+            )
+        except Exception:  # pylint: disable=broad-except
+            return None
+
     def beadextension(self, ibead) -> Optional[float]:
         """
         Return the median bead extension (phase 3 - phase 1)
@@ -71,9 +202,7 @@ class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many
 
     def bead(self, ibead):
         "return the data for a full bead"
-        if (isinstance(self.data, Beads)
-                and not self.data.cycles
-                and hasattr(self.events, "computeall")):
+        if self.__isfastbead():
             prec   = None if self.precision in (0., None) else self.precision
             data   = self.data[ibead]
             meas   = self.track.phase.select(..., self.first)
@@ -81,7 +210,8 @@ class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many
                 data,
                 self.getprecision(prec, self.track, ibead),
                 meas,
-                self.track.phase.select(..., self.last+1)
+                self.track.phase.select(..., self.last+1),
+                self.nthreads
             )
 
             itr = (
@@ -95,6 +225,14 @@ class Events(Cycles, EventDetectionConfig, ITrackView):# pylint:disable=too-many
             )
         return iter(self[ibead, ...].values())
 
+    def __isfastbead(self) -> bool:
+        "whether events can be computed for a whole bead at once"
+        return (
+            isinstance(self.data, Beads)
+            and not self.data.cycles
+            and hasattr(self.events, "computeall")
+        )
+
     def __simpleiter(self, first, itrs) -> Iterator[Tuple[CYCLEKEY, Sequence[EVENTS_TYPE]]]:
         prec      = None if self.precision in (0., None) else self.precision
         track     = self.track
@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Creates a dataframe"
-from   typing                      import Dict
+from   typing                      import Dict, Optional, Tuple
 import numpy  as np
 from   taskcontrol.processor.dataframe import DataFrameFactory
-from   .data                           import Events, EventsArray
+from   .data                           import Events, EventsArray, EventIndex
 
 @DataFrameFactory.adddoc
 class EventsDataFrameFactory(DataFrameFactory[Events]):
@@ -34,12 +34,20 @@ class EventsDataFrameFactory(DataFrameFactory[Events]):
         self.__cums           = self.__meas.pop('integral', {})
 
     # pylint: disable=arguments-differ
-    def _run(self, _1, _2, events: EventsArray) -> Dict[str, np.ndarray]:
+    def _run(self, frame, key, events: EventsArray) -> Dict[str, np.ndarray]:
+        index   = self.__index(frame, key, events)
+        indexed = {} if index is None else {
+            'avg':    index[0].mean[index[1]],
+            'length': index[0].length[index[1]].astype('i8')
+        }
         return dict(
             event  = np.arange(len(events), dtype = 'i4'),
             start  = events['start'],
             **{
-                name: np.array([fcn(i) for i in events['data']])
+                name: (
+                    indexed[name] if name in indexed else
+                    np.array([fcn(i) for i in events['data']])
+                )
                 for name, fcn in self.__meas.items()
             },
             **{
@@ -47,3 +55,15 @@ class EventsDataFrameFactory(DataFrameFactory[Events]):
                 for name, fcn in self.__cums.items()
             }
         )
+
+    @staticmethod
+    def __index(frame, key, events) -> Optional[Tuple[EventIndex, slice]]:
+        "returns the bead's event index and the cycle's slice, if usable"
+        if not (isinstance(frame, Events) and isinstance(key, tuple) and not frame.actions):
+            return None
+
+        index = frame.eventindex(key[0])
+        rng   = index.cycleslice(key[1])
+        if rng is None or rng.stop - rng.start != len(events):
+            return None
+        return index, rng
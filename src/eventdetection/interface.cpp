@@ -210,7 +210,8 @@ namespace eventdetection { namespace splitting {
                       ndarray<float> const & pydata,
                       float                  prec,
                       ndarray<int>   const & pyfirst,
-                      ndarray<int>   const & pylast
+                      ndarray<int>   const & pylast,
+                      int                    nthreads
                      )
     {
         if(pydata.size() == 0)
@@ -220,13 +221,16 @@ namespace eventdetection { namespace splitting {
         int   const * first = pyfirst.data();
         int   const * last  = pylast.data();
         size_t        sz    = pyfirst.size();
+        if(size_t(pylast.size()) != sz)
+            throw py::index_error("start and stop have different sizes");
+        for(size_t i = 0u; i < sz; ++i)
+            if(first[i] < 0 || last[i] < first[i] || last[i] > pydata.size())
+                throw py::index_error();
 
         std::vector<ints_t> lst;
         {
             py::gil_scoped_release _;
-            lst.reserve(sz);
-            for(size_t i = 0u; i < sz; ++i)
-                lst.emplace_back(self.compute(prec, {data+first[i], last[i]-first[i]}));
+            lst = computeall(self, prec, data, sz, first, last, nthreads);
         }
 
         py::list pylst;
@@ -288,7 +292,8 @@ namespace eventdetection { namespace splitting {
         using namespace py::literals;
         py::class_<T> cls(mod, name, doc);
         cls.def("__call__",   &_call<T>,     "data"_a, "precision"_a)
-           .def("__call__",   &_callall<T>,  "data"_a, "precision"_a, "start"_a, "stop"_a)
+           .def("__call__",   &_callall<T>,  "data"_a, "precision"_a, "start"_a, "stop"_a,
+                "nthreads"_a = 1)
            .def("grade",      &_grade<T>,    "data"_a, "precision"_a)
            .def("threshold",  &_threshold<T>::call)
            .def("rescale",    &_rescale<T>)
@@ -452,7 +457,13 @@ namespace eventdetection  { namespace detector {
 
         ints_t compute(float precision, data_t const & data) const
         {
-            auto ints = split.compute(precision, data);
+            Workspace ws;
+            return compute(precision, data, ws);
+        }
+
+        ints_t compute(float precision, data_t const & data, Workspace & ws) const
+        {
+            auto ints = split.compute(precision, data, ws);
             if(ints.size() > 1)
             {
                 merge.run(std::get<0>(data), ints);
@@ -469,7 +480,13 @@ namespace eventdetection  { namespace detector {
         using namespace py::literals;
         py::class_<T> cls(mod, name, doc);
         cls.def("compute", &_call<T>,  "data"_a, "precision"_a);
-        cls.def("computeall", &_callall<T>,  "data"_a, "precision"_a, "start"_a, "stop"_a);
+        cls.def("computeall", &_callall<T>,  "data"_a, "precision"_a, "start"_a, "stop"_a,
+                "nthreads"_a = 1,
+                R"_(Computes the intervals for all ranges `data[start[i]:stop[i]]`.
+
+Thresholds are computed once and buffers are reused from one range to the
+next. Ranges are dispatched over *nthreads* threads with the GIL released.
+A non-positive *nthreads* means using all cores.)_");
         dpx::pyinterface::addapi<T>(cls, std::move(args)...);
     }
 
@@ -549,6 +566,67 @@ namespace eventdetection  { namespace alignment {
         }
     }
 
+    py::list _beadbiases(ndarray<float> const & data,
+                         ndarray<int>   const & phases,
+                         size_t                 window,
+                         py::object             edge,
+                         double                 percentile)
+    {
+        BeadAlignment self;
+        self.window     = window;
+        self.extremum   = edge.is_none();
+        self.percentile = percentile;
+        if(!self.extremum)
+            self.edge = edge.cast<PhaseEdgeAlignment::Mode>();
+
+        py::list pyout;
+        if(data.size() == 0 || phases.ndim() != 2 || phases.shape(1) == 0)
+            return pyout;
+
+        std::vector<info_t> out;
+        auto nrows(size_t(phases.shape(0))), ncycles(size_t(phases.shape(1)));
+        auto ptrdata(data.data());
+        auto ptrphase(phases.data());
+        {
+            py::gil_scoped_release _;
+            out = self.compute(size_t(data.size()), ptrdata, ncycles, nrows, ptrphase);
+        }
+
+        for(auto const & arr: out)
+        {
+            ndarray<float> tmp(arr.size());
+            std::copy(std::begin(arr), std::end(arr), tmp.mutable_data());
+            pyout.append(tmp);
+        }
+        return pyout;
+    }
+
+    ndarray<float> _measureend(ndarray<float>       & data,
+                               ndarray<int>   const & phases,
+                               int                    biasrange,
+                               int                    discardrange)
+    {
+        if(data.size() == 0 || phases.ndim() != 2 || phases.shape(1) == 0)
+            return ndarray<float>();
+
+        MeasureEndAlignment self;
+        self.biasrange    = biasrange;
+        self.discardrange = discardrange;
+
+        info_t out;
+        auto nrows(size_t(phases.shape(0))), ncycles(size_t(phases.shape(1)));
+        auto ptrdata(data.mutable_data());
+        auto ptrphase(phases.data());
+        {
+            py::gil_scoped_release _;
+            out = self.compute(size_t(data.size()), ptrdata, ncycles, nrows, ptrphase);
+        }
+
+        ndarray<float> pyout(out.size());
+        std::copy(std::begin(out), std::end(out), pyout.mutable_data());
+        return pyout;
+    }
+
     template <typename T, typename ...Args>
     void _defaults(py::module & mod, char const * name, char const *doc, Args ...args)
     {
@@ -601,6 +679,22 @@ by *binsize*.)_";
                 "deleteonnan"_a, "deltas"_a, "phase"_a, "data"_a);
         mod.def("medianthreshold", &_medianthreshold,
                 "minv"_a, "data"_a, "phase1"_a, "phase2"_a, "bias"_a);
+        mod.def("beadbiases", &_beadbiases,
+                "data"_a, "phases"_a, "window"_a = 15, "edge"_a = py::none(),
+                "percentile"_a = 25.,
+                R"_(Returns the initial, pull and, if the *phases* table has 6
+rows, measure biases of a bead in a single call.
+
+The *phases* table has 2 rows per phase: the first and last frames of that
+phase for every cycle. A *None* edge means using `ExtremumAlignment` for the
+initial and pull phases.)_");
+        mod.def("measureend", &_measureend,
+                "data"_a, "phases"_a, "biasrange"_a = -10, "discardrange"_a = -30,
+                R"_(Aligns the bead, in place, on the mean of the end of a phase and
+returns the mean of the end of another phase for every cycle.
+
+The *phases* table has 3 or 5 rows: the first frame of every cycle, the first
+and last frames of the bias phase and, possibly, of the discard phase.)_");
     }
 }}
 
@@ -3,11 +3,10 @@
 "Processors apply tasks to a data flow"
 from   enum               import Enum
 from   functools          import partial
-from   typing             import Optional, NamedTuple, Tuple, cast
-import warnings
+from   typing             import List, Optional, NamedTuple, Sequence, Tuple, cast
 
 import numpy                 as     np
-from   data                  import Cycles
+from   data.views            import inplace
 from   utils                 import initdefaults
 from   taskmodel             import Task, Level, PhaseArg
 from   taskcontrol.processor import Processor
@@ -15,8 +14,8 @@ from   cleaning.processor    import (
     DataCleaningErrorMessage, DataCleaningException, Partial
 )
 from   .._core               import (  # pylint: disable=import-error
-    translate, medianthreshold, ExtremumAlignment, ExtremumAlignmentMode,
-    PhaseEdgeAlignment, PhaseEdgeAlignmentMode
+    translate, medianthreshold, beadbiases, measureend, ExtremumAlignment,
+    ExtremumAlignmentMode, PhaseEdgeAlignment, PhaseEdgeAlignmentMode
 )
 
 def _min_extension() -> float:
@@ -150,6 +149,25 @@ class ExtremumAlignmentProcessor(Processor[ExtremumAlignmentTask]):
             assert out.dtype == np.dtype("i4"), f'{out.dtype}'
             return out
 
+        def phases(self, phases: Sequence[int]) -> np.ndarray:
+            "return a table with one row per phase"
+            cyc = self.frame.cycles
+            out = self.frame.track.phase.select(cyc if cyc else ..., list(phases))
+            return np.ascontiguousarray(out.T, dtype = 'i4')
+
+        def biases(self, window, edge, percentile, meas) -> List[np.ndarray]:
+            "aligns the initial, pull and, possibly, measure phases in one call"
+            phase = self.frame.phaseindex()
+            cols  = [phase.initial, phase.initial+1, phase.pull, phase.pull+1]
+            if meas:
+                cols += [phase.measure, phase.measure+1]
+
+            mode  = (None                         if edge is None   else
+                     PhaseEdgeAlignmentMode.left  if edge == 'left' else
+                     PhaseEdgeAlignmentMode.right)
+            out   = beadbiases(self.bead, self.phases(cols), window, mode, percentile)
+            return out if out else [np.zeros(0, dtype = 'f4') for _ in range(len(cols)//2)]
+
         def bias(self, phase, window, edge, percentile):
             "aligns a phase"
             if edge is not None:
@@ -234,19 +252,9 @@ class ExtremumAlignmentProcessor(Processor[ExtremumAlignmentTask]):
         edge       = cls._get(kwa, 'edge')
         percentile = cls._get(kwa, 'percentile')
 
-        phase = frame.phaseindex()
-        inits = cycles.bias(phase.initial, window, edge, percentile)    # ≈ min
-        pulls = cycles.bias(phase.pull, window, edge, 100.-percentile)  # ≈ max
-
-        if meas:
-            return _Args(
-                cycles,
-                inits,
-                pulls,
-                cycles.bias(phase.measure, window, 'right', percentile)
-            )
-
-        return _Args(cycles, inits, pulls, None)
+        # initial ≈ min, pull ≈ max & measure on the right edge: a single native call
+        biases     = cycles.biases(window, edge, percentile, meas)
+        return _Args(cycles, biases[0], biases[1], biases[2] if meas else None)
 
     @classmethod
     def __deltas(cls, attr:str, outlier: str, args:_Args, kwa):
@@ -347,7 +355,7 @@ class ExtremumAlignmentProcessor(Processor[ExtremumAlignmentTask]):
         action = getattr(cls, '_bias_'+mode.name)
 
         def _apply(frame):
-            return frame.withaction(partial(cls._apply_method, kwa, action))
+            return frame.withaction(inplace(partial(cls._apply_method, kwa, action)))
         return _apply if toframe is None else _apply(toframe)
 
     @classmethod
@@ -377,31 +385,23 @@ class MeasureEndAlignmentProcessor(Processor[MeasureEndAlignmentTask]):
     "align usng the end of phase 5 and discard items too far away in phase 7"
     @staticmethod
     def _act(tsk, frame, info):
-        cycs = Cycles(track = frame.track, data = {0: info[1]})
-        with warnings.catch_warnings():
-            warnings.filterwarnings('ignore',
-                                    category = RuntimeWarning,
-                                    message  = '.*slice.*')
-
-            rng  = tsk.biasrange
-            pos  = [np.nanmean(i[rng:]) for _, i in cycs.withphases(tsk.biasphase)]
-            for (_, i), j in zip(cycs.withphases(...), pos):
-                i[:] -= j
-
-            if tsk.distance is None:
-                return info
-
-            rng  = tsk.discardrange
-            pos  = np.array(
-                [np.nanmean(i[rng:]) for _, i in cycs.withphases(tsk.discardphase)],
-                dtype = 'f4'
-            )
+        phase = frame.track.phase
+        cols  = [0, phase[tsk.biasphase], phase[tsk.biasphase]+1]
+        if tsk.distance is not None:
+            cols += [phase[tsk.discardphase], phase[tsk.discardphase]+1]
+
+        # translates the bead and measures the discard phase in a single native call
+        table = np.ascontiguousarray(phase.select(..., cols).T, dtype = 'i4')
+        pos   = measureend(info[1], table, tsk.biasrange, tsk.discardrange)
+        if tsk.distance is None or len(pos) == 0:
+            return info
 
         med  = np.nanpercentile(pos, tsk.percentiles)
         delt = np.minimum(np.abs(med[2]-med[1]), np.abs(med[1]-med[0]))*tsk.distance
         pos[np.isnan(pos)] = med[0]+delt*2
+        ends = np.append(table[0,1:], len(info[1]))
         for i in np.nonzero((pos-med[0]) > delt)[0]:
-            cycs.withphases(...)[0, i][:] = np.NaN
+            info[1][table[0,i]:ends[i]] = np.NaN
         return info
 
     @classmethod
@@ -409,7 +409,7 @@ class MeasureEndAlignmentProcessor(Processor[MeasureEndAlignmentTask]):
         "applies the task to a frame or returns a function that does so"
         if toframe is None:
             return partial(cls.apply, **kwa)
-        return toframe.withaction(partial(cls._act, cls.tasktype(**kwa)))
+        return toframe.withaction(inplace(partial(cls._act, cls.tasktype(**kwa))))
 
     def run(self, args):
         "updates frames"
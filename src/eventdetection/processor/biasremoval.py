@@ -4,6 +4,7 @@
 from   functools              import partial
 
 import numpy                  as     np
+from   data.views             import inplace
 from   taskcontrol.processor  import Processor
 from   taskmodel              import Task, Level, PHASE
 from   utils                  import initdefaults
@@ -47,7 +48,7 @@ class BiasRemovalProcessor(Processor[BiasRemovalTask]):
         if toframe is None:
             return cls.apply
         task = cls.tasktype(**cnf) # pylint: disable=not-callable
-        return toframe.withaction(partial(cls.beadaction, task))
+        return toframe.withaction(inplace(partial(cls.beadaction, task)))
 
     def run(self, args):
         "updates frames"
@@ -7,7 +7,7 @@ from taskcontrol.processor import Processor
 from taskmodel             import Task, Level, PHASE
 from utils                 import initdefaults
 
-from ..data                import Events
+from ..data                import Events, EventIndexCache
 from ..                    import EventDetectionConfig
 
 class EventDetectionTask(EventDetectionConfig, Task, zattributes = ('events',)):
@@ -41,9 +41,17 @@ class EventDetectionProcessor(Processor[EventDetectionTask]):
         if toframe is None:
             return partial(cls.apply, **kwa)
 
+        cache        = kwa.pop('indexcache', None)
         kwa['first'] = kwa['last'] = kwa.pop('phase')
-        return toframe.new(Events, **kwa)
+        out          = toframe.new(Events, **kwa)
+        if cache is not None:
+            out.indexcache = cache
+        return out
 
     def run(self, args):
         "iterates through beads and yields cycle events"
-        args.apply(self.apply(None, **self.task.config()), levels = self.levels)
+        cache = args.data.setcachedefault(self, EventIndexCache())
+        args.apply(
+            self.apply(None, **self.task.config(), indexcache = cache),
+            levels = self.levels
+        )
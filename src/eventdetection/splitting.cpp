@@ -43,10 +43,18 @@ namespace
     { _apply(i1, sz, std::move(isgood), std::move(fcngood), [](size_t, size_t){}); }
 
     template <typename T>
-    grade_t _sum(size_t wlen, T const & data)
+    inline void _resize(std::valarray<T> & arr, size_t sz)
+    {
+        if(arr.size() != sz)
+            arr.resize(sz);
+    }
+
+    template <typename T>
+    void _sum(size_t wlen, T const & data, grade_t & tmp)
     {
         auto const sz = data.size();
-        grade_t tmp(data.size()+wlen-1_s);
+        _resize(tmp, data.size()+wlen-1_s);
+        tmp = 0.0f;
 
         for(size_t i = 0_s; i < wlen; ++i)
             tmp[std::slice(i, sz, 1_s)] += data;
@@ -57,49 +65,51 @@ namespace
             tmp[i]             *= wlen/float(i+1);
             tmp[sz+wlen-2_s-i] *= wlen/float(i+1);
         }
-        return tmp;
     }
 
-    std::tuple<grade_t, std::valarray<size_t>> _removenans(data_t const & nandata)
+    void _removenans(Workspace & ws, data_t const & nandata)
     {
-        auto ptr = std::get<0>(nandata);
-        auto sz  = std::get<1>(nandata);
-        std::valarray<size_t> nans(sz);
-        grade_t               data(sz);
-        size_t cnt = 0_s;
-        auto   itd = std::begin(data);
-        auto   itn = std::begin(nans);
-        _apply( 0_s, data.size(),
-                [ptr]      (size_t i)             { return std::isfinite(ptr[i]); },
-                [&itd, &itn, &cnt, ptr](size_t i1, size_t i2)
-                { 
-                    std::copy(ptr+i1, ptr+i2, itd); itd += i2-i1; 
-                    std::fill(itn, itn+i2-i1, cnt); itn += i2-i1;
-                },
-                [&cnt]     (size_t i1, size_t i2) { cnt += i2-i1; });
-
-        if(cnt == 0)
-            return {data, {}};
-
-        *(itn++) = cnt;
-        return { data[std::slice(0_s, itd - std::begin(data), 1_s)],
-                 nans[std::slice(0_s, itn - std::begin(nans), 1_s)]};
+        auto const ptr   = std::get<0>(nandata);
+        auto const sz    = std::get<1>(nandata);
+        auto const ngood = size_t(std::count_if(ptr, ptr+sz,
+                                                [](float x) { return std::isfinite(x); }));
+
+        _resize(ws.good, ngood);
+        ws.hasnans = ngood != sz;
+        if(!ws.hasnans)
+        {
+            std::copy(ptr, ptr+sz, std::begin(ws.good));
+            return;
+        }
+
+        _resize(ws.nans, ngood+1_s);
+        size_t cnt = 0_s, k = 0_s;
+        for(size_t i = 0_s; i < sz; ++i)
+            if(std::isfinite(ptr[i]))
+            {
+                ws.good[k] = ptr[i];
+                ws.nans[k] = cnt;
+                ++k;
+            } else
+                ++cnt;
+        ws.nans[k] = cnt;
     }
 
-    ints_t _tointervals(std::valarray<size_t> const & nans, grade_t const & grade)
+    void _tointervals(Workspace & ws)
     {
-        ints_t intervals;
+        auto const & grade = ws.good;
+        auto       & ints  = ws.intervals;
+        ints.clear();
         _apply( 0_s, grade.size(),
-                [&grade]     (size_t i)             { return grade[i] < 1.0f; },
-                [&intervals] (size_t i1, size_t i2) { intervals.push_back({i1, i2}); });
+                [&grade] (size_t i)             { return grade[i] < 1.0f; },
+                [&ints]  (size_t i1, size_t i2) { ints.push_back({i1, i2}); });
 
-        if(nans.size() > 0)
-            for(auto & i: intervals)
+        if(ws.hasnans)
+            for(auto & i: ints)
             {
-                i.first  += nans[i.first];
-                i.second += nans[i.second];
+                i.first  += ws.nans[i.first];
+                i.second += ws.nans[i.second];
             }
-        return intervals;
     }
 
     /* moves the edge of the intervals:
@@ -174,27 +184,35 @@ namespace
     }
 
     template <typename T>
-    ints_t _compute(T const & self, float prec, data_t const & nandata)
+    ints_t _compute(T const & self, float prec, data_t const & nandata, Workspace & ws)
     {
-        auto   info = _removenans(nandata);
-        auto & good = std::get<0>(info);
-        auto & nans = std::get<1>(info);
+        _removenans(ws, nandata);
+        auto & good = ws.good;
         if(good.size() <= 2)
             return {};
         if(prec <= 0.0f)
             prec = signalfilter::stats::hfsigma(good.size(), &good[0]);
 
-        self.grade(prec, good);
-        auto ints = _tointervals(nans, good);
-        return ints.size() ? _wanewax(self, prec, nandata, std::move(ints)) : ints;
+        self.grade(prec, good, ws);
+        _tointervals(ws);
+        return ws.intervals.size() ? _wanewax(self, prec, nandata, ints_t(ws.intervals))
+                                   : ints_t();
     }
 
-    void _chi2grade(size_t wlen, float rho, grade_t & data)
+    template <typename T>
+    ints_t _compute(T const & self, float prec, data_t const & nandata)
+    {
+        Workspace ws;
+        return _compute(self, prec, nandata, ws);
+    }
+
+    void _chi2grade(size_t wlen, float rho, grade_t & data, Workspace & ws)
     {
         auto const hlen = wlen/2_s;
         auto const sz   = data.size();
 
-        grade_t cpy(sz+hlen*2_s);
+        auto & cpy = ws.buffer;
+        _resize(cpy, sz+hlen*2_s);
         cpy[std::slice(0_s,     hlen, 1_s)] = data[0];
         cpy[std::slice(hlen,    sz,   1_s)] = data;
         cpy[std::slice(sz+hlen, hlen, 1_s)] = data[sz-1_s];
@@ -204,7 +222,8 @@ namespace
             data += cpy[std::slice(i, sz, 1_s)];
         data *= -1.0f/wlen;
 
-        grade_t tmp(wlen);
+        auto & tmp = ws.window;
+        _resize(tmp, wlen);
         for(auto i = 0_s; i < sz; ++i)
         {
             tmp     = data[i];
@@ -221,13 +240,28 @@ namespace
 
 float DerivateSplitDetector::threshold(float precision, grade_t const & data) const
 {
-    grade_t tmp  = data;
-    auto    perc = signalfilter::stats::percentile(&tmp[0], &tmp[0]+tmp.size(),
-                                                   (float) this->percentile);
+    grade_t tmp;
+    return this->threshold(precision, data, tmp);
+}
+
+float DerivateSplitDetector::threshold(float           precision,
+                                       grade_t const & data,
+                                       grade_t       & tmp) const
+{
+    _resize(tmp, data.size());
+    tmp       = data;
+    auto perc = signalfilter::stats::percentile(&tmp[0], &tmp[0]+tmp.size(),
+                                                (float) this->percentile);
     return float(perc+this->distance*precision);
 }
 
 void DerivateSplitDetector::grade(float precision, grade_t & data) const
+{
+    Workspace ws;
+    this->grade(precision, data, ws);
+}
+
+void DerivateSplitDetector::grade(float precision, grade_t & data, Workspace & ws) const
 {
     auto wlen = this->gradewindow;
     if(wlen  >= data.size())
@@ -236,7 +270,8 @@ void DerivateSplitDetector::grade(float precision, grade_t & data) const
         return;
     }
 
-    auto tmp(_sum(wlen, data));
+    auto & tmp = ws.buffer;
+    _sum(wlen, data, tmp);
     auto sz   = data.size();
     auto tsz  = tmp.size();
     auto sl   = [](size_t i, size_t j) { return std::slice(i, j, 1_s); };
@@ -256,21 +291,40 @@ void DerivateSplitDetector::grade(float precision, grade_t & data) const
         data[sz-1_s-i] -= (tmp[tsz-1_s]*(wlen-i-1_s)+tmp[tsz-1_s-i]*(i+1_s))/wlen;
 
     data  = std::abs(data);
-    data *= 1.0f/this->threshold(precision, data);
+    data *= 1.0f/this->threshold(precision, data, ws.sorted);
 }
 
 ints_t DerivateSplitDetector::compute(float precision, data_t data) const
 { return _compute(*this, precision, data); }
 
-float ChiSquareSplitDetector::threshold(float prec) const
+ints_t DerivateSplitDetector::compute(float precision, data_t data, Workspace & ws) const
+{ return _compute(*this, precision, data, ws); }
+
+double ChiSquareSplitDetector::quantile() const
 {
     namespace bm = boost::math;
     auto x = bm::quantile(bm::complement(bm::chi_squared((double) (this->gradewindow-1)),
                                          this->confidence));
-    return float(prec*x/this->gradewindow);
+    return x/this->gradewindow;
+}
+
+float ChiSquareSplitDetector::threshold(float prec) const
+{ return float(prec*this->quantile()); }
+
+float ChiSquareSplitDetector::threshold(float prec, Workspace & ws) const
+{
+    if(ws.quantile < 0.)
+        ws.quantile = this->quantile();
+    return float(prec*ws.quantile);
 }
 
 void ChiSquareSplitDetector::grade(float precision, grade_t & data) const
+{
+    Workspace ws;
+    this->grade(precision, data, ws);
+}
+
+void ChiSquareSplitDetector::grade(float precision, grade_t & data, Workspace & ws) const
 {
     auto const wlen = this->gradewindow;
     if(wlen  >= data.size())
@@ -279,17 +333,28 @@ void ChiSquareSplitDetector::grade(float precision, grade_t & data) const
         return;
     }
 
-    auto const rho  = this->threshold(precision);
-    _chi2grade(wlen, rho, data);
+    auto const rho  = this->threshold(precision, ws);
+    _chi2grade(wlen, rho, data, ws);
 }
 
 ints_t ChiSquareSplitDetector::compute(float precision, data_t data) const
 { return _compute(*this, precision, data); }
 
+ints_t ChiSquareSplitDetector::compute(float precision, data_t data, Workspace & ws) const
+{ return _compute(*this, precision, data, ws); }
+
 void MultiGradeSplitDetector::grade(float precision, grade_t & grade) const
 {
-    auto data(grade);
-    this->derivate.grade(precision, grade);
+    Workspace ws;
+    this->grade(precision, grade, ws);
+}
+
+void MultiGradeSplitDetector::grade(float precision, grade_t & grade, Workspace & ws) const
+{
+    auto & data = ws.copy;
+    _resize(data, grade.size());
+    data = grade;
+    this->derivate.grade(precision, grade, ws);
     if(this->minpatchwindow >= grade.size() || this->chisquare.gradewindow >= grade.size())
         return;
 
@@ -298,7 +363,7 @@ void MultiGradeSplitDetector::grade(float precision, grade_t & grade) const
     auto const wmin = (this->minpatchwindow/2_s)*2_s+1_s;
     auto const wlen = this->chisquare.gradewindow;
     auto const hlen = this->chisquare.gradewindow/2_s;
-    auto const rho  = this->chisquare.threshold(precision);
+    auto const rho  = this->chisquare.threshold(precision, ws);
 
     auto patch = [&](bool found, size_t first, size_t last)
         {
@@ -306,8 +371,10 @@ void MultiGradeSplitDetector::grade(float precision, grade_t & grade) const
                 return;
 
             last        = std::min(sz, last);
-            grade_t tmp = data[std::slice(first, last-first, 1_s)];
-            _chi2grade(wlen, rho, tmp);
+            auto & tmp  = ws.patch;
+            _resize(tmp, last-first);
+            tmp         = data[std::slice(first, last-first, 1_s)];
+            _chi2grade(wlen, rho, tmp, ws);
             _apply( first+hlen, last-hlen,
                     [&grade](size_t i) { return grade[i] >= 1.0f; },
                     [&grade, &tmp, first, hmin, wmin](size_t i1, size_t i2) 
@@ -342,6 +409,9 @@ void MultiGradeSplitDetector::grade(float precision, grade_t & grade) const
 ints_t MultiGradeSplitDetector::compute(float precision, data_t data) const
 { return _compute(*this, precision, data); }
 
+ints_t MultiGradeSplitDetector::compute(float precision, data_t data, Workspace & ws) const
+{ return _compute(*this, precision, data, ws); }
+
 ints_t IntervalExtensionAroundRange::compute(float     precision,
                                               data_t    data,
                                               ints_t && intervals) const
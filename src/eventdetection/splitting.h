@@ -2,12 +2,33 @@
 #include <valarray>
 #include <vector>
 #include <algorithm>
+#include "signalfilter/parallel.h"
 
 namespace eventdetection {  namespace splitting {
 
 using grade_t = std::valarray<float>;
 using ints_t  = std::vector<std::pair<size_t, size_t>>;
 using data_t  = std::tuple<float const *, size_t>;
+
+/* Buffers reused from one cycle to the next.
+ *
+ * A workspace also stores thresholds which only depend on the detector's
+ * settings: it must only be used with a single detector and a single thread.
+ */
+struct Workspace
+{
+    grade_t               good;            // the finite values, then their grade
+    std::valarray<size_t> nans;            // the number of non-finite values prior to each good one
+    bool                  hasnans  = false;
+    grade_t               copy;            // the original values, when patching grades
+    grade_t               buffer;          // padded or summed values
+    grade_t               patch;           // values being patched
+    grade_t               window;
+    grade_t               sorted;          // values for computing percentiles
+    ints_t                intervals;
+    double                quantile = -1.;  // the chi-square quantile, once computed
+};
+
 struct IntervalExtensionAroundRange
 {
     size_t extensionwindow = 3;
@@ -21,9 +42,12 @@ struct DerivateSplitDetector: public IntervalExtensionAroundRange
     double percentile      = 75.;
     double distance        = 2.;
 
-    float  threshold(float, grade_t const &) const;
-    void   grade    (float, grade_t &)       const;
-    ints_t compute  (float, data_t)          const;
+    float  threshold(float, grade_t const &)            const;
+    float  threshold(float, grade_t const &, grade_t &) const;
+    void   grade    (float, grade_t &)                  const;
+    void   grade    (float, grade_t &, Workspace &)     const;
+    ints_t compute  (float, data_t)                     const;
+    ints_t compute  (float, data_t, Workspace &)        const;
 };
 
 struct ChiSquareSplitDetector: public IntervalExtensionAroundRange
@@ -31,9 +55,13 @@ struct ChiSquareSplitDetector: public IntervalExtensionAroundRange
     size_t gradewindow     = 4;
     double confidence      = .1;
 
-    float  threshold(float) const;
-    void   grade    (float, grade_t &) const;
-    ints_t compute  (float, data_t)    const;
+    double quantile ()                              const;
+    float  threshold(float)                         const;
+    float  threshold(float, Workspace &)            const;
+    void   grade    (float, grade_t &)              const;
+    void   grade    (float, grade_t &, Workspace &) const;
+    ints_t compute  (float, data_t)                 const;
+    ints_t compute  (float, data_t, Workspace &)    const;
 };
 
 struct MultiGradeSplitDetector: public IntervalExtensionAroundRange
@@ -42,7 +70,31 @@ struct MultiGradeSplitDetector: public IntervalExtensionAroundRange
     ChiSquareSplitDetector chisquare;
     size_t                 minpatchwindow = 5;
 
-    void   grade  (float, grade_t &) const;
-    ints_t compute(float, data_t)    const;
+    void   grade  (float, grade_t &)              const;
+    void   grade  (float, grade_t &, Workspace &) const;
+    ints_t compute(float, data_t)                 const;
+    ints_t compute(float, data_t, Workspace &)    const;
 };
+
+/* Computes the intervals for all ranges `[first[i], last[i])` in *data*.
+ *
+ * Ranges are dispatched over *nthreads* threads, each of which reuses a
+ * single workspace. A non-positive *nthreads* means using all cores. The
+ * GIL must have been released by the caller if needed.
+ */
+template <typename T>
+std::vector<ints_t> computeall(T const & self, float precision, float const * data,
+                               size_t nranges, int const * first, int const * last,
+                               int nthreads)
+{
+    std::vector<ints_t> out(nranges);
+    size_t const        nth = signalfilter::nthreads(nthreads, nranges);
+    signalfilter::parallelfor(nth, int(nth), [&](size_t ithread)
+    {
+        Workspace ws;
+        for(size_t i = ithread; i < nranges; i += nth)
+            out[i] = self.compute(precision, data_t(data+first[i], size_t(last[i]-first[i])), ws);
+    });
+    return out;
+}
 }}
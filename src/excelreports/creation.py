@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Creates excel of csv files for reporting any type of data"
-from typing                 import (Sequence, Iterator, Union, TypeVar,
-                                    Callable, Iterable, Optional, cast, IO)
+from typing                 import (Sequence, Iterator, Union, TypeVar, Tuple,
+                                    Callable, Iterable, Optional, Any, cast, IO)
 from pathlib                import Path
+from itertools              import groupby, islice
 from contextlib             import closing, contextmanager
 from abc                    import ABCMeta, abstractmethod
 from inspect                import getmembers
@@ -72,6 +73,7 @@ def sheet_class(name: str, other = None, **kwargs):
     return _deco
 
 class _BaseReporter(metaclass=ABCMeta):
+    _TABLE_CHUNK = 4096  # number of lines computed & written at once
     def comments(self, fcn: Callable[['_BaseReporter'], str]) -> Optional[str]:
         "returns column comments"
         comments = getattr(fcn, _CCOMMENT, None)
@@ -190,9 +192,18 @@ class CsvReporter(_BaseReporter):
         self.header(header)
         self._printline(*(_title(fcn) for fcn in txt))
 
-        for line in self.iterate() if rows is None else rows:
-            values = tuple(fcn(*line) for fcn in txt)
-            self._printline(*values)
+        fmt   = self._TABLE_FORMAT*len(txt)
+        lines = iter(self.iterate() if rows is None else rows)
+        while True:
+            # lines are formatted & written by chunks rather than one at a time
+            chunk = [
+                fmt.format(*('' if x is None else x for x in (fcn(*line) for fcn in txt)))
+                .strip()
+                for _, line in zip(range(self._TABLE_CHUNK), lines)
+            ]
+            if not chunk:
+                break
+            self.book.write('\n'.join(chunk)+'\n')
         self._printline()
 
     @abstractmethod
@@ -259,7 +270,6 @@ class XlsReporter(_BaseReporter):
             columns = list(columns)
             cols    = lambda: iter(cast(Iterable, columns))
         if rows is not None:
-            rows  = list(rows)
             lines = lambda: iter(cast(Iterable, rows))
 
         self.__write_titles(istart, cols())
@@ -279,21 +289,63 @@ class XlsReporter(_BaseReporter):
                 sheet.write(start, i, result)
 
     def __write_data(self, start: int, columns, lines):
-        fcns  = tuple((*i, self.__format(i[1])) for i in enumerate(columns))
-        sheet = cast(Worksheet, self.sheet)
-        irow  = 1
-        for i, line in enumerate(lines):
-            irow = start + i + 1
-            mark = self.linemark(line)
-            for j, fcn, fmt in fcns:
-                result = fcn(*line)
-
-                if isinstance(result, Chart):
-                    sheet.insert_chart(irow, j, result)
-                else:
-                    sheet.write(irow, j, result, self._getfmt(mark, fmt))
+        fcns   = tuple((i, self.__format(i)) for i in columns)
+        marked = {}
+        def _fmt(icol: int, mark: bool):
+            fmt = fcns[icol][1]
+            if not mark:
+                return fmt
+            if icol not in marked:
+                marked[icol] = self._getfmt(True, fmt)
+            return marked[icol]
+
+        rowwise = getattr(self.book, 'constant_memory', False)
+        lines   = iter(lines)
+        nrows   = 0
+        while True:
+            # values are computed line by line as some columns rely on the order
+            # of calls. They are then written by blocks of cells sharing a format,
+            # one chunk of lines at a time.
+            chunk = list(islice(lines, self._TABLE_CHUNK))
+            if not chunk:
+                break
+
+            marks = [bool(self.linemark(line)) for line in chunk]
+            rows  = [tuple(fcn(*line) for fcn, _ in fcns) for line in chunk]
+            first = start+nrows+1
+            if rowwise:
+                # rows must be written in order
+                for irow, (vals, mark) in enumerate(zip(rows, marks)):
+                    keys = [(_fmt(i, mark), isinstance(val, Chart)) for i, val in enumerate(vals)]
+                    for beg, end, (fmt, chart) in self.__runs(keys):
+                        self.__write_cells(first+irow, beg, vals[beg:end], fmt, chart, False)
+            else:
+                for icol, vals in enumerate(zip(*rows)):
+                    keys = [(mark, isinstance(val, Chart)) for mark, val in zip(marks, vals)]
+                    for beg, end, (mark, chart) in self.__runs(keys):
+                        self.__write_cells(first+beg, icol, vals[beg:end], _fmt(icol, mark),
+                                           chart, True)
+            nrows += len(chunk)
+        return 1 if nrows == 0 else start+nrows
 
-        return irow
+    @staticmethod
+    def __runs(keys: Sequence) -> Iterator[Tuple[int, int, Any]]:
+        "yields the start, the stop and the key for each stretch of equal keys"
+        first = 0
+        for key, grp in groupby(keys):
+            last = first + sum(1 for _ in grp)
+            yield first, last, key
+            first = last
+
+    def __write_cells(self, irow: int, icol: int, values, fmt, chart: bool, vertical: bool):
+        sheet = cast(Worksheet, self.sheet)
+        if chart:
+            for i, val in enumerate(values):
+                sheet.insert_chart(irow+i*vertical, icol+i*(not vertical), val)
+        elif vertical:
+            sheet.write_column(irow, icol, values, fmt)
+        else:
+            sheet.write_row(irow, icol, values, fmt)
 
     def __write_cond(self, start:int, columns, irow: int):
         sheet = cast(Worksheet, self.sheet)
@@ -387,10 +439,16 @@ class Reporter(XlsReporter, CsvReporter):
 FILENAME = Union[Path, str]
 FILEOBJ  = Union[IO,Workbook]
 @contextmanager
-def fileobj(fname:FILENAME) -> Iterator[FILEOBJ]:
-    "Context manager for opening xlsx or text file"
+def fileobj(fname:FILENAME, constant_memory: bool = False) -> Iterator[FILEOBJ]:
+    """
+    Context manager for opening xlsx or text file
+
+    With *constant_memory*, xlsx rows are flushed to disk as soon as the next
+    row is written: sheets must then be written from top to bottom.
+    """
     if Path(str(fname)).suffix in ('.xlsx', '.xls'):
-        with closing(Workbook(str(fname), {'nan_inf_to_errors': True})) as book:
+        opts = {'nan_inf_to_errors': True, 'constant_memory': constant_memory}
+        with closing(Workbook(str(fname), opts)) as book:
             yield book
     else:
         with open(str(fname), 'w', encoding = 'utf-8') as stream:
@@ -418,5 +476,6 @@ def writecolumns(filename, sheetname, items):
                       columns    = columns,
                       sheet_name = sheetname))
 
-    with fileobj(filename) as book:
+    # a single table is written from top to bottom
+    with fileobj(filename, constant_memory = True) as book:
         sheet(book).table() # pylint: disable=abstract-class-instantiated
@@ -213,12 +213,14 @@ class BaseFoVPlotCreator(TaskPlotCreator[TModelType, PlotModelType]):
         return dict(data = data)
 
     def _oktooltips(self, ttips):
-        row  = self._theme.tooltipok
-        trk  = self._model.track
-        for bead in DataSelectionBeadController(self._ctrl).allbeads:
-            if bead not in ttips:
-                ttips[bead] = [row.format(trk.rawprecision(bead),
-                                          trk.beadextension(bead))]
+        row   = self._theme.tooltipok
+        trk   = self._model.track
+        beads = [i for i in DataSelectionBeadController(self._ctrl).allbeads if i not in ttips]
+        if beads:
+            precs = dict(trk.rawprecision(beads))
+            exts  = trk.beadextensions(beads)
+            for bead in beads:
+                ttips[bead] = [row.format(precs[bead], exts[bead])]
 
 
         return {i: ''.join(j) for i, j in ttips.items()}
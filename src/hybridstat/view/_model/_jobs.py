@@ -3,9 +3,10 @@
 "stuff for running all beads"
 from   asyncio                  import sleep as _sleep
 from   functools                import partial
+from   heapq                    import heapify, heappop
 from   multiprocessing          import Process, Pipe
-
-import numpy                    as     np
+from   multiprocessing.connection import Connection
+from   typing                   import Iterable, List, Optional, Tuple
 
 from view.base                  import spawn
 from ._processors               import runbead
@@ -14,8 +15,9 @@ class JobConfig:
     "JobConfig"
     def __init__(self):
         self.name:     str   = "hybridstat.precomputations"
-        self.ncpu:     int   = 2
-        self.waittime: float = .1
+        self.ncpu:      int   = 2
+        self.waittime:  float = .1
+        self.batchsize: int   = 2
 
 class JobDisplay:
     "JobConfig"
@@ -24,12 +26,50 @@ class JobDisplay:
         self.calls:    int  = 1
         self.canstart: bool = False
 
+class BeadQueue:
+    """
+    Beads left to compute.
+
+    Beads closest to the current bead come first, those after it before those
+    prior to it: these are the next the user will look at.
+    """
+    def __init__(self, beads: Iterable[int], store = ()):
+        self._rank:    dict                        = {j: i for i, j in enumerate(sorted(beads))}
+        self._pending: set                         = set(self._rank) - set(store)
+        self._current: Optional[int]               = None
+        self._heap:    List[Tuple[int, bool, int]] = []
+        self._reorder(None)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _reorder(self, current: Optional[int]):
+        rank          = self._rank.get(current, -1)
+        self._current = current
+        self._heap    = [(abs(self._rank[i]-rank), self._rank[i] < rank, i) for i in self._pending]
+        heapify(self._heap)
+
+    def pop(self, current: Optional[int], size: int, store = ()) -> List[int]:
+        "returns the next batch of beads to compute"
+        if current != self._current:
+            self._reorder(current)
+
+        out: List[int] = []
+        while self._heap and len(out) < max(1, size):
+            bead = heappop(self._heap)[-1]
+            if bead in self._pending:
+                self._pending.discard(bead)
+                if bead not in store:
+                    out.append(bead)
+        return out
+
 class JobRunner:
     "Deals with pool computations"
     def __init__(self, mdl):
         self._mdl     = mdl
         self._config  = JobConfig()
         self._display = JobDisplay()
+        self._workers: List[Tuple[Process, Connection]] = []
 
     def swapmodels(self, ctrl):
         "swap models for those in the controller"
@@ -45,6 +85,8 @@ class JobRunner:
             if not disp.canstart:
                 return
 
+            # stop computations for the previous tasks right away
+            self._cancel()
             ctrl.display.update(disp, calls = disp.calls+1)
 
             @calllater.append
@@ -67,18 +109,25 @@ class JobRunner:
         ctrl.tasks.observe("addtask", "updatetask", "removetask", _start)
 
     @staticmethod
-    def _poolrun(pipe, procs, refcache, keys):
-        for bead in keys:
-            out = runbead(procs, bead, refcache)
-            pipe.send((bead, out, refcache.get(bead, None)))
-            if pipe.poll():
-                return
-        pipe.send((None, None, None))
+    def _poolrun(pipe, procs, refcache):
+        for keys in iter(pipe.recv, None):
+            for bead in keys:
+                out = runbead(procs, bead, refcache)
+                pipe.send((bead, out, refcache.get(bead, None)))
+            # ask for the next batch
+            pipe.send((None, None, None))
 
     def _keepgoing(self, cache, root, idtag):
         calls = self._display.calls
         return root is self._mdl.roottask and calls == idtag and cache() is not None
 
+    def _cancel(self):
+        "stops all workers immediately"
+        workers, self._workers = self._workers, []
+        for proc, _ in workers:
+            if proc.is_alive():
+                proc.terminate()
+
     def _poolcompute(self, sendevt, identity, **_):  # pylint: disable=too-many-locals
         if (
                 self._config.ncpu <= 0
@@ -99,34 +148,46 @@ class JobRunner:
         refc      = mdl.fittoreference.refcache
         keepgoing = partial(self._keepgoing, cache, root, identity)
 
-        keys  = np.array(list(set(mdl.track.beads.keys()) - set(store)))
-        nkeys = len(keys)
-        if not nkeys:
+        queue = BeadQueue(mdl.track.beads.keys(), store)
+        if not queue:
             return
 
+        def _nextbatch(inp) -> bool:
+            keys = queue.pop(getattr(mdl, 'bead', None), self._config.batchsize, store)
+            inp.send(keys if keys else None)
+            return bool(keys)
+
         async def _iter():
-            pipes = []
-            ncpu  = min(nkeys, self._config.ncpu)
-            for job in range(0, nkeys, nkeys//ncpu+1):
+            self._cancel()
+            workers = self._workers
+            for _ in range(min(len(queue), self._config.ncpu)):
                 inp, oup = Pipe()
-                args     = (oup, procs, refc, keys[job:job+nkeys//ncpu+1])
-                Process(target = self._poolrun, args = args).start()
-                pipes.append(inp)
-
-            while len(pipes) and keepgoing():
-                await _sleep(self._config.waittime)
-                for i, inp in list(enumerate(pipes))[::-1]:
-                    while inp.poll() and keepgoing():
-                        out = inp.recv()
-                        if out[0] is None:
-                            del pipes[i]
-                            break
-
-                        if out[0] not in store:
-                            yield out
-
-            for inp in pipes:
-                inp.send(True)
+                proc     = Process(target = self._poolrun, args = (oup, procs, refc))
+                proc.start()
+                workers.append((proc, inp))
+                _nextbatch(inp)
+
+            try:
+                while len(workers) and keepgoing():
+                    await _sleep(self._config.waittime)
+                    for i, (_, inp) in list(enumerate(workers))[::-1]:
+                        try:
+                            while inp.poll() and keepgoing():
+                                out = inp.recv()
+                                if out[0] is None:
+                                    if not _nextbatch(inp):
+                                        del workers[i]
+                                    break
+
+                                if out[0] not in store:
+                                    yield out
+                        except (EOFError, OSError):
+                            # the worker was cancelled
+                            if i < len(workers):
+                                del workers[i]
+            finally:
+                if workers is self._workers:
+                    self._cancel()
 
         async def _thread():
             sendevt({"bead": None, "check": keepgoing})
@@ -1,6 +1,7 @@
 #include <cstdio>
 #include <fstream>
 #include <algorithm>
+#include <set>
 #include "utils/pybind11.hpp"
 #include "legacy/legacyrecord.h"
 #include "legacy/legacygr.h"
@@ -32,6 +33,18 @@ namespace legacy
         pybind11::object _toarray(std::vector<T> const && ptr)
         { return _toarray(ptr.size(), ptr.data()); }
 
+        /* Returns an array which owns the vector's memory, without copying it.
+         *
+         * The array starts at *first* and contains *sz* elements.
+         */
+        template <typename T>
+        pybind11::object _ownarray(std::vector<T> && vect, size_t first, size_t sz)
+        {
+            auto * ptr = new std::vector<T>(std::move(vect));
+            py::capsule owner(ptr, [](void * x) { delete reinterpret_cast<std::vector<T>*>(x); });
+            return ndarray<T>({long(sz)}, {long(sizeof(T))}, ptr->data()+first, owner);
+        }
+
         void _open(
                 legacy::GenRecord & rec, std::string name,
                 int nbeads = -1, int start = -1, int stop = -1, int nphases = -1
@@ -100,9 +113,13 @@ namespace legacy
                                 bool notall     = true,
                                 std::string tpe = "",
                                 int = -1,
-                                int lastcycle  = -1
+                                int lastcycle  = -1,
+                                std::vector<int> beads = {}
                                 )
     {
+        std::set<int>       selected(beads.begin(), beads.end());
+        auto isselected = [&](int i) { return selected.empty() || selected.count(i) > 0; };
+
         legacy::GenRecord   rec;
         if(lastcycle >= 0)
             _open(rec, name, -1, -1, -1, lastcycle);
@@ -135,11 +152,9 @@ namespace legacy
         }
         auto sz      = last-first;
 
+        // arrays own the decoded buffers: no copies
         auto add = [&](auto key, auto && val)
-                    { 
-                        auto mem = val();
-                        res[pybind11::cast(key)] = _toarray(sz, mem.data()+first);
-                    };
+                    { res[pybind11::cast(key)] = _ownarray(val(), first, sz); };
 
         int axis = tpe.size() == 0 || tpe[0] == 'Z' || tpe[0] == 'z' ? 0 :
                                       tpe[0] == 'X' || tpe[0] == 'x' ? 1 :
@@ -148,10 +163,22 @@ namespace legacy
             axis = tpe[1] == '1' ? 3 : tpe[1] == '2' ? 4 : 5;
 
         auto calibpos = rec.pos();
+        std::vector<std::pair<size_t, std::vector<float>>> decoded;
         for(size_t ibead = size_t(0), ebead = rec.nbeads(); ibead < ebead; ++ibead)
             if((notall == false || !rec.islost(int(ibead)))
-                && (calibpos.find((int) ibead) != calibpos.end()))
-                add(ibead, [&]() { return rec.bead(ibead, axis); });
+                && (calibpos.find((int) ibead) != calibpos.end())
+                && isselected(int(ibead)))
+                decoded.emplace_back(ibead, std::vector<float>());
+
+        {
+            pybind11::gil_scoped_release lock;
+            for(auto & val: decoded)
+                val.second = rec.bead(val.first, axis);
+        }
+
+        for(auto & val: decoded)
+            add(val.first, [&]() { return std::move(val.second); });
+        decoded.clear();
 
         add("t",    [&]() { return rec.t(); });
         add("zmag", [&]() { return rec.zmag(); });
@@ -197,7 +224,7 @@ namespace legacy
             pos[pybind11::int_(val.first)] = pybind11::make_tuple(std::get<0>(val.second),
                                                                   std::get<1>(val.second),
                                                                   std::get<2>(val.second));
-            if(!sdi)
+            if(!sdi && isselected(val.first))
             {
                 rec.readcalib(val.first, fname);
                 calib[pybind11::int_(val.first)] = _readim(fname, false);
@@ -295,9 +322,12 @@ namespace legacy
                 "10'000 lines of the file");
         mod.def("readtrack", _readtrack, "path"_a,
                 "clipcycles"_a = true, "axis"_a = "z", "firstcycle"_a = -1, "lastcycle"_a = -1,
+                "beads"_a = std::vector<int>(),
                 "Reads a '.trk' file and returns a dictionnary of beads,\n"
                 "possibly removing the first 3 cycles and the last one.\n"
-                "axes are x, y or z");
+                "axes are x, y or z.\n\n"
+                "If *beads* is not empty, only those beads are decoded.\n"
+                "Arrays share their memory with the decoder: no copies are made.");
         mod.def("readtrackrotation", _readtrackrotation, "path"_a,
                 "Reads a '.trk' file's rotation");
         mod.def("readgr", _readgr, "path"_a,
@@ -40,6 +40,10 @@ class ChiSquare: # pylint: disable=too-many-instance-attributes
         self.bias    = -bias*stretch if convert else bias
         return self
 
+    def pairs(self) -> np.ndarray:
+        "returns the pairs matched with the current stretch and bias"
+        return self.__pairs(self.stretch, self.bias)
+
     def value(self) -> Tuple[float, float, float]:
         """
         We use the GaussianProductFit results to match exp then estimate
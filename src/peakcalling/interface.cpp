@@ -1,7 +1,11 @@
+#include <algorithm>
+#include <cmath>
+#include <limits>
 #include "utils/pybind11.hpp"
 #include "peakcalling/costfunction.h"
 #include "peakcalling/listmatching.h"
 #include "peakcalling/peakiterator.h"
+#include "signalfilter/parallel.h"
 
 namespace py = pybind11;
 using dpx::pyinterface::ndarray;
@@ -265,11 +269,91 @@ namespace peakcalling
             return ptr;
         }
 
+        /* Sets, for every experiment value, the reference value it is matched
+         * to or NaN. Identical experiment values share the same match.
+         */
+        void _assign(float sigma,
+                     float const * ref, size_t nref,
+                     float const * exp, size_t nexp,
+                     float * out)
+        {
+            std::fill(out, out+nexp, std::numeric_limits<float>::quiet_NaN());
+            if(nref == 0 || nexp == 0)
+                return;
+
+            std::vector<float> uniq;
+            uniq.reserve(nexp);
+            for(size_t i = 0; i < nexp; ++i)
+                if(std::isfinite(exp[i]))
+                    uniq.push_back(exp[i]);
+            std::sort(uniq.begin(), uniq.end());
+            uniq.erase(std::unique(uniq.begin(), uniq.end()), uniq.end());
+            if(uniq.size() == 0)
+                return;
+
+            auto pairs = compute(sigma, ref, nref, uniq.data(), uniq.size());
+            std::vector<float> vals(uniq.size(), std::numeric_limits<float>::quiet_NaN());
+            for(size_t i = 0; i+1 < pairs.size(); i += 2)
+                vals[pairs[i+1]] = ref[pairs[i]];
+
+            for(size_t i = 0; i < nexp; ++i)
+            {
+                auto it = std::lower_bound(uniq.begin(), uniq.end(), exp[i]);
+                if(it != uniq.end() && *it == exp[i])
+                    out[i] = vals[it-uniq.begin()];
+            }
+        }
+
+        ndarray<float> _assignall(std::vector<ndarray<float>> const & refs,
+                                  std::vector<ndarray<float>> const & exps,
+                                  float sigma, int nthreads)
+        {
+            if(refs.size() != exps.size())
+                throw py::index_error("len(references) != len(experiments)");
+
+            std::vector<size_t> offsets(exps.size()+1, 0);
+            for(size_t i = 0; i < exps.size(); ++i)
+                offsets[i+1] = offsets[i] + exps[i].size();
+
+            ndarray<float> out(offsets.back());
+            float * ptr = out.mutable_data();
+
+            std::vector<float const *> rdata, edata;
+            std::vector<size_t>        rsize;
+            for(size_t i = 0; i < refs.size(); ++i)
+            {
+                rdata.push_back(refs[i].data());
+                rsize.push_back(refs[i].size());
+                edata.push_back(exps[i].data());
+            }
+
+            {
+                py::gil_scoped_release _;
+                signalfilter::parallelfor(
+                    exps.size(), nthreads,
+                    [&](size_t i)
+                    {
+                        _assign(sigma, rdata[i], rsize[i], edata[i],
+                                offsets[i+1]-offsets[i], ptr+offsets[i]);
+                    }
+                );
+            }
+            return out;
+        }
+
         void pymodule(py::module & mod)
         {
             using namespace py::literals;
 
             auto ht = mod.def_submodule("match");
+            ht.def("assign", &_assignall,
+                    "references"_a,   "experiments"_a, "sigma"_a = 20., "nthreads"_a = 0,
+                    "Matches peaks from each experiment to its reference,\n"
+                    "allowing a maximum distance of *sigma*.\n\n"
+                    "Items are processed in parallel, using *nthreads* threads\n"
+                    "or all cores if *nthreads* is not positive.\n\n"
+                    "Output is the concatenation, for every experiment, of the\n"
+                    "reference value matched to each experiment value or NaN.");
             ht.def("compute", [](ndarray<float> const & bead1,
                                  ndarray<float> const & bead2,
                                  float s)
@@ -15,7 +15,7 @@ import pandas as pd
 from cleaning.beadsubtraction      import FixedBeadDetection
 from cleaning.processor.__config__ import FixedBeadDetectionTask
 from data.trackio                  import TrackIOError
-from taskstore                     import dumps, loads
+from taskstore                     import memodumps, memoloads
 from taskcontrol.taskcontrol       import ProcessorController
 from taskcontrol.processor         import Processor
 from taskcontrol.processor.base    import register
@@ -36,7 +36,7 @@ def keytobytes(tasks: Union[bytes, ProcessorController], raw: bool = RAW) -> byt
     "convert to bytes"
     if isinstance(tasks, bytes):
         return tasks
-    info = dumps(
+    info = memodumps(
         getattr(tasks, 'model', tasks),
         ensure_ascii = False,
         sort_keys    = True,
@@ -45,7 +45,7 @@ def keytobytes(tasks: Union[bytes, ProcessorController], raw: bool = RAW) -> byt
 
 def keyfrombytes(tasks: bytes, raw: bool = RAW) -> List[Task]:
     "convert from bytes"
-    return loads((tasks if raw else zlib.decompress(tasks)).decode('utf-8'))
+    return memoloads((tasks if raw else zlib.decompress(tasks)).decode('utf-8'))
 
 
 @dataclass
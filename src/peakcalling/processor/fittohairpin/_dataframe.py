@@ -11,7 +11,7 @@ import pandas                      as     pd
 from   peakfinding.processor           import PeakStatusComputer
 from   peakfinding.processor.dataframe import PeaksDataFrameFactory
 from   sequences                       import peaks as _peaks
-from   taskcontrol.processor.dataframe import DataFrameFactory, DataFrameTask
+from   taskcontrol.processor.dataframe import DataFrameFactory, DataFrameTask, ColumnBuffers
 from   ...tohairpin                    import HairpinFitter
 from   ._model                         import FitBead, FitToHairpinTask
 from   ._dict                          import FitToHairpinDict
@@ -180,7 +180,23 @@ class FitsDataFrameFactory(DataFrameFactory[FitToHairpinDict]):
             res:   FitBead
     ) -> Dict[str, np.ndarray]:  # type: ignore
         self.__compute_orientation(frame)
-        frame = self.__config(frame)
+        return self.__bead(self.__config(frame), bead, res)
+
+    def _runmany(self, frame, infos) -> Tuple[List[int], Dict[str, np.ndarray]]:
+        "finds the orientations and configuration once, then computes all beads"
+        self.__compute_orientation(frame)
+        cnf     = self.__config(frame)
+        buffers = ColumnBuffers()
+        for bead, res in infos:
+            buffers.append(self.__bead(cnf, bead, res))
+        return buffers.sizes, buffers.columns()
+
+    def __bead(
+            self,
+            frame: FitToHairpinDict,
+            bead:  int,
+            res:   FitBead
+    ) -> Dict[str, np.ndarray]:
         fits  = frame.fits(bead, res.events)
         out   = self.__basic(frame, bead, res, fits)
         out.update(self.__complex(frame, res, fits))
@@ -3,9 +3,10 @@
 "Matching experimental peaks to hairpins: tasks and processors"
 from   copy    import deepcopy
 from   typing  import (
-    Optional, Iterable, Sequence, Dict, Iterator, Tuple, Union, NamedTuple,
+    Optional, Iterable, Sequence, Dict, Iterator, Tuple, Union, NamedTuple, List,
     Generator, Any, cast
 )
+from   weakref import WeakKeyDictionary
 
 import numpy                            as     np
 
@@ -16,6 +17,7 @@ from   peakfinding.histogram            import HistogramData
 from   peakfinding.processor.dataframe  import PeaksDataFrameFactory, DataFrameFactory
 from   peakfinding.processor.selector   import PeakListArray, PeaksDict
 from   tasksequences                    import StretchFactor
+from   taskcontrol.processor.budget     import BoundedCache
 from   taskcontrol.processor.runner     import run as _runprocessors
 from   taskcontrol.processor.taskview   import TaskViewProcessor
 from   taskcontrol.processor.cache      import Cache
@@ -172,6 +174,68 @@ class FitToReferenceTask(Task, zattributes = ('fitalg', "~window")):
         "whether this task implies long computations"
         return True
 
+class _ReferenceEntry(NamedTuple):
+    versions:  Tuple[int, ...]
+    fitalg:    ReferenceFit
+    view:      Any
+    data:      Dict[int, FitData]
+
+class ReferenceStore:
+    """
+    Reference fit data, computed once per bead and reference state.
+
+    The reference state consists in the reference's processors, the versions
+    of their caches and the fit algorithm: any change invalidates the
+    stored data. References are weakly held: their data is discarded with
+    them. Only the `MAXSIZE` latest references are kept. The data counts
+    against the global memory budget: evicted beads are recomputed.
+    """
+    MAXSIZE = 4
+
+    def __init__(self):
+        self._items: WeakKeyDictionary = WeakKeyDictionary()
+
+    def clear(self):
+        "clears the store"
+        self._items.clear()
+
+    def get(self, ref: Cache, fitalg: ReferenceFit, key: int) -> Optional[FitData]:
+        "returns the fit data for a bead in the reference, computing it if needed"
+        entry = self._entry(ref, fitalg)
+        out   = entry.data.get(key, None)
+        if out is None and key not in entry.data:
+            view = entry.view
+            if isinstance(view, PeaksDict):
+                out = FitData(fitalg.frompeaks(view[key]), (1., 0.))
+            elif isinstance(view, Events):
+                out = FitData(fitalg.fromevents(view[key,...]), (1., 0.))
+            entry.data[key] = out
+        return out
+
+    def _entry(self, ref: Cache, fitalg: ReferenceFit) -> _ReferenceEntry:
+        versions = tuple(i.version for i in ref.items())
+        entry    = self._items.pop(ref, None)
+        if (
+                entry is None
+                or entry.versions != versions
+                or not (entry.fitalg is fitalg or entry.fitalg == fitalg)
+        ):
+            view = next(_runprocessors(ref))
+            while not isinstance(view, (PeaksDict, Events)) and hasattr(view, 'data'):
+                view = view.data
+            # running the processors may create their caches, changing the versions
+            versions = tuple(i.version for i in ref.items())
+            entry    = _ReferenceEntry(
+                versions, fitalg, view, BoundedCache(name = type(self).__name__)
+            )
+
+        self._items[ref] = entry   # move to the end: this is the latest used
+        while len(self._items) > self.MAXSIZE:
+            self._items.pop(next(iter(self._items)))
+        return entry
+
+REFERENCES = ReferenceStore()
+
 class FitToReferenceDict(  # pylint: disable=too-many-ancestors
         TaskView[FitToReferenceTask, int]
 ):
@@ -196,7 +260,11 @@ class FitToReferenceDict(  # pylint: disable=too-many-ancestors
     def _getrefdata(self, key):
         "retrieve data depending on the state of the reference"
         ref = self.config.fitdata.get(key, self.config.defaultdata)
-        if not isinstance(ref, (FitData, bool)):
+        if isinstance(ref, Cache):
+            out = REFERENCES.get(ref, self.config.fitalg, key)
+            if out is not None:
+                return out
+        elif not isinstance(ref, (FitData, bool)):
             view  = next(_runprocessors(ref))
             while not isinstance(view, (PeaksDict, Events)) and hasattr(view, 'data'):
                 view = view.data
@@ -231,12 +299,27 @@ class FitToReferenceDict(  # pylint: disable=too-many-ancestors
         stretch, bias    = self.optimize(key, data)
         data.params      = stretch, bias
         data['peaks'][:] = (data['peaks']-bias)*stretch
-
-        for evts in data['events']:
-            for i in evts:
-                i['data'][:] = [(j-bias)*stretch for j in i['data']]
+        self._rescaleevents(data, stretch, bias)
         return data
 
+    @staticmethod
+    def _rescaleevents(data: FitToRefArray, stretch: float, bias: float):
+        "rescales all events at once using a flat buffer"
+        evts = [i for i in data['events'] if len(i)]
+        arrs = [j for i in evts for j in i['data']]
+        if not arrs or (stretch == 1. and bias == 0.):
+            return
+
+        # the events' data may be read-only views of cached data: these are replaced
+        flat  = np.concatenate(arrs)
+        flat -= bias
+        flat *= stretch
+        last  = 0
+        for i in evts:
+            for k, arr in enumerate(i['data']):
+                i['data'][k] = flat[last:last+len(arr)]
+                last        += len(arr)
+
 class FitToReferenceProcessor(TaskViewProcessor[FitToReferenceTask, FitToReferenceDict, int]):
     "Changes the Z axis to fit the reference"
 
@@ -264,8 +347,6 @@ class FitToReferenceDataFrameFactory(DataFrameFactory[FitToReferenceDict]):
     if __doc__:
         __doc__ += ('\n'+PeaksDataFrameFactory.__doc__                 # type: ignore
                     [PeaksDataFrameFactory.__doc__.find('# Agg')-5:])  # type: ignore
-    PREC     = 5e-6
-
     def __init__(self, task, buffers, frame):
         get = lambda i: (i  if task.measures.get(i, False) is True else  # noqa
                          '' if not task.measures.get(i, False)     else
@@ -280,22 +361,32 @@ class FitToReferenceDataFrameFactory(DataFrameFactory[FitToReferenceDict]):
 
     # pylint: disable=arguments-differ
     def _run(self, frame, key, peaks) -> Dict[str, np.ndarray]:
-        meas   = getattr(self.__parent, '_run')(frame, key, peaks)
-        arr    = np.full(len(meas['peakposition']), np.NaN, dtype = 'f4')
-        meas['referenceposition'] = arr
+        return self._runmany(frame, [(key, peaks)])[1]
+
+    def _runmany(self, frame, infos) -> Tuple[List[int], Dict[str, np.ndarray]]:
+        "computes the columns for all beads at once"
+        if not infos:
+            return [], {}
+
+        meas  = [getattr(self.__parent, '_run')(frame, key, peaks) for key, peaks in infos]
+        sizes = [len(i['peakposition']) for i in meas]
+        cols  = {i: np.concatenate([j[i] for j in meas]) for i in meas[0]}
+
+        # all beads are matched to their reference in a single native call
+        cols['referenceposition'] = _match.assign(
+            [np.asarray(self.__peaks[key], dtype = 'f4') for key, _ in infos],
+            [np.asarray(i['peakposition'], dtype = 'f4') for i in meas],
+            frame.config.window
+        )
         if self.__stretch:
-            meas[self.__stretch] = np.full(len(arr), peaks.params[0], dtype = 'f4')
+            cols[self.__stretch] = np.repeat(
+                np.array([peaks.params[0] for _, peaks in infos], dtype = 'f4'), sizes
+            )
         if self.__bias:
-            meas[self.__bias]    = np.full(len(arr), peaks.params[1], dtype = 'f4')
-
-        ref   = np.asarray(self.__peaks[key], dtype = 'f4')
-        cur   = np.unique(meas['peakposition']).astype('f4')
-        pairs = _match.compute(ref, cur, frame.config.window)
-
-        allv  = meas['peakposition']
-        for i, j in pairs:
-            arr[np.abs(allv - cur[j]) < self.PREC] = self.__peaks[key][i]
-        return meas
+            cols[self.__bias]    = np.repeat(
+                np.array([peaks.params[1] for _, peaks in infos], dtype = 'f4'), sizes
+            )
+        return sizes, cols
 
     @staticmethod
     def __getpeaks(itm: FitData) -> np.ndarray:
@@ -6,6 +6,7 @@ Matching experimental peaks to hairpins
 from   copy         import copy
 from   functools    import partial
 from   itertools    import product
+from   time         import perf_counter
 from   typing       import Dict, List, Sequence, Iterator, Tuple, Any, Union, cast
 import numpy        as     np
 
@@ -134,8 +135,21 @@ class GaussianProductFit(HairpinFitter, GriddedOptimization):
     Then the cost is:
 
         1 - R(X, Y)/sqrt(R(X, X) R(Y, Y))
+
+    # Seed screening
+
+    By default, the cost is fully optimized starting from every node in the
+    grid. With `basins > 0`, the cost is first evaluated at every node. Nodes
+    are then grouped by following the steepest descent from one node to the
+    next: nodes ending on the same local minimum belong to the same basin.
+    Only the `basins` best basins are optimized, starting from their minimum.
+
+    With `timebudget > 0`, no new optimization is started once that many
+    seconds have elapsed. At least one optimization is always performed.
     """
-    precision:float = 15.
+    precision:  float = 15.
+    basins:     int   = 0
+    timebudget: float = 0.
     @initdefaults(frozenset(locals()))
     def __init__(self, **kwa):
         HairpinFitter.__init__(self, **kwa)
@@ -159,7 +173,8 @@ class GaussianProductFit(HairpinFitter, GriddedOptimization):
                                      baseline     = 1. if self.hasbaseline     else 0.)
 
             bias  = 0. if self.bias.center is None else delta
-            for vals in self.grid:
+            start = perf_counter()
+            for vals in self.seeds(hpin, peaks, bias, args):
                 args.update(min_stretch = vals[0] - self.stretch.step,
                             stretch     = vals[0],
                             max_stretch = vals[0] + self.stretch.step,
@@ -174,8 +189,50 @@ class GaussianProductFit(HairpinFitter, GriddedOptimization):
                 else:
                     if out[0] < best[0]:
                         best = out
+
+                if 0. < self.timebudget < perf_counter() - start:
+                    break
         return Distance(best[0], best[1], delta-(best[2]+hpdelta)/best[1])
 
+    def seeds(
+            self, hpin: np.ndarray, peaks: np.ndarray, bias: float, args: Dict[str, Any]
+    ) -> Sequence[Tuple[float, float]]:
+        "returns the grid nodes from which to optimize, most promising first"
+        grid = [tuple(i) for i in self.grid]
+        if self.basins <= 0 or len(grid) <= self.basins:
+            return grid
+
+        nstretch = len({i[0] for i in grid})
+        cnf      = {i: args[i] for i in ('symmetry', 'noise', 'baseline', 'singlestrand')}
+        costs    = np.array([
+            _cost.compute(hpin, peaks, stretch = i, bias = -i*(j+bias), **cnf)[0]
+            for i, j in grid
+        ]).reshape(nstretch, -1)
+
+        roots = self.__basinroots(costs)
+        inds  = sorted(set(roots.ravel()), key = lambda i: costs.flat[i])
+        return [grid[i] for i in inds[:self.basins]]
+
+    @staticmethod
+    def __basinroots(costs: np.ndarray) -> np.ndarray:
+        "returns, for each node, the index of the local minimum it descends to"
+        rows, cols = costs.shape
+        padded     = np.pad(costs, 1, mode = 'constant', constant_values = np.inf)
+        nexts      = np.arange(costs.size).reshape(costs.shape)
+        best       = np.array(costs, copy = True)
+        for i, j in product((-1, 0, 1), (-1, 0, 1)):
+            cur   = padded[1+i:1+i+rows, 1+j:1+j+cols]
+            found = cur < best
+            best[found]  = cur[found]
+            nexts[found] = ((np.arange(rows)[:,None]+i)*cols+np.arange(cols)[None,:]+j)[found]
+
+        roots = nexts.ravel()
+        while True:
+            nroots = roots[roots]
+            if np.array_equal(nroots, roots):
+                return roots
+            roots = nroots
+
     def value(self, peaks: np.ndarray, stretch, bias) -> Tuple[float, float, float]:
         "computes the cost value at a given stretch and bias as well as derivatives"
         peaks, hpin = self._applypivot(peaks)[1::2]
@@ -251,10 +308,19 @@ class PeakGridFit(HairpinFitter):
     * we estimate a reduced χ² as the cost function
 
     The stretch & bias with the least χ² value is returned.
+
+    # Seed screening
+
+    By default, every pair of associations is optimized. With `screen`, pairs
+    leading to the same initial match of at least 2 peaks are optimized only
+    once: they converge to the same optimum. With `timebudget > 0`, no new pair
+    is considered once that many seconds have elapsed.
     """
-    window    = 10.
-    symmetry  = Symmetry.both
-    bounds    = 10.
+    window     = 10.
+    symmetry   = Symmetry.both
+    bounds     = 10.
+    screen     = False
+    timebudget = 0.
     @initdefaults(frozenset(locals()))
     def __init__(self, **kwa):
         super().__init__(**kwa)
@@ -284,11 +350,36 @@ class PeakGridFit(HairpinFitter):
                           singlestrand = self.hassinglestrand)
         cstr  = self.constraints()
         fcn   = lambda x: Distance(x[0], x[1], delta-(x[2]+hpdelta)/x[1])
-        yield from (fcn(chi.update(i[0], i[1], True).optimize(*cstr)) for i in itr)
+        if not self.screen:
+            yield from (fcn(chi.update(i[0], i[1], True).optimize(*cstr)) for i in itr)
+            return
+
+        done: Dict[bytes, Distance] = {}
+        for i in itr:
+            pairs = chi.update(i[0], i[1], True).pairs()
+            if len(pairs) < 2:
+                # the optimum is then the seed itself
+                yield fcn(chi.optimize(*cstr))
+                continue
+
+            key = pairs.tobytes()
+            if key not in done:
+                done[key] = fcn(chi.optimize(*cstr))
+            yield done[key]
 
     def optimize(self, peaks:np.ndarray) -> Distance:
         "computes stretch and bias for potential pairings"
-        return min(self.iterate(peaks), default = self.defaultdistance(peaks))
+        itr = self.iterate(peaks)
+        if self.timebudget > 0.:
+            itr = self.__budgeted(itr)
+        return min(itr, default = self.defaultdistance(peaks))
+
+    def __budgeted(self, itr: Iterator[Distance]) -> Iterator[Distance]:
+        start = perf_counter()
+        for i in itr:
+            yield i
+            if perf_counter() - start > self.timebudget:
+                break
 
     def value(self, peaks:np.ndarray,
               stretch: Union[float, np.ndarray],
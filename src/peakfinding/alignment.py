@@ -531,7 +531,8 @@ class PeakPostAlignment:
         evts['peaks'] = np.average(stats['mean']+biases, 1, stats['weight'])
         for i in evts['events']:
             for j, k in zip(i, biases):
-                j['data'][:] += k
+                # event data may be read-only views of cached data
+                j['data'] = j['data'] + k
         return evts
 
     def __call__(self, stats):
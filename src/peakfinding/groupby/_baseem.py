@@ -4,12 +4,12 @@
 import itertools
 from abc         import abstractmethod
 from functools   import partial
-from typing      import Dict, Tuple
+from typing      import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
 from utils import initdefaults
 
-from .._core import emrunner, emscore  # pylint: disable = import-error
+from .._core import emrunner, emrunners, emscore  # pylint: disable = import-error
 
 class EMFlagger:
     'flag peak corresponding to events'
@@ -51,6 +51,10 @@ class BaseEM(EMFlagger):
     withtime    = True
     precision   = 1e-5   # std deviation
     mergewindow = 0.00 # in microns
+    abandon     = 0.   # loglikelihood lag for abandoning a fit amongst many (if > 0)
+    minsteps    = 10   # number of EM steps before a fit can be abandoned
+    nthreads    = 0    # number of threads for fitting many starting points: 0 is all cores
+                       # a single one is used when abandoning fits, for reproducibility
 
     @initdefaults(frozenset(locals()))
     def __init__(self,**kwa):
@@ -143,6 +147,29 @@ class BaseEM(EMFlagger):
                                 self.tol,self.precision**2)
 
 
+    def fits(
+            self,
+            data:   np.ndarray,
+            inits:  Sequence[Tuple[np.ndarray, np.ndarray]],
+            groups: Optional[Sequence[int]] = None
+    ) -> List[Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        fits each (rates, params) starting point, in parallel if possible.
+
+        Fits within a same group are compared and may be abandoned, in which
+        case None is returned instead.
+        """
+        if self.fittingalgo is not self.cfit:
+            return [self.fit(data, *i) for i in inits]
+
+        outs = emrunners(data,
+                         [np.asarray(i[0], dtype = 'f8') for i in inits],
+                         [np.asarray(i[1], dtype = 'f8') for i in inits],
+                         list(range(len(inits))) if groups is None else list(groups),
+                         self.emiter, self.precision**2, self.tol,
+                         self.abandon, self.minsteps, self.nthreads)
+        return [None if i.abandoned else (i.rates, i.params) for i in outs]
+
     def fromzestimate(self,data:np.ndarray,zpeaks:np.ndarray):
         "calls fittingalgo based on estimation of zpeaks"
         # group peaks too close
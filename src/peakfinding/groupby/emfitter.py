@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 "Creates a histogram from available events"
 from itertools import product
-from typing import Iterable, List, Union
+from typing import Dict, Iterable, List, Tuple, Union
 import warnings
 
 import numpy as np
@@ -140,25 +140,37 @@ class RandInit(BaseEM):
         """
         returns the randomly initialized rates, params with lower bic
         """
-        inits = [np.random.choice(self.data[:,0],nsamples) for i in range(self.repeats)]
-        bicpeaks = []
-        for peaks in inits:
-            rates,params = self.fromzestimate(self.data,peaks)
-            rates,params = self.fit(self.data,rates,params)
-            score        = self.score(self.data,params)
-            bic          = self.bic(score,rates,params)
-            bicpeaks.append((bic,rates,params))
-
-        return sorted(bicpeaks,key=lambda x:x[0])[0]
+        return self.__randinits([nsamples])[0]
 
     def fitnsamples(self):
         "returns the best fit across multiple samples"
         if isinstance(self.nsamples,Iterable):
-            return sorted([self.nrandinit(_) for _ in self.nsamples],
+            return sorted(self.__randinits(list(self.nsamples)),
                           key=lambda x: x[0])[0][-2:]
 
         return self.nrandinit(self.nsamples)[-2:]
 
+    def __randinits(self, nsamples: List[int]) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+        """
+        returns the randomly initialized rates, params with lower bic for each
+        number of samples. All restarts are fitted at once: if `abandon` is
+        set, those with a same number of samples are compared and the worst
+        are abandoned early.
+        """
+        groups = [i for i in range(len(nsamples)) for _ in range(self.repeats)]
+        inits  = [self.fromzestimate(self.data, np.random.choice(self.data[:,0], nsamples[i]))
+                  for i in groups]
+
+        best: Dict[int, Tuple[float, np.ndarray, np.ndarray]] = {}
+        for igrp, fit in zip(groups, self.fits(self.data, inits, groups)):
+            if fit is None:
+                continue
+            rates,params = fit
+            bic          = self.bic(self.score(self.data,params),rates,params)
+            if igrp not in best or bic < best[igrp][0]:
+                best[igrp] = (bic,rates,params)
+        return [best[i] for i in range(len(nsamples))]
+
 class BicSplit(MaxCov):
     """
     tries to split each peak iteratively
@@ -181,17 +193,18 @@ class BicSplit(MaxCov):
         tocheck       = self.__tocheck(rates,params[:,1]>self.precision**2)
         bic           = self.bic(self.score(self.data,params),rates,params)
         while any(tocheck):
-            idx = next(i for i,v in enumerate(tocheck) if v)
-            nrates,nparams = self.splitparams(rates,params,idx)
-            nrates,nparams = self.fit(self.data,nrates,nparams)
-            nbic = self.bic(self.score(self.data,nparams),nrates,nparams)
-            if nbic<bic:
-                bic,rates,params = nbic,nrates,nparams
-                tocheck          = np.insert(tocheck,idx,True)
-                # updating
-                tocheck          = self.__tocheck(rates,params[:,1]>self.precision**2)
+            # all splits are fitted at once, starting from the current fit.
+            # As when trying them one at a time, the first better one is kept
+            idx  = [i for i,v in enumerate(tocheck) if v]
+            fits = self.fits(self.data,[self.splitparams(rates,params,i) for i in idx])
+            for nrates,nparams in fits:
+                nbic = self.bic(self.score(self.data,nparams),nrates,nparams)
+                if nbic<bic:
+                    bic,rates,params = nbic,nrates,nparams
+                    tocheck          = self.__tocheck(rates,params[:,1]>self.precision**2)
+                    break
             else:
-                tocheck[idx] = False
+                break
 
         return rates,params
 
@@ -1,3 +1,6 @@
+#include <map>
+#include <mutex>
+#include "signalfilter/parallel.h"
 #include"emutils.h"
 
 
@@ -92,56 +95,40 @@ namespace peakfinding{
             return lscore; // no added uniform pdf
         }
         
-        // this function can be improved
-        // must change creation of diagproba to row * matrix
         matrix maximizeparam(const matrix &data,matrix pz_x,double lowercov){
             // maximizes (all) parameters to reduce data manipulations 
             // proba is a row of npz_x
             const size_t DCOLS = (size_t) data.size2();
             const size_t DROWS = (size_t) data.size1();
             auto spdata          = blas::subrange(data,0,DROWS,0,DCOLS-1);
-            auto spdata_t        = blas::trans(spdata);
 
             // new spatial means are rows of wspdata;
-            auto wspdata = blas::prod(pz_x,spdata); // new mean values
+            matrix wspdata = blas::prod(pz_x,spdata); // new mean values
             // new mean of time is zero;
             
             auto tdata  = blas::column(data,DCOLS-1);
             const size_t NPCOLS = 2*DCOLS-1;
             matrix newparams(pz_x.size1(),NPCOLS+1,0);
-            matrix ncov(DCOLS-1,DCOLS-1);
-            matrix tmpwdata(DCOLS,DCOLS-1,0);
-            matrix diagproba(DROWS,DROWS,0);
             // the new duration scale is the sum of the element product of row * data[:,-1]
-            blas::vector<double> row, prod;
-            blas::vector<double> ones(DROWS,1.);
-            matrix tmpcenter(DROWS,DCOLS-1); // center wspdata on parameter mean
-            matrix ONEROWS(DROWS,1,1.);
-            matrix centered(spdata.size1(),spdata.size2(),0.);
-            matrix centered_t(spdata.size2(),spdata.size1(),0.); // transposed
-            matrix wcentered(spdata.size1(),spdata.size2(),0.); // weighted
+            // the new covariances are the weighted sums of squared centered data:
+            // only the diagonal is needed, no need for a DROWS x DROWS weight matrix
             for (size_t it=0u,nrows=(size_t)pz_x.size1();it<nrows;++it){
-                row = blas::row(pz_x,it);
-                for (size_t dite=0u;dite<DROWS;++dite)
-                    diagproba(dite,dite)=row(dite);
-                
-                prod = blas::element_prod(row,tdata);
-                newparams(it,NPCOLS) = blas::inner_prod(prod,ones); // duration scale 
-                // computing new covariance matrix
-                // centering data
-                tmpcenter  = blas::prod(ONEROWS,blas::subrange(wspdata,it,it+1,0,DCOLS-1));
-                centered   = spdata-tmpcenter;
-                centered_t = blas::trans(centered);
-                wcentered  = blas::prod(diagproba,centered);
-                ncov           = blas::prod(centered_t,wcentered);
-                // need to add the spatial means and covariance a row at a time
+                auto row = blas::row(pz_x,it);
+                newparams(it,NPCOLS) = blas::inner_prod(row,tdata); // duration scale 
                 for (size_t dim=0u,maxdim=DCOLS-1;dim<maxdim;++dim){
-                    newparams(it,2*dim) = wspdata(it,dim);        // mean
-                    if(ncov(dim,dim)<lowercov){
+                    double mean = wspdata(it,dim);
+                    double ncov = 0.;
+                    for (size_t dite=0u;dite<DROWS;++dite){
+                        double delta = spdata(dite,dim)-mean;
+                        ncov        += row(dite)*delta*delta;
+                    }
+
+                    newparams(it,2*dim) = mean;
+                    if(ncov<lowercov){
                         newparams(it,2*dim+1)=lowercov;
                     }
                     else{
-                        newparams(it,2*dim+1)=ncov(dim,dim);
+                        newparams(it,2*dim+1)=ncov;
                     }
                 }
                 
@@ -196,7 +183,7 @@ namespace peakfinding{
         }
         
 
-        void oneemstep(matrix &data,
+        void oneemstep(const matrix &data,
                        matrix &rates,
                        matrix &params,
                        double lowercov){
@@ -209,24 +196,85 @@ namespace peakfinding{
             return;
         }
 
-        
-        void emsteps(matrix &data,
+        bool emsteps(const matrix &data,
                      matrix &rates,
                      matrix &params,
                      size_t nsteps,
                      double lowercov,
-                     double tol){
+                     double tol,
+                     std::function<bool(size_t, double)> const & keepgoing,
+                     double & llike){
+            // the score used for checking the convergence is reused
+            // for the next expectation step
             matrix score        = scoreparams(data,params);
-            double prevll        = llikelihood(score, rates);
-            double newll;
+            double prevll       = llikelihood(score, rates);
+            llike               = prevll;
             for (size_t ite=0u;ite<nsteps;++ite){
-                oneemstep(data,rates,params,lowercov);
-                score = scoreparams(data,params);
-                newll = llikelihood(score, rates);
-                // std::cout<<ite<<" "<<newll-prevll<<std::endl;
-                if (newll-prevll<tol) return;
+                matrix          pz_x      = getpz_x(score,rates);
+                MaximizedOutput maximized = maximization(data,pz_x,lowercov);
+                rates                     = maximized.rates;
+                params                    = maximized.params;
+
+                score       = scoreparams(data,params);
+                double newll= llikelihood(score, rates);
+                llike       = newll;
+                if (newll-prevll<tol)
+                    return true;
+                if (!keepgoing(ite, newll))
+                    return false;
                 prevll=newll;
             }
+            return true;
+        }
+
+        void emsteps(const matrix &data,
+                     matrix &rates,
+                     matrix &params,
+                     size_t nsteps,
+                     double lowercov,
+                     double tol){
+            double llike;
+            emsteps(data, rates, params, nsteps, lowercov, tol,
+                    [](size_t, double) { return true; }, llike);
+        }
+
+        void emruns(const matrix &data,
+                    std::vector<EmRun> & runs,
+                    size_t nsteps,
+                    double lowercov,
+                    double tol,
+                    double abandon,
+                    size_t minsteps,
+                    int    nthreads){
+            // best likelihood per group of comparable runs, from runs which converged
+            std::map<int, double> best;
+            std::mutex            lock;
+            auto fcn = [&](size_t i)
+            {
+                EmRun & run = runs[i];
+                auto keepgoing = [&](size_t ite, double llike)
+                {
+                    if(abandon <= 0. || ite < minsteps)
+                        return true;
+                    std::lock_guard<std::mutex> _(lock);
+                    auto it = best.find(run.group);
+                    return it == best.end() || llike >= it->second - abandon;
+                };
+
+                run.abandoned = !emsteps(data, run.rates, run.params, nsteps, lowercov, tol,
+                                         keepgoing, run.llikelihood);
+                if(!run.abandoned)
+                {
+                    std::lock_guard<std::mutex> _(lock);
+                    auto it = best.find(run.group);
+                    if(it == best.end())
+                        best[run.group] = run.llikelihood;
+                    else if(it->second < run.llikelihood)
+                        it->second = run.llikelihood;
+                }
+            };
+            // abandoning depends on the order in which runs complete
+            signalfilter::parallelfor(runs.size(), abandon > 0. ? 1 : nthreads, fcn);
         }
 
     }
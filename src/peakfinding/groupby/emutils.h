@@ -2,6 +2,8 @@
 #ifndef EMUTILS_H
 #define EMUTILS_H
 #include<iostream>
+#include<functional>
+#include<vector>
 #include<float.h>
 #include<math.h>
 #include<boost/numeric/ublas/matrix.hpp>
@@ -15,12 +17,17 @@ namespace peakfinding{
 	using  matrix = blas::matrix<double>;
 	double llikelihood(const matrix& ,const matrix&);
 	struct MaximizedOutput{matrix rates,params;};
+	// one EM fit amongst many: *group* tells which runs have comparable likelihoods
+	struct EmRun{matrix rates,params; int group = 0; double llikelihood = 0.; bool abandoned = false;};
 	double normpdf(double loc,double var,double pos);
 	double exppdf(double loc,double scale,double pos);
 	double pdfparam(blas::vector<double> ,blas::vector<double>);
 	double logpdfparam(blas::vector<double> ,blas::vector<double>);
-	void   oneemstep(matrix&, matrix&, matrix&,double);
-	void   emsteps(matrix&, matrix&, matrix&,size_t,double,double);
+	void   oneemstep(const matrix&, matrix&, matrix&,double);
+	void   emsteps(const matrix&, matrix&, matrix&,size_t,double,double);
+	bool   emsteps(const matrix&, matrix&, matrix&,size_t,double,double,
+		       std::function<bool(size_t, double)> const &, double &);
+	void   emruns(const matrix&, std::vector<EmRun>&,size_t,double,double,double,size_t,int);
 	double scoreparam(blas::vector<double> ,blas::vector<double>);
 	matrix scoreparams(const matrix &, const matrix &);
 	matrix logscoreparams(const matrix &, const matrix &);
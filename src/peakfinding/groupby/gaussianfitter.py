@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Creates a histogram from available events"
-from typing import (Dict, Iterable, Union, cast)
+from typing import (Dict, Iterable, Optional, Union, cast)
 
 import numpy as np
 from sklearn.mixture import GaussianMixture
@@ -22,13 +22,20 @@ class ByGaussianMix:
     '''
     finds peaks and groups events using Gaussian mixture
     the number of components is estimated using BIC criteria
+
+    * `grow`: whether each number of components is seeded from the previous
+    fit rather than fitted from scratch.
+    * `critpatience`: the number of consecutive rises of the criterion after
+    which the search stops. None means fitting every number of components.
     '''
-    max_iter        = 10000
-    cov_type        = 'full'
-    peakwidth       = 1
-    crit            = 'bic'
-    mincount        = 5
-    varcmpnts       = 0.2
+    max_iter                    = 10000
+    cov_type                    = 'full'
+    peakwidth                   = 1
+    crit                        = 'bic'
+    mincount                    = 5
+    varcmpnts                   = 0.2
+    grow                        = True
+    critpatience: Optional[int] = 2
 
     @initdefaults(frozenset(locals()))
     def __init__(self, **_):
@@ -70,32 +77,59 @@ class ByGaussianMix:
     def __strip(self,pos,evts,gmm):
         'removes peaks which have fewer than mincount events'
         predicts = gmm.predict(evts)
-        keep     = [pkid for pkid in range(gmm.n_components) if sum(predicts==pkid)>=self.mincount]
-
-        def assign(zpos):
-            'set id'
-            idx = gmm.predict(zpos)[0]
-            return idx if idx in keep else np.iinfo("i4").max
-
-        vids = np.vectorize(assign)
-        return np.array([vids(zpos) if zpos.size>0 else np.array([]) for zpos in pos])
+        keep     = np.bincount(predicts, minlength = gmm.n_components) >= self.mincount
+        ids      = np.where(keep[predicts], predicts, np.iinfo("i4").max)
+        sizes    = np.cumsum([np.size(zpos) for zpos in pos])[:-1]
+        return np.array([cids if zpos.size>0 else np.array([])
+                         for zpos, cids in zip(pos, np.split(ids, sizes))])
 
     def __fit(self,evts,maxcmpts,mincmpts,kwargs):
         '''
-        runs Gaussian Mixture for different components
-        returns the one which minimizes crit
+        runs Gaussian Mixture for an increasing number of components, each
+        seeded with the previous solution, and returns the one which minimizes
+        crit. The search stops once crit has increased *critpatience* times
+        in a row.
+
+        This selects the same model as fitting every number of components from
+        scratch unless crit has a local minimum followed by *critpatience*
+        rises, or unless a seeded fit converges to a different local optimum
+        than a fit from scratch would. Both are unlikely with well-separated
+        peaks. Setting *critpatience* to None and *grow* to False runs the
+        exhaustive search instead.
         '''
-        gmms = self.__run_gmms(evts,maxcmpts,mincmpts,kwargs)
-        return self.__min_crit(self.crit,evts,gmms)
-
-    @staticmethod
-    def __run_gmms(evts:np.ndarray,maxncmps:int,mincmps:int,kwargs:Dict):
-        gmms = [GaussianMixture(n_components = ite,**kwargs) for ite in range(mincmps,maxncmps)]
-        for ite in range(maxncmps-mincmps):
-            gmms[ite].fit(evts)
-        return gmms
+        best, bestcrit, rises, gmm = None, np.inf, 0, None
+        for ncmps in range(mincmpts,maxcmpts):
+            gmm  = self.__grow(evts, gmm if self.grow else None, ncmps, kwargs)
+            crit = getattr(gmm,self.crit)(evts)
+            if crit < bestcrit:
+                best, bestcrit, rises = gmm, crit, 0
+            else:
+                rises += 1
+                if self.critpatience is not None and rises >= self.critpatience:
+                    break
+        return best
 
     @staticmethod
-    def __min_crit(crit:str,evts:np.ndarray,gmms):
-        values = [getattr(gmm,crit)(evts) for gmm in gmms]
-        return gmms[np.argmin(values)]
+    def __grow(evts:np.ndarray, prev, ncmps:int, kwargs:Dict) -> GaussianMixture:
+        "fits ncmps components, splitting the widest component of the previous fit"
+        if prev is None or prev.n_components != ncmps-1 or kwargs.get('covariance_type') == 'tied':
+            return GaussianMixture(n_components = ncmps,**kwargs).fit(evts)
+
+        means   = prev.means_.ravel()
+        weights = prev.weights_.ravel()
+        var     = prev.covariances_.reshape(len(means), -1)[:,0]
+        idx     = np.argmax(weights*np.sqrt(var))
+        delta   = .5*np.sqrt(var[idx])
+
+        means   = np.insert(means, idx+1, means[idx]+delta)
+        means[idx] -= delta
+        weights = np.insert(weights, idx+1, weights[idx]*.5)
+        weights[idx] *= .5
+        var     = np.insert(var, idx+1, var[idx])
+
+        shape   = {'full': (-1, 1, 1), 'diag': (-1, 1)}.get(kwargs.get('covariance_type'), (-1,))
+        return GaussianMixture(n_components    = ncmps,
+                               means_init      = means.reshape(-1,1),
+                               weights_init    = weights/weights.sum(),
+                               precisions_init = (1./var).reshape(shape),
+                               **kwargs).fit(evts)
@@ -27,8 +27,16 @@ namespace peakfinding{
     OutputPy
     {
         ndarray score,rates,params;
+        double  llikelihood = 0.;
+        bool    abandoned   = false;
     };
 
+	ndarray matrixtoarray(matrix const & mat){
+	    return ndarray({mat.size1(),mat.size2()},
+			   {mat.size2()*sizeof(double),sizeof(double)},
+			   &(mat.data()[0]));
+	}
+
 	OutputPy emrunner(ndarray pydata,
 			  ndarray pyrates,
 			  ndarray pyparams,
@@ -63,6 +71,42 @@ namespace peakfinding{
 	    return output;
 	}
 
+	std::vector<OutputPy> emrunners(ndarray pydata,
+					std::vector<ndarray> pyrates,
+					std::vector<ndarray> pyparams,
+					std::vector<int> groups,
+					size_t nsteps,
+					double lowercov,
+					double tol,
+					double abandon,
+					size_t minsteps,
+					int nthreads){
+	    if(pyrates.size() != pyparams.size() || (groups.size() && groups.size() != pyrates.size()))
+		throw pybind11::value_error("rates, params and groups must have the same length");
+
+	    matrix            data = arraytomatrix(pydata);
+	    std::vector<EmRun> runs(pyrates.size());
+	    for(size_t i = 0u; i < runs.size(); ++i){
+		runs[i].rates  = arraytomatrix(pyrates[i]);
+		runs[i].params = arraytomatrix(pyparams[i]);
+		runs[i].group  = groups.size() ? groups[i] : 0;
+	    }
+
+	    {
+		py::gil_scoped_release _;
+		emruns(data, runs, nsteps, lowercov, tol, abandon, minsteps, nthreads);
+	    }
+
+	    std::vector<OutputPy> out(runs.size());
+	    for(size_t i = 0u; i < runs.size(); ++i){
+		out[i].rates       = matrixtoarray(runs[i].rates);
+		out[i].params      = matrixtoarray(runs[i].params);
+		out[i].llikelihood = runs[i].llikelihood;
+		out[i].abandoned   = runs[i].abandoned;
+	    }
+	    return out;
+	}
+
 	ndarray pylogscore(ndarray pydata,ndarray pyparams){
 	    auto    infopar	= pyparams.request();
 	    auto    infodat	= pydata.request();
@@ -104,6 +148,27 @@ namespace peakfinding{
 	    auto doc = R"_(Runs Expectation Maximization N times)_";
 	    mod.def("emrunner",[](ndarray data,ndarray rates,ndarray params,size_t nsteps,double lower, double tol)
 	     	    {return emrunner(data,rates,params,nsteps,lower,tol);},doc);
+	    mod.def("emrunners",
+		    [](ndarray data, std::vector<ndarray> rates, std::vector<ndarray> params,
+		       std::vector<int> groups, size_t nsteps, double lower, double tol,
+		       double abandon, size_t minsteps, int nthreads)
+		    {
+			return emrunners(data, rates, params, groups, nsteps, lower, tol,
+					 abandon, minsteps, nthreads);
+		    },
+		    py::arg("data"), py::arg("rates"), py::arg("params"), py::arg("groups"),
+		    py::arg("nsteps"), py::arg("lowercov"), py::arg("tol"),
+		    py::arg("abandon") = 0., py::arg("minsteps") = 10, py::arg("nthreads") = 0,
+		    R"_(Runs Expectation Maximization from multiple starting points, in parallel.
+
+Runs within a same *group* are compared: once one has converged, others
+are abandoned if, after *minsteps* iterations, their log-likelihood is
+below the best one by more than *abandon*. A non-positive *abandon*
+disables this. Abandoned runs are flagged as such in the output.
+
+Runs are dispatched over *nthreads* threads, all cores if non-positive.
+Which runs are abandoned depends on the order in which runs complete: a
+single thread is used whenever *abandon* is positive.)_");
 	    mod.def("normpdf",[](double loc,double var, double pos){return normpdf(loc,var,pos);},
 		    R"_(compute pdf of normal distribution)_");
 	    mod.def("exppdf",[](double loc,double scale, double pos){return exppdf(loc,scale,pos);},
@@ -119,7 +184,9 @@ namespace peakfinding{
 		.def(pybind11::init<>())
 		.def_readwrite("score", &OutputPy::score)
 		.def_readwrite("rates", &OutputPy::rates)
-		.def_readwrite("params", &OutputPy::params);
+		.def_readwrite("params", &OutputPy::params)
+		.def_readwrite("llikelihood", &OutputPy::llikelihood)
+		.def_readwrite("abandoned", &OutputPy::abandoned);
 	}
     }
 }
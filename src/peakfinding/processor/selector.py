@@ -7,6 +7,7 @@ Deals with tasks & processors for finding peaks
 from   typing                         import Optional
 
 from   data.views                     import TaskView, Beads
+from   eventdetection.data            import Events
 from   taskcontrol.processor.taskview import TaskViewProcessor
 from   taskmodel                      import Level, Task
 from   ..peaksarray                   import PeakListArray
@@ -97,6 +98,15 @@ class PeaksDict(TaskView[PeakSelectorTask,int]): # pylint: disable=too-many-ance
     # pylint: disable=arguments-differ
     def compute(self, ibead, precision: float = None) -> PeakListArray:
         "Computes values for one bead"
+        if isinstance(self.data, Events) and not self.data.actions:
+            # read-only views protect the cached events from changes made downstream
+            index = self.data.eventindex(ibead)
+            return self.config(
+                index.readonlyevents(),
+                self._precision(ibead, precision),
+                index.percycle('mean')
+            )
+
         vals = (self.data.bead(ibead) if hasattr(self.data, 'bead') else # type: ignore
                 self.data[ibead,...].values())                           # type: ignore
         return self.config(vals, self._precision(ibead, precision))
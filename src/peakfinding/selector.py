@@ -160,8 +160,18 @@ class PeakSelector(PrecisionAlg, zattributes = ('precision', 'histogram')):
     def __init__(self, **_):
         super().__init__(**_)
 
-    def detailed(self, evts: Input, precision: PRECISION = None) -> PeakSelectorDetails:
-        "returns computation details"
+    def detailed(
+            self,
+            evts:      Input,
+            precision: PRECISION            = None,
+            positions: Optional[np.ndarray] = None
+    ) -> PeakSelectorDetails:
+        """
+        returns computation details
+
+        Event positions, as computed by `Histogram.eventpositions`, can be
+        provided when the latter uses the mean: see `eventdetection.data.EventIndex`.
+        """
         orig   = asobjarray(evts)
         orig   = asview(orig, PeaksArray,
                         discarded = sum(getattr(i, 'discarded', 0) for i in orig))
@@ -171,7 +181,10 @@ class PeakSelector(PrecisionAlg, zattributes = ('precision', 'histogram')):
 
         projector = updatecopy(self.histogram, True, precision = precision)
 
-        pos       = projector.eventpositions(events)
+        if positions is not None and projector.zmeasure in ('nanmean', np.nanmean):
+            pos   = positions
+        else:
+            pos   = projector.eventpositions(events)
         if len(pos) == 0:
             return PeakSelectorDetails(pos, np.empty([], dtype = 'f4'), # type: ignore
                                        0., 1., 0., [], orig, [])
@@ -206,5 +219,10 @@ class PeakSelector(PrecisionAlg, zattributes = ('precision', 'histogram')):
             dtl = PeakSelectorDetails([], [], 0., 1., 0., [], [], []) # type: ignore
         return dtl.output(self.zmeasure)
 
-    def __call__(self, evts: Input, precision: PRECISION = None) -> PeakListArray:
-        return self.details2output(self.detailed(evts, precision))
+    def __call__(
+            self,
+            evts:      Input,
+            precision: PRECISION            = None,
+            positions: Optional[np.ndarray] = None
+    ) -> PeakListArray:
+        return self.details2output(self.detailed(evts, precision, positions))
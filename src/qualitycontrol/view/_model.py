@@ -52,6 +52,12 @@ class GuiDataCleaningProcessor(DataCleaningProcessor):
         "returns the result of the beadselection"
         _extend(cache, info, super().compute(frame, info, cache = cache, **cnf))
 
+    def run(self, args):
+        "updates the frames"
+        # messages are accumulated over beads: these cannot be evicted
+        cache = args.data.setcachedefault(self, dict())
+        return args.apply(partial(self.apply, cache = cache, **self.config()))
+
 class GuiExtremumAlignmentProcessor(ExtremumAlignmentProcessor):
     "gui extremum alignment cleaning processor"
     @classmethod
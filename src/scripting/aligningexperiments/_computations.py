@@ -52,11 +52,11 @@ def createpeaks(tracks, *args: Task, fullstats = True, target = None, **kwa):
     data = PeaksAlignment(**kwa).peaks(tracks)
 
     if fullstats:
-        vals = [(i, j, k) for i, j in tracks.items()
-                for k in data[data.track == i].bead.unique()]
-        fdf  = (pd.DataFrame({"hfsigma": [j.rawprecision(k) for i, j, k in vals],
-                              "track":   [i for i, j, k in vals],
-                              "bead":    [k for i, j, k in vals]})
+        vals = [(i, k, l) for i, j in tracks.items()
+                for k, l in j.rawprecision(data[data.track == i].bead.unique())]
+        fdf  = (pd.DataFrame({"hfsigma": [l for i, k, l in vals],
+                              "track":   [i for i, k, l in vals],
+                              "bead":    [k for i, k, l in vals]})
                 .set_index(["track", "bead"]))
         data.set_index(["track", "bead"], inplace = True)
         data = data.join(fdf)
@@ -3,7 +3,7 @@
 u"Signal Analysis: filters, stats and interval detection"
 from ._base             import (mediandeviation, nanmediandeviation,
                                 nanhfsigma, hfsigma, PrecisionAlg, CppPrecisionAlg,
-                                PRECISION)
+                                PrecisionCache, PRECISION, PRECISIONS)
 from ._core.stats       import (nancount, # pylint: disable=no-name-in-module,import-error
                                 nanthreshold)
 from .noisereduction    import (RollingFilter, NonLinearFilter,
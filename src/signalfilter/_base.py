@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Signal Analysis: filters for removing noise"
+from collections    import OrderedDict
+from threading      import Lock
 from typing         import (Union, Iterator, Iterable, Tuple, Sequence, Optional,
-                            overload, cast, TYPE_CHECKING)
+                            Hashable, overload, cast, TYPE_CHECKING)
+import zlib
 
 import numpy as np
 
@@ -40,6 +43,60 @@ def nanmediandeviation(arr: np.ndarray, ranges = None) -> float:
         arr = np.float32(arr) # type: ignore
     return _nanmediandeviation(arr, ranges)
 
+class PrecisionCache:
+    """
+    Memoizes precisions extracted from data, for all `PrecisionAlg` instances.
+
+    Arrays are identified by their content: whichever the algorithm requesting
+    it, the precision of a bead at a given stage of the pipeline is computed
+    once. Fingerprinting an array is a few times cheaper than `nanhfsigma`.
+    """
+    maxsize = 4096
+
+    def __init__(self, maxsize: Optional[int] = None):
+        if maxsize is not None:
+            self.maxsize = maxsize
+        self._lock                = Lock()
+        self._items: OrderedDict  = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def clear(self):
+        "clears the memoized precisions"
+        with self._lock:
+            self._items.clear()
+
+    @staticmethod
+    def key(arr) -> Optional[Hashable]:
+        "returns the array's fingerprint or None if it has none"
+        if not isinstance(arr, np.ndarray) or arr.dtype.hasobject:
+            return None
+        buf = np.ascontiguousarray(arr).reshape(-1).view('u1')
+        return arr.dtype.str, arr.shape, zlib.adler32(buf), zlib.crc32(buf)
+
+    def hfsigma(self, arr) -> float:
+        "same as `nanhfsigma` but memoized"
+        key = self.key(arr)
+        if key is None:
+            return nanhfsigma(arr)
+
+        with self._lock:
+            out = self._items.get(key, None)
+            if out is not None:
+                self._items.move_to_end(key)
+                return out
+
+        out = nanhfsigma(arr)
+        with self._lock:
+            self._items[key] = out
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last = False)
+        return out
+
+PRECISIONS = PrecisionCache()
+
 DATATYPE  = Union[Sequence[Sequence[np.ndarray]],
                   Sequence[np.ndarray],
                   np.ndarray,
@@ -61,7 +118,9 @@ class PrecisionAlg(ARescaler):
                      beadid   :int       = None) -> float:
         """
         Returns the precision, possibly extracted from the data.  Raises
-        AttributeError if the precision was neither set nor could be extracted
+        AttributeError if the precision was neither set nor could be extracted.
+
+        Precisions extracted from the data are memoized in `PRECISIONS`.
         """
         if isinstance(precision, tuple):
             data, beadid = precision
@@ -91,13 +150,13 @@ class PrecisionAlg(ARescaler):
                 first = next((i for i in data if len(i)), None)
                 if first is not None:
                     if isinstance(first, (Sequence, np.ndarray)):
-                        ret = np.median(tuple(nanhfsigma(np.concatenate(list(i)))
+                        ret = np.median(tuple(PRECISIONS.hfsigma(np.concatenate(list(i)))
                                               for i in data if len(i)))
                     else:
-                        ret = np.median(tuple(nanhfsigma(i) for i in data if len(i)))
+                        ret = np.median(tuple(PRECISIONS.hfsigma(i) for i in data if len(i)))
                     return max(self.MINPRECISION, ret)*self.rawfactor
             else:
-                return max(self.MINPRECISION, nanhfsigma(data))*self.rawfactor
+                return max(self.MINPRECISION, PRECISIONS.hfsigma(data))*self.rawfactor
 
         raise AttributeError('Could not extract precision: no data or set value')
 
@@ -134,7 +193,9 @@ class CppPrecisionAlg(Rescaler):
                      beadid   :int       = None) -> float:
         """
         Returns the precision, possibly extracted from the data.  Raises
-        AttributeError if the precision was neither set nor could be extracted
+        AttributeError if the precision was neither set nor could be extracted.
+
+        Precisions extracted from the data are memoized in `PRECISIONS`.
         """
         if isinstance(precision, tuple):
             data, beadid = precision
@@ -165,13 +226,13 @@ class CppPrecisionAlg(Rescaler):
                 first = next((i for i in data if len(i)), None)
                 if first is not None:
                     if isinstance(first, (Sequence, np.ndarray)):
-                        ret = np.median(tuple(nanhfsigma(np.concatenate(list(i)))
+                        ret = np.median(tuple(PRECISIONS.hfsigma(np.concatenate(list(i)))
                                               for i in data if len(i)))
                     else:
-                        ret = np.median(tuple(nanhfsigma(i) for i in data if len(i)))
+                        ret = np.median(tuple(PRECISIONS.hfsigma(i) for i in data if len(i)))
                     return max(self.MINPRECISION, ret)*self.rawfactor
             else:
-                return max(self.MINPRECISION, nanhfsigma(data))*self.rawfactor
+                return max(self.MINPRECISION, PRECISIONS.hfsigma(data))*self.rawfactor
 
         raise AttributeError('Could not extract precision: no data or set value')
 
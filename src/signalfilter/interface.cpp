@@ -2,6 +2,7 @@
 #include "utils/pybind11.hpp"
 #include "signalfilter/signalfilter.h"
 #include "signalfilter/accumulators.hpp"
+#include "signalfilter/parallel.h"
 namespace
 {
     struct Check
@@ -117,6 +118,45 @@ namespace
         return inp;
     }
 
+    template<typename T>
+    pybind11::object _runmany(T const & self, pybind11::object data, int nthreads)
+    {
+        using farray_t = pybind11::array_t<float, pybind11::array::c_style
+                                                  | pybind11::array::forcecast>;
+        std::vector<std::pair<float *, size_t>> items;
+        std::vector<farray_t>                   rows;
+        farray_t                                block;
+        bool isblock = pybind11::isinstance<pybind11::array>(data)
+                    && data.cast<pybind11::array>().ndim() == 2;
+        if(isblock)
+        {
+            block = farray_t::ensure(data);
+            if(!block)
+                throw pybind11::error_already_set();
+
+            auto ncols = size_t(block.shape(1));
+            auto ptr   = block.mutable_data();
+            for(size_t i = 0, e = size_t(block.shape(0)); i < e; ++i)
+                items.emplace_back(ptr+i*ncols, ncols);
+        }
+        else
+        {
+            rows = data.cast<std::vector<farray_t>>();
+            for(auto & i: rows)
+                items.emplace_back(i.mutable_data(), size_t(i.size()));
+        }
+
+        {
+            pybind11::gil_scoped_release _;
+            signalfilter::parallelfor(
+                items.size(),
+                nthreads,
+                [&](size_t i) { run(self, items[i].second, items[i].first); }
+            );
+        }
+        return isblock ? pybind11::object(block) : pybind11::cast(rows);
+    }
+
     template <typename T, typename K>
     void    _apply(K & cls)
     {
@@ -126,6 +166,13 @@ namespace
            .def_property("precision",  _get_prec<T>, _set_prec<T>)
            .def_property("estimators", _get_est<T>,  _set_est<T>)
            .def("__call__",            &_run<T>)
+           .def("batch",               &_runmany<T>,
+                pybind11::arg("data"), pybind11::arg("nthreads") = 0,
+                R"_(Filters, in place if possible, either the rows of a 2-D array or each
+array in a list. Arrays are dispatched over *nthreads* threads with the GIL
+released. A non-positive *nthreads* means using all cores.
+
+Returns the filtered 2-D array or list of arrays.)_")
            ;
     }
 
@@ -294,6 +341,142 @@ distance to the median for each point.)_";
         }
     }
 
+    /* numpy-like percentile: linear interpolation between closest ranks */
+    template <typename T>
+    T _linearpercentile(std::vector<T> & vals, float val)
+    {
+        if(vals.size() == 0)
+            return std::numeric_limits<T>::quiet_NaN();
+
+        double pos  = (vals.size()-1)*(0.01*val);
+        size_t ind  = std::min(vals.size()-1, size_t(pos));
+        std::nth_element(vals.begin(), vals.begin()+ind, vals.end());
+        T      low  = vals[ind];
+        if(ind+1 >= vals.size() || pos <= ind)
+            return low;
+        T      high = *std::min_element(vals.begin()+ind+1, vals.end());
+        return T(low + (high-low)*(pos-ind));
+    }
+
+    template <typename T>
+    void _finite(std::vector<T> & vals, size_t sz, T const * data)
+    {
+        vals.clear();
+        for(auto e = data+sz; data != e; ++data)
+            if(std::isfinite(*data))
+                vals.push_back(*data);
+    }
+
+    /* For each bead, returns the median over all ranges of `fcn(range)`.
+     *
+     * Beads are dispatched over threads with the GIL released.
+     */
+    template <typename T, typename F>
+    pybind11::array_t<T> _batchranges(std::vector<pybind11::array_t<T>> & beads,
+                                      pybind11::array_t<int>             & starts,
+                                      pybind11::array_t<int>             & stops,
+                                      int                                  nthreads,
+                                      F                                    fcn)
+    {
+        std::vector<std::pair<T const *, int>> data;
+        for(auto & i: beads)
+            data.emplace_back(i.data(), int(i.size()));
+
+        pybind11::array_t<T> out(data.size());
+        auto   ptr   = out.mutable_data();
+        auto   i1    = starts.data();
+        auto   i2    = stops.data();
+        size_t nrngs = size_t(std::min(starts.size(), stops.size()));
+        {
+            pybind11::gil_scoped_release _;
+            parallelfor(
+                data.size(),
+                nthreads,
+                [&](size_t ibead)
+                {
+                    auto          bead = data[ibead].first;
+                    int           size = data[ibead].second;
+                    std::vector<T> meds, buffer;
+                    for(size_t k = 0; k < nrngs; ++k)
+                    {
+                        int j1 = std::max(0, i1[k]), j2 = std::min(size, i2[k]);
+                        if(j2 <= j1)
+                            continue;
+                        auto x = fcn(buffer, size_t(j2-j1), bead+j1);
+                        if(std::isfinite(x))
+                            meds.push_back(x);
+                    }
+                    ptr[ibead] = median(meds);
+                }
+            );
+        }
+        return out;
+    }
+
+    template <typename T>
+    void _defbatch(pybind11::module & mod)
+    {
+        using namespace pybind11::literals;
+        using beads_t = std::vector<pybind11::array_t<T>>;
+        using inds_t  = pybind11::array_t<int>;
+        mod.def(
+            "batchnanhfsigma",
+            [](beads_t beads, inds_t starts, inds_t stops, int sampl, int nthreads)
+            {
+                size_t sampling = sampl < 1 ? 1 : size_t(sampl);
+                return _batchranges(
+                    beads, starts, stops, nthreads,
+                    [sampling](std::vector<T> &, size_t sz, T const * dt)
+                    { return nanhfsigma(sz, dt, sampling); }
+                );
+            },
+            "data"_a, "starts"_a, "stops"_a, "sampling"_a = 1, "nthreads"_a = 0,
+            R"_(For each bead, return the median over all ranges [starts, stops) of
+the hfsigma. Beads are dispatched over *nthreads* threads with the GIL released.
+A non-positive *nthreads* means using all cores.)_"
+        );
+
+        mod.def(
+            "batchnanextent",
+            [](beads_t beads, inds_t starts, inds_t stops, float low, float high, int nthreads)
+            {
+                return _batchranges(
+                    beads, starts, stops, nthreads,
+                    [low, high](std::vector<T> & buffer, size_t sz, T const * dt)
+                    {
+                        _finite(buffer, sz, dt);
+                        auto x1 = _linearpercentile(buffer, low);
+                        return _linearpercentile(buffer, high) - x1;
+                    }
+                );
+            },
+            "data"_a, "starts"_a, "stops"_a, "low"_a = 5.f, "high"_a = 95.f,
+            "nthreads"_a = 0,
+            R"_(For each bead, return the median over all ranges [starts, stops) of
+the difference between the *high* and *low* nan-percentiles. Beads are
+dispatched over *nthreads* threads with the GIL released.)_"
+        );
+
+        mod.def(
+            "batchnanmedian",
+            [](beads_t beads, inds_t starts, inds_t stops, int nthreads)
+            {
+                return _batchranges(
+                    beads, starts, stops, nthreads,
+                    [](std::vector<T> & buffer, size_t sz, T const * dt)
+                    {
+                        _finite(buffer, sz, dt);
+                        return _linearpercentile(buffer, 50.f);
+                    }
+                );
+            },
+            "data"_a, "starts"_a, "stops"_a, "nthreads"_a = 0,
+            R"_(For each bead, return the median over all ranges [starts, stops) of
+the nan-median. Beads are dispatched over *nthreads* threads with the GIL
+released.)_"
+        );
+    }
+
     void pymodule(pybind11::module & mod)
     {
         auto smod       = mod.def_submodule("stats");
@@ -303,6 +486,8 @@ distance to the median for each point.)_";
 #       endif
         _defhfsigma<float>(smod);
         _defhfsigma<double>(smod);
+        _defbatch<float>(smod);
+        _defbatch<double>(smod);
 #       ifdef _MSC_VER
 #           pragma warning ( pop )
 #       endif
@@ -0,0 +1,68 @@
+#pragma once
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <mutex>
+#include <thread>
+#include <vector>
+namespace signalfilter
+{
+    /* Returns the number of threads to use for *size* tasks
+     *
+     * A non-positive *nthreads* means using all available cores.
+     */
+    inline size_t nthreads(int nthreads, size_t size)
+    {
+        size_t nth = nthreads > 0 ? size_t(nthreads) : size_t(std::thread::hardware_concurrency());
+        return std::max(size_t(1), std::min(nth, size));
+    }
+
+    /* Calls `fcn(i)` for every i in [0, size) using *nthreads* threads.
+     *
+     * Tasks are handed to threads one at a time such that a few expensive
+     * tasks do not stall all others. The calling thread participates in the
+     * work. The GIL must have been released by the caller if needed.
+     *
+     * Should a task throw, no new task is started and the first exception is
+     * rethrown on the calling thread once all threads are done.
+     */
+    template <typename F>
+    void parallelfor(size_t size, int nthreads, F && fcn)
+    {
+        size_t nth = signalfilter::nthreads(nthreads, size);
+        if(nth <= 1)
+        {
+            for(size_t i = 0; i < size; ++i)
+                fcn(i);
+            return;
+        }
+
+        std::atomic<size_t> next(0);
+        std::exception_ptr  error;
+        std::mutex          lock;
+        auto worker = [&]()
+        {
+            try
+            {
+                for(size_t i = next++; i < size; i = next++)
+                    fcn(i);
+            }
+            catch(...)
+            {
+                std::lock_guard<std::mutex> _(lock);
+                if(!error)
+                    error = std::current_exception();
+                next = size;
+            }
+        };
+
+        std::vector<std::thread> threads;
+        for(size_t i = 1; i < nth; ++i)
+            threads.emplace_back(worker);
+        worker();
+        for(auto & thr: threads)
+            thr.join();
+        if(error)
+            std::rethrow_exception(error);
+    }
+}
@@ -1,24 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"Counts binding events found vs created"
+"""
+Counts binding events found vs created and measures the cost of processing
+large tracks
+"""
 from concurrent.futures         import ProcessPoolExecutor
 from copy                       import copy
-from typing                     import Dict, List, Tuple
-from time                       import process_time as clock
+from resource                   import getrusage, RUSAGE_SELF
+from typing                     import Any, Dict, List, Tuple, Type
+from time                       import process_time as clock, perf_counter
 
 import numpy  as np
 import pandas as pd
 
 from data                       import Track
-from cleaning.processor         import DataCleaningException
+from cleaning.processor         import DataCleaningException, DataCleaningTask
+from data.views                 import TrackView
+from eventdetection.processor   import ExtremumAlignmentTask, EventDetectionTask
+from peakfinding.groupby        import ByGaussianMix
 from peakfinding.probabilities  import Probability
-from peakfinding.processor      import PeakProbabilityProcessor
-from peakcalling.tohairpin      import matchpeaks
+from peakfinding.processor      import PeakProbabilityProcessor, PeakSelectorTask
+from peakcalling.tohairpin      import (matchpeaks, HairpinFitter, GaussianProductFit,
+                                        PeakGridFit)
 from taskcontrol.taskcontrol    import create as _create
 from taskmodel                  import Task, PHASE
 from taskmodel.track            import InMemoryTrackTask
 from utils                      import initdefaults
 from .bindings                  import ExperimentCreator
+from .track                     import TrackSimulator
 
 class PeakBenchmarkJob:
     "benchmark peaks"
@@ -175,3 +184,159 @@ class PeakBenchmarkJob:
             pks,
             [prob(i, ends) for i in cur['events']]
         )
+
+class GaussianMixBenchmark:
+    """
+    Compares `ByGaussianMix` growing its mixtures incrementally to fitting
+    every number of components from scratch, on simulated beads.
+    """
+    job: PeakBenchmarkJob = PeakBenchmarkJob(nbeads = 10)
+    @initdefaults(frozenset(locals()))
+    def __init__(self, **_):
+        pass
+
+    @staticmethod
+    def configurations() -> Dict[str, List[Task]]:
+        "the tasks for either search"
+        tasks = [DataCleaningTask(), ExtremumAlignmentTask(), EventDetectionTask()]
+        return {
+            'grown':      tasks+[PeakSelectorTask(finder = ByGaussianMix())],
+            'exhaustive': tasks+[PeakSelectorTask(finder = ByGaussianMix(grow         = False,
+                                                                         critpatience = None))]
+        }
+
+    def run(self, counts: int, nthreads = None) -> pd.DataFrame:
+        """
+        returns, per search, the mean time per bead and the ratio of peaks
+        found (*bind*), spurious (*FP*) or missed (*FN*)
+        """
+        job                = copy(self.job)
+        job.configurations = self.configurations()
+        data               = job.run(counts, nthreads = nthreads)
+        data               = data[data.peaktype != 'base']
+        clock              = (
+            data.groupby(['run', 'track', 'bead', 'config']).clock.first()
+            .groupby('config').mean()
+        )
+        return pd.crosstab(data.config, data.peaktype, normalize = 'index').assign(clock = clock)
+
+class HairpinScreeningBenchmark:
+    """
+    Measures how often hairpin fits with seed screening identify the same
+    hairpin as the exhaustive grid, and the time either takes, on simulated
+    beads. Each bead is created from one of `nhairpins` random hairpins, with
+    some peaks missing.
+    """
+    nhairpins: int                 = 5
+    nbindings: Tuple[int, int]     = (5, 15)
+    size:      int                 = 1500
+    stretch:   Tuple[float, float] = (.95, 1.05)
+    bias:      Tuple[float, float] = (-.01, .01)
+    sigma:     float               = 2e-3
+    missing:   float               = .1
+    fitters:   Dict[str, Tuple[Type[HairpinFitter], Dict[str, Any]]] = {
+        'GaussianProductFit': (GaussianProductFit, {'basins': 3}),
+        'PeakGridFit':        (PeakGridFit,        {'screen': True})
+    }
+    @initdefaults(frozenset(locals()))
+    def __init__(self, **_):
+        pass
+
+    def hairpins(self, rnd: np.random.RandomState) -> List[np.ndarray]:
+        "creates random hairpins, in bases"
+        return [
+            np.sort(np.concatenate([
+                [0, self.size], rnd.randint(1, self.size, rnd.randint(*self.nbindings))
+            ])).astype('f4')
+            for _ in range(self.nhairpins)
+        ]
+
+    def bead(self, rnd: np.random.RandomState, hpin: np.ndarray) -> np.ndarray:
+        "creates a bead's peaks, in µm, from a hairpin"
+        keep    = rnd.uniform(0., 1., len(hpin)) >= self.missing
+        keep[0] = True
+        peaks   = hpin[keep]*rnd.uniform(*self.stretch)*8.8e-4+rnd.uniform(*self.bias)
+        return np.sort(peaks+rnd.normal(0., self.sigma, len(peaks))).astype('f4')
+
+    def __call__(self, seed: int) -> pd.DataFrame:
+        rnd   = np.random.RandomState(seed)
+        hpins = self.hairpins(rnd)
+        truth = rnd.randint(len(hpins))
+        bead  = self.bead(rnd, hpins[truth])
+        data: Dict[str, List] = {i: [] for i in ('fitter', 'screened', 'hairpin', 'clock')}
+        for name, (cls, kwa) in self.fitters.items():
+            for screened in (False, True):
+                fits = [cls(peaks = i, strandsize = self.size, **(kwa if screened else {}))
+                        for i in hpins]
+                dur  = perf_counter()
+                best = int(np.argmin([i.optimize(bead)[0] for i in fits]))
+                data['clock'].append(perf_counter()-dur)
+                data['fitter'].append(name)
+                data['screened'].append(screened)
+                data['hairpin'].append(best)
+        out = pd.DataFrame(data)
+        out['seed']  = seed
+        out['truth'] = truth
+        return out
+
+    def run(self, counts: int) -> pd.DataFrame:
+        """
+        returns, per fitter, the ratio of beads for which screened and
+        exhaustive fits identify the same hairpin, the ratio of correct
+        identifications and the mean time per bead, with and without screening
+        """
+        data  = pd.concat([self(i) for i in range(counts)])
+        piv   = data.pivot_table(index   = ['fitter', 'seed'],
+                                 columns = 'screened',
+                                 values  = ['hairpin', 'truth', 'clock'])
+        return pd.DataFrame({
+            'agreement':       piv['hairpin', True] == piv['hairpin', False],
+            'exhaustive':      piv['hairpin', False] == piv['truth', False],
+            'screened':        piv['hairpin', True] == piv['truth', True],
+            'exhaustiveclock': piv['clock', False],
+            'screenedclock':   piv['clock', True]
+        }).groupby(level = 0).mean()
+
+class ActionChainBenchmark:
+    """
+    Measures the throughput and the peak memory usage of a list of tasks
+    applied to a large simulated track, with or without copy elision in the
+    views.
+    """
+    simulator: TrackSimulator = TrackSimulator(ncycles = 200)
+    nbeads:    int            = 200
+    tasks:     List[Task]     = [DataCleaningTask(), ExtremumAlignmentTask()]
+    @initdefaults(frozenset(locals()))
+    def __init__(self, **_):
+        pass
+
+    def __call__(self, elide: bool = True) -> Dict[str, float]:
+        "runs the tasks once and returns the measures"
+        TrackView.elidecopies = elide
+        track   = self.simulator.track(self.nbeads, seed = 0)
+        dur     = perf_counter()
+        frame   = next(_create(InMemoryTrackTask(track = track), *self.tasks).run(copy = True))
+        nframes = 0
+        for key in frame.keys():
+            try:
+                nframes += len(frame[key])
+            except DataCleaningException:
+                pass
+        dur     = perf_counter()-dur
+        return {
+            'elide':           elide,
+            'time':            dur,
+            'framespersecond': nframes/dur,
+            'maxrss':          getrusage(RUSAGE_SELF).ru_maxrss
+        }
+
+    def run(self) -> pd.DataFrame:
+        """
+        runs the tasks with and without copy elision, each in its own process
+        such that peak memory usages can be compared
+        """
+        out = []
+        for elide in (False, True):
+            with ProcessPoolExecutor(1) as pool:
+                out.append(pool.submit(self, elide).result())
+        return pd.DataFrame(out)
@@ -4,7 +4,8 @@
 from    typing          import (Sequence, Union, Optional, List,
                                 Callable, Iterator, Any, Tuple, Dict)
 import  random
-from    itertools       import chain
+from    concurrent.futures  import ProcessPoolExecutor
+from    itertools       import chain, repeat
 from    collections     import OrderedDict
 
 import  numpy as np
@@ -46,18 +47,23 @@ class LadderEvents:
     def __init__(self, **_):
         pass
 
-    def randz(self, pos):
+    @staticmethod
+    def _randint(rng, first, last):
+        "random integer in [first, last]"
+        return random.randint(first, last) if rng is None else rng.randint(first, last+1)
+
+    def randz(self, pos, rng = None):
         "Random z value for an event."
         floor, scale, maxz = self.randzargs
         if pos is None:
             pos = maxz
-        return random.randint(int(floor/scale), int(pos/scale))*scale
+        return self._randint(rng, int(floor/scale), int(pos/scale))*scale
 
-    def randt(self, _):
+    def randt(self, _, rng = None):
         "random event duration"
-        return random.randint(*self.randtargs)
+        return self._randint(rng, *self.randtargs)
 
-    def __call__(self, cycles: np.ndarray) -> np.ndarray:
+    def __call__(self, cycles: np.ndarray, rng = None) -> np.ndarray:
         "add events to the cycles"
         if None in (self.randtargs, self.randzargs):
             return
@@ -65,8 +71,8 @@ class LadderEvents:
         for cyc in cycles:
             pos = None
             while len(cyc):
-                pos        = self.randz(pos)
-                ind        = self.randt(pos)
+                pos        = self.randz(pos, rng)
+                ind        = self.randt(pos, rng)
                 cyc[:ind] += pos
                 cyc        = cyc[len(cyc[:ind]):]
 
@@ -97,7 +103,7 @@ class PoissonEvents:
     def __init__(self, **_):
         self.__store: Dict[str,np.ndarray] = {}
 
-    def __rates(self, sorts, cycsize):
+    def __rates(self, sorts, cycsize, rng):
         if self.rates is None:
             rates = 1.
         elif np.isscalar(self.rates):
@@ -106,7 +112,7 @@ class PoissonEvents:
             assert len(sorts) == len(self.rates)
             rates = np.asarray(self.rates, dtype = 'f4')[sorts]
 
-        rands = np.random.rand(cycsize, len(sorts)) < rates  # type: ignore
+        rands = rng.rand(cycsize, len(sorts)) < rates  # type: ignore
         asort = np.argsort(sorts)
         if 'rates' in self.store:
             self.__store['rates'] = rands[:,asort]
@@ -114,15 +120,15 @@ class PoissonEvents:
             self.__store['ratestats'] = np.sum(rands, axis = 0)[asort]
         return rands
 
-    def __sizes(self, sorts, occ, cycsize):
+    def __sizes(self, sorts, occ, cycsize, rng):
         if not self.sizes:
             dur = np.repeat(cycsize//(np.sum(occ, 1)+1), len(self.peaks))
             dur = dur.reshape(occ.shape)
         elif isinstance(self.sizes, (float, int)):
-            dur = np.random.poisson(self.sizes, occ.shape)
+            dur = rng.poisson(self.sizes, occ.shape)
         else:
             values = np.asarray(self.sizes)[sorts]
-            dur    = np.random.poisson(values, occ.shape)
+            dur    = rng.poisson(values, occ.shape)
 
         dur[~occ] = 0
         asort     = np.argsort(sorts)
@@ -139,19 +145,36 @@ class PoissonEvents:
 
     stored = property(lambda self: self.__store)
 
-    def __call__(self, cycles: np.ndarray) -> np.ndarray:
-        "add events to the cycles"
+    def __call__(self, cycles: np.ndarray, rng = None) -> np.ndarray:
+        """
+        add events to the cycles
+
+        Random values are drawn from *rng*, a `np.random.RandomState`, or from
+        the global generator if None.
+        """
+        if rng is None:
+            rng = np.random
         sorts = np.argsort(np.asarray(self.peaks, dtype = 'f4'))[::-1]
 
         peaks = np.asarray(self.peaks, dtype = 'f4')[sorts]
-        occs  = self.__rates(sorts,       cycles.shape[0])
-        durs  = self.__sizes(sorts, occs, cycles.shape[1])
+        occs  = self.__rates(sorts,       cycles.shape[0], rng)
+        durs  = self.__sizes(sorts, occs, cycles.shape[1], rng)
         inds  = 1+np.apply_along_axis(np.searchsorted, 1, durs, cycles.shape[1])
 
-        for ind, cyc, dur, occ in zip(inds, cycles, durs, occs):
-            occ = occ[:ind]
-            for rng, peak in zip(np.split(cyc, dur[:ind][occ]), peaks[:ind][occ]):
-                rng[:] = peak
+        # A cycle is split at the end of each occurring event: the i-th stretch
+        # is set to the i-th occurring peak and the last stretch is left as is.
+        # Frames are assigned to stretches for all cycles at once.
+        sel   = occs & (np.arange(len(peaks))[None,:] < inds[:,None])
+        ends  = np.where(sel, durs, np.iinfo(durs.dtype).max)
+        frame = np.arange(cycles.shape[1])
+        ind   = (ends[:,None,:] <= frame[None,:,None]).sum(2)
+
+        rows, cols = np.nonzero(sel)
+        table      = np.zeros((len(cycles), len(peaks)+1), dtype = 'f4')
+        table[rows, np.cumsum(sel, 1)[rows, cols]-1] = peaks[cols]
+
+        good         = ind < sel.sum(1)[:,None]
+        cycles[good] = np.take_along_axis(table, ind, 1)[good]
 
 class TrackSimulator:
     "Simulates bead data over a number of cycles"
@@ -177,7 +200,7 @@ class TrackSimulator:
         self.seed(seed)
         return self.__apply(np.ravel)
 
-    def baseline(self, ncycles):
+    def baseline(self, ncycles, rng = None):
         "The shape of the baseline"
         size = sum(self.durations)
         if self.baselineargs is None:
@@ -185,12 +208,14 @@ class TrackSimulator:
 
         amp, scale, alg = self.baselineargs
         if alg == 'rand':
-            base = np.repeat(np.random.rand(ncycles)*amp, size)
+            if rng is None:
+                rng = np.random
+            base = np.repeat(rng.rand(ncycles)*amp, size)
             base = base.reshape((ncycles, size))
             if scale is not None:
                 ends = np.cumsum(self.durations)
                 for i in range(len(self.durations)-1):
-                    for arr, val in zip(base, np.random.rand(ncycles)*amp*scale):
+                    for arr, val in zip(base, rng.rand(ncycles)*amp*scale):
                         arr[ends[i]:ends[i+1]] += val
             return base
 
@@ -239,23 +264,80 @@ class TrackSimulator:
             random.seed(seed)
 
     @kwargsdefaults(__KEYS)
-    def track(self, nbeads = 1, seed = None):
-        "creates a simulated track"
-        self.seed(seed)
+    def track(self, nbeads = 1, seed = None, nprocs: Optional[int] = None):
+        """
+        creates a simulated track
+
+        If *nprocs* is provided, beads are simulated in batches, each bead with
+        its own random generator seeded by *seed* and the bead index. The track
+        then only depends on *seed*, whatever the number of processes used.
+        Otherwise, beads are simulated one after the other using the global
+        random generators.
+        """
+        if nprocs is not None:
+            if seed is None:
+                seed = np.random.randint(np.iinfo('i4').max)
+            chunks = np.array_split(np.arange(nbeads), max(1, min(nprocs, nbeads)))
+            if len(chunks) > 1:
+                with ProcessPoolExecutor(len(chunks)) as pool:
+                    res = list(pool.map(self.batch, repeat(seed), chunks))
+            else:
+                res = [self.batch(seed, i) for i in chunks]
+        else:
+            self.seed(seed)
+            res = [({}, {})]
+            for i in range(nbeads):
+                res[0][0][i] = self()
+                if len(getattr(self.events, 'stored', tuple())):
+                    res[0][1][i] = dict(self.events.stored)
+
         track = Track(data      = {},
                       phases    = self.phases,
                       framerate = self.framerate,
                       key       = 'tracksimulator')
         setattr(track,"_lazyfy_",False)
-        sim   = {}
-        for i in range(nbeads):
-            track.data[i] = self()
-            if len(getattr(self.events, 'stored', tuple())):
-                sim[i] = dict(self.events.stored)
+        sim: Dict[int, dict] = {}
+        for data, stored in res:
+            track.data.update(data)
+            sim.update(stored)
         if len(sim):
             setattr(track, 'simulator', sim)
         return track
 
+    def batch(
+            self, seed: int, beads: Sequence[int]
+    ) -> Tuple[Dict[int, np.ndarray], Dict[int, dict]]:
+        """
+        Simulates the provided beads, returning their data and the stored
+        event statistics. Cycles for all beads are computed as a single array.
+        Bead *i* draws its random values from `np.random.RandomState([seed, i])`.
+        """
+        beads  = [int(i) for i in beads]
+        tmpl   = np.zeros((1, sum(self.durations)), dtype = 'f4')
+        self.__addtemplate(tmpl)
+
+        cycles = np.empty((len(beads), self.ncycles, tmpl.shape[1]), dtype = 'f4')
+        cycles[:] = tmpl
+        flat   = cycles.reshape((-1, tmpl.shape[1]))
+        rngs   = [np.random.RandomState([seed, i]) for i in beads]
+        stored = {}
+        if self.events is not None:
+            for ibead, rng, cyc in zip(beads, rngs, cycles):
+                self.events(self.__cyclephase(cyc, PHASE.measure), rng = rng)
+                if len(getattr(self.events, 'stored', tuple())):
+                    stored[ibead] = dict(self.events.stored)
+
+        if self.closing is not None:
+            self.closing(self.durations, flat)
+
+        if self.baselineargs is not None:
+            cycles += np.array([self.baseline(self.ncycles, rng) for rng in rngs])
+
+        self.drift(flat)
+        for rng, cyc in zip(rngs, cycles):
+            self.__addbrownian(cyc, rng = rng)
+        return {i: j.ravel() for i, j in zip(beads, cycles)}, stored
+
     @kwargsdefaults(__KEYS)
     def beads(self, nbeads = 1, seed = None):
         "creates a simulated track"
@@ -293,16 +375,18 @@ class TrackSimulator:
                       key    = 'bypeakevents')
         def _create(cycles):
             events = tuple(self.__events(cycles))
-            labels = [np.array([i[0] for i in evt['data']]) for evt in events]
+            allevt = np.concatenate(events)
+            labels = np.array([i[0] for i in allevt['data']])
+            cycids = np.repeat(np.arange(len(events)), [len(i) for i in events])
             curs   = []
-            for lab in np.unique(np.concatenate(labels)):
+            for lab in np.unique(labels):
+                # the first event with that label in each cycle
+                inds         = np.nonzero(labels == lab)[0]
+                cids, first  = np.unique(cycids[inds], return_index = True)
                 cur          = np.empty((len(events),), dtype = EVENTS_DTYPE)
                 cur['start'] = 0
                 cur['data']  = None
-                for i, (cevt, clab) in enumerate(zip(events, labels)):
-                    val = cevt[clab == lab]
-                    if len(val):
-                        cur[i] = (val[0]['start'], val[0]['data'])
+                cur[cids]    = allevt[inds[first]]
                 curs.append(cur)
 
             return cycles.ravel(), curs
@@ -359,7 +443,7 @@ class TrackSimulator:
             dat[:] = rho * np.arange(ends[i+1]-ends[i])+rng[i]
 
     _NONE = type('__none__', tuple(), {})
-    def __addbrownian(self, cycles, brownian = _NONE):
+    def __addbrownian(self, cycles, brownian = _NONE, rng = None):
         "add brownian noise to the cycles"
         if brownian is self._NONE:
             brownian = self.brownian
@@ -367,17 +451,20 @@ class TrackSimulator:
         if brownian is None:
             return
 
+        if rng is None:
+            rng = np.random
+
         if isinstance(brownian, (float, int)):
             if brownian > 0.:
-                cycles[:] += np.random.normal(0., brownian, cycles.shape)
+                cycles[:] += rng.normal(0., brownian, cycles.shape)
 
         elif isinstance(brownian, (tuple, list)):
             ends = np.insert(np.cumsum(self.durations), 0, 0)
             for i in range(len(self.durations)):
-                self.__addbrownian(cycles[:,ends[i]:ends[i+1]], brownian[i])
+                self.__addbrownian(cycles[:,ends[i]:ends[i+1]], brownian[i], rng)
 
         elif callable(brownian):
-            cycles[:] += np.random.normal(0., brownian(cycles), cycles.shape)
+            cycles[:] += rng.normal(0., brownian(cycles), cycles.shape)
 
     def __set(self, attr, val):
         if isinstance(val, dict):
@@ -164,6 +164,8 @@ actually requested.
     >>>         args.apply(_generator)
 """
 from .base      import Processor, ProcessorException, processors
+from .budget    import BUDGET, BoundedCache, cacheusage
 from .cache     import Cache
+from .profiling import PROFILER, Profiler
 from .runner    import Runner, run
 from .track     import TrackReaderProcessor, CycleCreatorProcessor, DataSelectionProcessor
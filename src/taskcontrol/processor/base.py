@@ -9,6 +9,7 @@ from    typing          import (TYPE_CHECKING, TypeVar, Generic, Tuple, Callable
 
 import  taskmodel       as     _tasks
 from    taskmodel       import Level
+from    .budget         import BoundedCache
 
 if TYPE_CHECKING:
     from .runner    import Runner # pylint: disable=unused-import
@@ -107,6 +108,14 @@ class Processor(Generic[TaskType]):
         "returns whether this is pooled"
         return False
 
+    def cachecost(self) -> float:
+        "the relative cost of recomputing a cached item: cheaper items are evicted first"
+        return 10. if self.isslow() else 1.
+
+    def boundedcache(self) -> BoundedCache:
+        "returns an empty cache which counts against the global memory budget"
+        return BoundedCache(name = type(self).__name__, cost = self.cachecost())
+
     def config(self) -> dict:
         "Returns a copy of a task's dict"
         return self.task.config()
@@ -145,14 +154,16 @@ class Processor(Generic[TaskType]):
         return item
 
     @classmethod
-    def _setup_cache(cls, cache, action, frame):
+    def _setup_cache(cls, cache, action, frame, name = '', cost = 1.):
         if action is not None:
             frame.withaction(action)
         act = frame.getaction()
         if act is None:
             raise IndexError("Nothing to cache! Set an action prior to mixin")
 
-        dico = cache.setdefault(frame.parents, dict())
+        dico = cache.get(frame.parents, None)
+        if dico is None:
+            cache[frame.parents] = dico = BoundedCache(name = name, cost = cost)
         frame.withaction(partial(cls._get_cached, dico, act), clear = True)
         return frame
 
@@ -176,7 +187,8 @@ class Processor(Generic[TaskType]):
         def _run(self: 'Processor', args:'Runner'):
             cache  = args.data.setcachedefault(self, dict())
             # pylint: disable=protected-access
-            args.apply(partial(self._setup_cache, cache, fcn(self, args)))
+            args.apply(partial(self._setup_cache, cache, fcn(self, args),
+                               name = type(self).__name__, cost = self.cachecost()))
         return _run
 
     @staticmethod
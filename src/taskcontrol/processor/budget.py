@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory budget shared by processor caches.
+
+Processors store their per-bead results in `BoundedCache` instances. All of
+these report the size of their entries to a single `CacheBudget`. Once the
+latter is exceeded, entries are evicted whatever the processor or track they
+belong to.
+
+Eviction follows the GreedyDual policy: an entry's priority is the budget's
+clock at the time of its last access plus the entry's cost. The entry with the
+lowest priority is evicted first and the clock is moved up to its priority.
+With equal costs, this is a least-recently-used policy. Entries with a lower
+cost are evicted earlier.
+"""
+from   itertools    import count
+from   threading    import RLock
+from   typing       import (Dict, Hashable, List, NamedTuple, Optional, Tuple,
+                            Any)
+from   weakref      import WeakValueDictionary, finalize
+import heapq
+import sys
+
+import numpy        as     np
+
+_MAXDEPTH = 8
+def nbytes(item: Any, depth: int = 0) -> int:
+    "estimates the memory used by an item"
+    if isinstance(item, BoundedCache):
+        return item.nbytes
+
+    if isinstance(item, np.ndarray):
+        size = item.nbytes
+        if item.dtype.hasobject and depth < _MAXDEPTH:
+            for name in (item.dtype.names or (None,)):
+                arr = item if name is None else item[name]
+                if arr.dtype == np.dtype('O'):
+                    size += sum(nbytes(i, depth+1) for i in arr.ravel())
+        return size
+
+    size = sys.getsizeof(item)
+    if depth >= _MAXDEPTH:
+        return size
+
+    if hasattr(item, 'memory_usage'):  # pandas objects
+        return int(np.sum(item.memory_usage(deep = True)))
+    if isinstance(item, dict):
+        return size + sum(nbytes(i, depth+1) + nbytes(j, depth+1) for i, j in item.items())
+    if isinstance(item, (list, tuple, set, frozenset)):
+        return size + sum(nbytes(i, depth+1) for i in item)
+    if hasattr(item, '__dict__'):
+        return size + nbytes(vars(item), depth+1)
+    return size
+
+class CacheUsage(NamedTuple):
+    "memory used by caches with a given name"
+    name:    str
+    caches:  int
+    entries: int
+    nbytes:  int
+
+class CacheBudget:
+    """
+    Global memory budget for all `BoundedCache` instances.
+
+    Attributes:
+
+    * `maxbytes`: the budget in bytes. None means no limit.
+    """
+    maxbytes: Optional[int] = 2**31
+    def __init__(self, maxbytes: Optional[int] = None):
+        if maxbytes is not None:
+            self.maxbytes = maxbytes
+        self._lock                                        = RLock()
+        self._clock                                       = 0.
+        self._count                                       = count()
+        self._heap:   List[Tuple[float, int, int, Hashable]] = []  # priority, id, cache, key
+        self._caches: WeakValueDictionary                 = WeakValueDictionary()
+        self._totals: Dict[int, List[int]]                = {}
+        self._nitems                                      = 0
+        self.nbytes                                       = 0
+
+    def register(self, cache: 'BoundedCache') -> int:
+        "registers a cache and returns its id"
+        uid = next(self._count)
+        with self._lock:
+            self._caches[uid] = cache
+            self._totals[uid] = [0, 0]
+        finalize(cache, self._release, uid)
+        return uid
+
+    def add(self, cache: 'BoundedCache', key: Hashable, size: int):
+        "counts a new entry and evicts others if the budget is exceeded"
+        with self._lock:
+            self.__remove(cache, key)
+            prio                = self._clock + cache.cost
+            cache.entries[key]  = (size, prio, self.__push(prio, cache.uid, key))
+            total               = self._totals[cache.uid]
+            total[0]           += size
+            total[1]           += 1
+            self._nitems       += 1
+            self.nbytes        += size
+            self.evict()
+
+    def touch(self, cache: 'BoundedCache', key: Hashable):
+        "marks an entry as recently used"
+        with self._lock:
+            info = cache.entries.get(key, None)
+            if info is not None:
+                prio               = self._clock + cache.cost
+                cache.entries[key] = (info[0], prio, self.__push(prio, cache.uid, key))
+
+    def remove(self, cache: 'BoundedCache', key: Hashable):
+        "stops counting an entry"
+        with self._lock:
+            self.__remove(cache, key)
+
+    def evict(self, maxbytes: Optional[int] = None):
+        "evicts entries until the memory used is below *maxbytes* or the budget"
+        if maxbytes is None:
+            maxbytes = self.maxbytes
+        if maxbytes is None:
+            return
+
+        with self._lock:
+            while self.nbytes > maxbytes and self._heap:
+                prio, seq, uid, key = heapq.heappop(self._heap)
+                cache               = self._caches.get(uid, None)
+                info                = None if cache is None else cache.entries.get(key, None)
+                if info is None or info[2] != seq:
+                    continue  # outdated
+
+                self._clock = prio
+                self.__remove(cache, key)
+                dict.pop(cache, key, None)
+
+    def usage(self) -> List[CacheUsage]:
+        "returns the memory used per cache name, the largest first"
+        with self._lock:
+            caches = list(self._caches.items())
+            totals = {i: tuple(j) for i, j in self._totals.items()}
+
+        out: Dict[str, List[int]] = {}
+        for uid, cache in caches:
+            total   = totals.get(uid, (0, 0))
+            cur     = out.setdefault(cache.name, [0, 0, 0])
+            cur[0] += 1
+            cur[1] += total[1]
+            cur[2] += total[0]
+        return sorted((CacheUsage(i, *j) for i, j in out.items()), key = lambda i: -i.nbytes)
+
+    def __push(self, prio: float, uid: int, key: Hashable) -> int:
+        seq = next(self._count)
+        heapq.heappush(self._heap, (prio, seq, uid, key))
+        if len(self._heap) > 2*self._nitems+64:
+            # too many outdated items: rebuild the heap
+            self._heap = [
+                (info[1], info[2], cuid, ckey)
+                for cuid, cache in self._caches.items()
+                for ckey, info in cache.entries.items()
+            ]
+            self._heap.append((prio, seq, uid, key))
+            heapq.heapify(self._heap)
+        return seq
+
+    def __remove(self, cache: 'BoundedCache', key: Hashable):
+        info = cache.entries.pop(key, None)
+        if info is not None:
+            total         = self._totals[cache.uid]
+            total[0]     -= info[0]
+            total[1]     -= 1
+            self._nitems -= 1
+            self.nbytes  -= info[0]
+
+    def _release(self, uid: int):
+        with self._lock:
+            total         = self._totals.pop(uid, (0, 0))
+            self.nbytes  -= total[0]
+            self._nitems -= total[1]
+
+BUDGET = CacheBudget()
+
+class BoundedCache(dict):
+    """
+    A dictionary whose entries count against the global `CacheBudget`.
+
+    Entries may disappear at any time: users must recompute a missing entry.
+    Results which cannot be recomputed, such as messages accumulated over
+    beads, should be stored in a plain `dict` instead.
+
+    Attributes:
+
+    * `name`: the name under which the memory usage is reported.
+    * `cost`: the relative cost of recomputing an entry. Cheaper entries are
+    evicted first.
+    """
+    def __init__(self, items = (), name: str = '', cost: float = 1., budget: CacheBudget = None):
+        super().__init__()
+        self.name                                   = name
+        self.cost                                   = cost
+        self.budget                                 = BUDGET if budget is None else budget
+        self.entries: Dict[Hashable, Tuple[int, float, int]] = {}
+        self.uid                                    = self.budget.register(self)
+        self.update(items)
+
+    def __reduce__(self):
+        return type(self), (dict(self), self.name, self.cost)
+
+    @property
+    def nbytes(self) -> int:
+        "the memory used by the entries"
+        return sum(i[0] for i in list(self.entries.values()))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.budget.add(self, key, nbytes(value))
+
+    def __getitem__(self, key):
+        out = super().__getitem__(key)
+        self.budget.touch(self, key)
+        return out
+
+    def get(self, key, default = None):
+        "same as `dict.get` but marks the entry as recently used"
+        if key in self:
+            self.budget.touch(self, key)
+        return super().get(key, default)
+
+    def setdefault(self, key, default = None):
+        "same as `dict.setdefault` but counting the new entry"
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwa):  # pylint: disable=arguments-differ
+        "same as `dict.update` but counting the new entries"
+        for key, value in dict(*args, **kwa).items():
+            self[key] = value
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.budget.remove(self, key)
+
+    def pop(self, key, *args):  # pylint: disable=arguments-differ
+        "same as `dict.pop` but stops counting the entry"
+        self.budget.remove(self, key)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        "same as `dict.popitem` but stops counting the entry"
+        key, value = super().popitem()
+        self.budget.remove(self, key)
+        return key, value
+
+    def clear(self):
+        "same as `dict.clear` but stops counting the entries"
+        for key in list(self.entries):
+            self.budget.remove(self, key)
+        super().clear()
+
+def cacheusage() -> List[CacheUsage]:
+    "returns the memory used by processor caches, per name, the largest first"
+    return BUDGET.usage()
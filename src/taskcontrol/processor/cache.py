@@ -2,10 +2,11 @@
 # -*- coding: utf-8 -*-
 "List of processes and cache"
 from functools  import partial
-from typing     import Union, Iterable, List, Tuple, Any, Iterator, Type, cast
-from taskmodel  import Task
+from typing     import Union, Iterable, List, Tuple, Any, Iterator, Type, Optional, cast
+from taskmodel  import Task, Level
 from utils      import isfunction
 from .base      import Processor, register
+from .budget    import nbytes
 
 def _version():
     i = 0
@@ -15,7 +16,7 @@ def _version():
 
 class CacheItem:
     "Holds cache and its version"
-    __slots__ = ('_proc', '_cache')
+    __slots__ = ('_proc', '_cache', '_pin')
     _VERSION  = _version()
 
     def __init__(self,
@@ -23,6 +24,7 @@ class CacheItem:
                  cache: Tuple[int, Any] = (0, None)) -> None:
         self._proc  = cast(Processor,       getattr(proc, '_proc', proc))
         self._cache = cast(Tuple[int, Any], getattr(proc, '_cache', cache))
+        self._pin   = getattr(proc, '_pin', None)
 
     def __getstate__(self):
         return {'proc': (type(self._proc), self._proc.task)}
@@ -64,8 +66,30 @@ class CacheItem:
         "Delayed access to the cache"
         return partial(self._getcache, self._cache[0])
 
+    def pin(self, frames: Optional[Tuple[Level, Tuple]] = None):
+        """
+        Requests that the processor's output be pinned or stores that output.
+
+        A request does nothing if the output is already pinned or requested.
+        """
+        if frames is not None:
+            self._pin = frames
+        elif self._pin is None:
+            self._pin = True
+
+    def unpin(self):
+        "discards the pinned output"
+        self._pin = None
+
     cache   = property(lambda self: self.getcache(), setcache)
+    pinning = property(lambda self: self._pin is True,
+                       doc = "whether the processor's output should be pinned on the next run")
+    pinned  = property(lambda self: None if self._pin is True else self._pin,
+                       doc = "the pinned output: the level and frames")
     proc    = property(lambda self: self._proc)
+    version = property(lambda self: self._cache[0], doc = "the cache's version")
+    nbytes  = property(lambda self: nbytes(self._cache[1]),
+                       doc = "an estimation of the memory used by the cache")
 
 
 RepType = Tuple[int, Processor, Processor]
@@ -111,7 +135,7 @@ class CacheReplacement:
 
 class Cache(Iterable[Processor]):
     "Contains the track and task-created data"
-    __slots__ = ('_items',)
+    __slots__ = ('_items', '__weakref__')
 
     def __init__(self, order: Iterable[Union[CacheItem, Processor, Task]] = None) -> None:
         if order is None:
@@ -201,10 +225,16 @@ class Cache(Iterable[Processor]):
         "sets a processor's cache"
         return self._items[self.index(ide)].setcache(value)
 
+    def pin(self, ide):
+        "requests that the output of processor *ide* be kept for later runs"
+        self._items[self.index(ide)].pin()
+
     def delcache(self, tsk = None) -> List[Tuple[Processor, Any]]:
         """
-        Clears cache starting at *tsk*.
+        Clears cache and pinned outputs starting at *tsk*.
         Clears all if tsk is None
+
+        Outputs pinned before *tsk* do not depend on it and are kept.
         """
         ind  = self.index(tsk)
         orig = self._items[ind]
@@ -214,6 +244,7 @@ class Cache(Iterable[Processor]):
             proc.setcache(None)
 
         for proc in self._items[ind:]:
+            proc.unpin()
             getattr(type(proc), 'clear', _clear)(proc, self, orig)
         return old
 
@@ -227,6 +258,10 @@ class Cache(Iterable[Processor]):
         "yields processors and caches"
         return iter(self._items)
 
+    def usage(self) -> List[Tuple[Processor, int]]:
+        "returns each processor and an estimation of the memory used by its cache"
+        return [(i.proc, i.nbytes) for i in self._items]
+
     def __contains__(self, tsk:type):
         return any(tsk is i or tsk is i.tasktype for i in self)
 
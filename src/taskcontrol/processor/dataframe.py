@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 "Processors apply tasks to a data flow"
+from    copy                    import copy as shallowcopy
 from    functools               import partial
+from    pathlib                 import Path
 from    typing                  import (Generic, TypeVar, Callable, Dict, Any,
-                                        Union, Type, Iterator, Tuple, Optional, cast)
+                                        Union, Type, Iterator, Tuple, Optional, List,
+                                        cast)
 
 import  pandas                  as     pd
 import  numpy                   as     np
@@ -16,9 +19,78 @@ from    taskmodel.dataframe     import DataFrameTask
 from    utils.inspection        import parametercount
 from    .base                   import Processor, ProcessorException
 
+class ColumnBuffers:
+    """
+    Accumulates the columns of many items. Each column is allocated once, with
+    its final size and type, when calling `columns`.
+
+    Columns missing from some items are filled with NaN, as `pd.concat` would.
+    """
+    def __init__(self):
+        self.sizes: List[int]                                 = []
+        self.__cols: Dict[str, List[Tuple[int, np.ndarray]]] = {}
+
+    def append(self, cols: Dict[str, Any]) -> int:
+        "adds an item's columns and returns its number of rows"
+        arrs = {i: j if isinstance(j, np.ndarray) else np.asarray(j) for i, j in cols.items()}
+        size = max((len(j) for j in arrs.values() if j.ndim), default = 1 if arrs else 0)
+        for name, arr in arrs.items():
+            self.__cols.setdefault(name, []).append(
+                (len(self.sizes), arr if arr.ndim else np.full(size, arr))
+            )
+        self.sizes.append(size)
+        return size
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        "returns the columns for all items"
+        offsets = np.insert(np.cumsum(self.sizes, dtype = 'i8'), 0, 0)
+        out     = {}
+        for name, chunks in self.__cols.items():
+            arrs = [j for _, j in chunks if len(j)] or [chunks[0][1]]
+            if len(chunks) == len(self.sizes):
+                out[name] = np.concatenate(arrs)  # always a copy
+                continue
+
+            dtype = (
+                np.result_type(np.float64, *arrs) if all(i.dtype.kind in 'biuf' for i in arrs)
+                else np.dtype('O')
+            )
+            col   = np.full(offsets[-1], np.NaN, dtype = dtype)
+            for i, arr in chunks:
+                col[offsets[i]:offsets[i+1]] = arr
+            out[name] = col
+        return out
+
+def writecolumns(path: Union[str, Path], columns: Dict[str, np.ndarray]):
+    """
+    Writes columns to a parquet (*.parquet*, *.pq*) or feather (*.feather*,
+    *.arrow*) file without creating a `pd.DataFrame`. This requires `pyarrow`.
+    """
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    suffix = Path(path).suffix.lower()
+    if suffix not in ('.parquet', '.pq', '.feather', '.arrow'):
+        raise ValueError(f"Unknown export format for {path}")
+
+    table  = pa.table({i: pa.array(j) for i, j in columns.items()})
+    if suffix in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+        pq.write_table(table, str(path))
+    else:
+        import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+        feather.write_feather(table, str(path))
+
 Frame = TypeVar('Frame', bound = TrackView)
 class DataFrameFactory(Generic[Frame]):
-    "base class for creating dataframes"
+    """
+    base class for creating dataframes
+
+    Merged dataframes are created in a single step: `_runmany` computes the
+    columns for all items at once. By default, it calls `_run` on each item
+    and accumulates the results in `ColumnBuffers`. Factories which need to
+    create a dataframe per item should set `BATCHED = False`.
+    """
+    BATCHED = True
     def __init__(self, task: DataFrameTask, buffers, _) -> None:
         self.task      = task
         transf         = list(self.task.transform)  if self.task.transform else []
@@ -96,9 +168,68 @@ class DataFrameFactory(Generic[Frame]):
 
         return info[0], data if self.task.merge else self.defaulttransform(frame, data)
 
+    def canbatch(self) -> bool:
+        "whether all items can be processed in a single call to `_runmany`"
+        return self.BATCHED and all(cnt != 2 for cnt, _ in self.transform)
+
+    def batchcolumns(self, frame, infos: List[Tuple[Any, Any]]) -> Dict[str, np.ndarray]:
+        "creates the columns for all items, index columns first"
+        sizes, cols = self._runmany(frame, infos)
+        if not sizes:
+            return {}
+
+        cnt  = int(np.sum(sizes))
+        keys = [i for i, _ in infos]
+        inds = {'track': np.full(cnt, self.trackname(frame.track))}
+        if all(isinstance(i, tuple) and len(i) == 2 for i in keys):
+            inds['bead']  = np.repeat([i[0] for i in keys], sizes)
+            inds['cycle'] = np.repeat([i[1] for i in keys], sizes)
+        elif all(np.isscalar(i) for i in keys):
+            inds['bead']  = np.repeat(keys, sizes)
+        inds.update(cols)
+        return inds
+
     def _run(self, frame, key, values) -> Dict[str, np.ndarray]:
         raise NotImplementedError()
 
+    def _runmany(self, frame, infos) -> Tuple[List[int], Dict[str, np.ndarray]]:
+        "returns the number of rows per item and the columns for all items"
+        buffers = ColumnBuffers()
+        for info in infos:
+            buffers.append(self._run(frame, *info))
+        return buffers.sizes, buffers.columns()
+
+    def exportpath(self, frame) -> Optional[Path]:
+        """
+        returns the file to which the track's columns are written, if any.
+
+        Each track is written to its own file: `{track}` in `task.export` is
+        replaced by the track name, which is otherwise appended to the stem.
+        """
+        if not self.task.export:
+            return None
+
+        path = str(self.task.export)
+        name = self.trackname(frame.track)
+        if '{track}' in path:
+            return Path(path.replace('{track}', name))
+        return Path(path).with_name(f"{Path(path).stem}_{name}{Path(path).suffix}")
+
+    def export(self, frame, columns: Dict[str, np.ndarray]):
+        "writes the track's merged columns to `exportpath`, if provided"
+        path = self.exportpath(frame)
+        if path is None:
+            return
+
+        if columns and hasattr(frame.track, 'pathinfo'):
+            columns = dict(
+                columns,
+                modification = np.full(
+                    len(next(iter(columns.values()))), frame.track.pathinfo.modification
+                )
+            )
+        writecolumns(path, columns)
+
     def defaulttransform(self, frame, data: pd.DataFrame) -> pd.DataFrame:
         "default transform action"
         for col in ('bead', 'cycle'):
@@ -166,14 +297,33 @@ class SafeDataFrameProcessor(Processor[DataFrameTask]):
     @classmethod
     def _merge(cls, task, buffers, frame):
         factory = cls.factory(frame).create(task, buffers, frame)
+        if factory.canbatch():
+            cols = factory.batchcolumns(frame, cls._merge_items(frame))
+            factory.export(frame, cols)
+            data = pd.DataFrame(cols)
+            if not cols:
+                factory.addtasklist(data)
+                return data
+            return factory.defaulttransform(frame, data)
+
         frame   = factory.apply(frame)
         lst     = cls._merge_list(frame)
         if not lst:
             data = pd.DataFrame()
             factory.addtasklist(data)
+            factory.export(frame, {})
             return data
 
-        return factory.defaulttransform(frame, pd.concat(lst, sort = False))
+        data = pd.concat(lst, sort = False)
+        factory.export(frame, {i: data[i].values for i in data.columns})
+        return factory.defaulttransform(frame, data)
+
+    @classmethod
+    def _merge_items(cls, frame) -> List[Tuple[Any, Any]]:
+        # the action makes `_merge_list` return (key, value) pairs
+        cpy         = shallowcopy(frame)
+        cpy.actions = [*frame.actions, lambda _, info: (info[0], info)]
+        return cls._merge_list(cpy)
 
     @staticmethod
     def _merge_list(frame):
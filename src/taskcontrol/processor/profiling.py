@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opt-in profiling of processor actions.
+
+When the profiler is enabled, the `Runner` wraps every action added by a
+processor to the yielded views. Each call then records the processor, the bead,
+the wall time and the number of bytes produced. Calls to `pooledinput` are
+recorded as well, as is the latency between a task edit and the end of the
+resulting plot resets, under `edit-to-redraw`. When disabled, a wrapped action
+only checks a flag before calling the original.
+
+    >>> from taskcontrol.processor.profiling import PROFILER
+    >>> with PROFILER(trace = True) as prof:
+    >>>     data = next(iter(ctrl.run()))
+    >>>     dict(data)
+    >>> prof.dataframe()                    # a table of statistics
+    >>> prof.chrometrace("trace.json")      # open with chrome://tracing
+
+Only the current process is profiled: actions evaluated by a process pool are
+not recorded, the time spent waiting for them is.
+"""
+from   contextlib   import contextmanager
+from   threading    import Lock, get_ident
+from   time         import perf_counter
+from   typing       import Dict, List, Tuple, Any, Optional, Union
+from   pathlib      import Path
+import json
+import os
+
+import numpy        as     np
+import pandas       as     pd
+
+def _nbytes(item) -> int:
+    "the number of bytes in an action's output"
+    val = item[1] if isinstance(item, tuple) and len(item) == 2 else item
+    return int(getattr(val, 'nbytes', 0))
+
+def _unwrapped(action):
+    return action
+
+class ProfiledAction:
+    "Wraps an action such that its calls are recorded by the profiler"
+    __slots__ = ('profiler', 'name', 'action', 'bufferuse', 'owned', 'batch')
+    def __init__(self, profiler: 'Profiler', name: str, action):
+        self.profiler = profiler
+        self.name     = name
+        self.action   = action
+        if hasattr(action, 'bufferuse'):
+            self.bufferuse = action.bufferuse
+        if hasattr(action, 'owned'):
+            self.owned = ProfiledAction(profiler, name, action.owned)
+        if callable(getattr(action, 'batch', None)):
+            self.batch = ProfiledAction(profiler, name, action.batch)
+
+    def __call__(self, frame, item):
+        if not self.profiler.enabled:
+            return self.action(frame, item)
+
+        start = perf_counter()
+        out   = None
+        try:
+            out = self.action(frame, item)
+            return out
+        finally:
+            stop = perf_counter()
+            if isinstance(item, list):
+                # batched action: the time is shared between items
+                out = [None]*len(item) if out is None else out
+                for i, j in zip(item, out):
+                    self.profiler.record(self.name, i[0], start, stop, _nbytes(j), len(item))
+            else:
+                self.profiler.record(self.name, item[0], start, stop, _nbytes(out))
+
+    def __reduce__(self):
+        # profiling is not carried over to other processes
+        return _unwrapped, (self.action,)
+
+class Profiler:
+    """
+    Collects the wall time, number of calls and bytes produced per processor
+    and per bead.
+
+    Attributes:
+
+    * `enabled`: whether calls are recorded.
+    * `trace`: whether to keep every call for exporting a chrome trace.
+    """
+    enabled = False
+    trace   = False
+    def __init__(self):
+        self._lock                                       = Lock()
+        self._stats:  Dict[Tuple[str, Any], List[float]] = {}
+        self._events: List[Tuple[str, Any, float, float, int, int]] = []
+        self._origin                                     = perf_counter()
+
+    def __call__(self, trace: Optional[bool] = None) -> 'Profiler':
+        if trace is not None:
+            self.trace = trace
+        return self
+
+    def __enter__(self) -> 'Profiler':
+        self.enabled = True
+        return self
+
+    def __exit__(self, *_):
+        self.enabled = False
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, _):
+        self.__init__()
+
+    def clear(self):
+        "removes all records"
+        with self._lock:
+            self._stats.clear()
+            self._events.clear()
+            self._origin = perf_counter()
+
+    def record(  # pylint: disable=too-many-arguments
+            self, name: str, key, start: float, stop: float, nbytes: int, share: int = 1
+    ):
+        "records one call"
+        bead = key[0] if isinstance(key, tuple) and len(key) else key
+        with self._lock:
+            stats     = self._stats.setdefault((name, bead), [0, 0., 0])
+            stats[0] += 1
+            stats[1] += (stop-start)/share
+            stats[2] += nbytes
+            if self.trace:
+                self._events.append((name, key, start, stop, nbytes, get_ident()))
+
+    @contextmanager
+    def timed(self, name: str, key = None):
+        "records the time spent in the context, if enabled"
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, key, start, perf_counter(), 0)
+
+    def wrap(self, name: str, frame):
+        "wraps the frame's actions not yet profiled, attributing these to *name*"
+        actions = getattr(frame, 'actions', None)
+        if actions:
+            frame.actions = [
+                i if isinstance(i, ProfiledAction) or getattr(i, 'bufferuse', None) == 'copy'
+                else ProfiledAction(self, name, i)
+                for i in actions
+            ]
+        return frame
+
+    def dataframe(self) -> pd.DataFrame:
+        "returns the statistics per processor and per bead"
+        with self._lock:
+            items = sorted(self._stats.items(), key = lambda i: (i[0][0], str(i[0][1])))
+        return pd.DataFrame({
+            'processor': [i[0] for i, _ in items],
+            'bead':      [i[1] for i, _ in items],
+            'calls':     np.array([i[0] for _, i in items], dtype = 'i8'),
+            'time':      np.array([i[1] for _, i in items], dtype = 'f8'),
+            'bytes':     np.array([i[2] for _, i in items], dtype = 'i8'),
+        })
+
+    def chrometrace(self, path: Union[None, str, Path] = None) -> dict:
+        "returns the recorded calls in the chrome trace format, saving them if *path* is provided"
+        with self._lock:
+            events = list(self._events)
+            origin = self._origin
+
+        pid   = os.getpid()
+        out   = {
+            'traceEvents': [
+                dict(name = name, cat = 'processor', ph = 'X', pid = pid, tid = tid,
+                     ts   = (start-origin)*1e6, dur = (stop-start)*1e6,
+                     args = dict(key = str(key), bytes = nbytes))
+                for name, key, start, stop, nbytes, tid in events
+            ],
+            'displayTimeUnit': 'ms'
+        }
+        if path is not None:
+            with open(path, 'w', encoding = 'utf-8') as stream:
+                json.dump(out, stream)
+        return out
+
+PROFILER = Profiler()
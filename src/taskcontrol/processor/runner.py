@@ -8,16 +8,18 @@ from concurrent.futures import ProcessPoolExecutor
 from multiprocessing    import cpu_count
 from copy               import copy as shallowcopy
 from typing             import (Iterable, Tuple, Dict, Any, Union, Optional,
-                                Iterator, cast)
+                                Iterator, List, cast)
 import pickle
 
 import numpy            as     np
 
 from utils              import toenum
-from data.views         import TrackView, createTrackView
+from data.views         import TrackView, Beads, createTrackView
 from taskmodel          import Task, Level
 from .base              import Processor
-from .cache             import Cache
+from .budget            import BoundedCache
+from .cache             import Cache, CacheItem
+from .profiling         import PROFILER
 
 DataType = Union[Cache, Iterable[Processor], bytes]
 class RunnerUtils:
@@ -50,6 +52,43 @@ class RunnerUtils:
                                     parents = frame.parents+(key,))
                     for frame in gen for key in frame.keys())
 
+class PinnedItems:
+    """
+    The output of a processor, kept from one run to the next.
+
+    Items are stored the first time these are requested. They are then
+    provided without walking through the upstream tasks again. The store
+    counts against the global memory budget: evicted items are requested
+    again from the upstream tasks.
+    """
+    __slots__ = ('frame', 'store', '_keys')
+    def __init__(self, frame: TrackView, name: str = 'pinned') -> None:
+        self.frame                   = frame
+        self.store                   = BoundedCache(name = name, cost = 10.)
+        self._keys: Optional[tuple]  = None
+
+    def __copy__(self):
+        # copies of the pinned frames share their items
+        return self
+
+    def keys(self) -> Iterator:
+        "returns the keys"
+        if self._keys is None:
+            self._keys = tuple(self.frame.keys())
+        return iter(self._keys)
+
+    def __getitem__(self, key):
+        try:
+            return self.store[key]
+        except KeyError:
+            pass
+
+        out = self.frame.get(key)
+        if isinstance(out, Iterator):
+            out = np.array(tuple(out), dtype = 'O')
+        self.store[key] = out
+        return out
+
 class Runner:
     "Arguments used for iterating"
     __slots__ = ('data', 'pool', 'level', 'gen')
@@ -193,15 +232,55 @@ class Runner:
 
     def __call__(self, copy = True):
         "runs over processors"
-        first = True
-        for proc in self.data:
+        items = list(self.data.items())
+        start = self.__restart(items)
+        first = start == 0
+        for item in items[start:]:
+            proc = item.proc
             if not proc.task.disabled:
                 proc.run(self)
+                if PROFILER.enabled and self.gen is not None:
+                    self.apply(partial(PROFILER.wrap, type(proc).__name__))
                 if first and copy:
                     self.gen = tuple(frame.withcopy(True, 0) for frame in self.gen)
                 first  = False
+                if item.pinning and self.gen is not None:
+                    self.__pin(item)
         return () if self.gen is None else self.gen
 
+    def __restart(self, items: List[CacheItem]) -> int:
+        "restarts from the last pinned output and returns the index of the next processor"
+        if self.gen is not None:
+            return 0
+
+        ind = next((i for i in range(len(items)-1, -1, -1) if items[i].pinned), None)
+        if ind is None:
+            return 0
+
+        self.level, frames = items[ind].pinned
+        self.gen           = self.__unpin(frames)
+        return ind+1
+
+    def __pin(self, item: CacheItem):
+        "stores the processor's output such that later runs may restart from it"
+        name   = type(item.proc).__name__+'.pinned'
+        frames = tuple(self.__pinnedframe(i, name) for i in cast(Iterator[TrackView], self.gen))
+        item.pin((self.level, frames))
+        self.gen = self.__unpin(frames)
+
+    @staticmethod
+    def __pinnedframe(frame: TrackView, name: str) -> TrackView:
+        data = PinnedItems(frame, name)
+        if isinstance(frame, Beads):
+            # the pinned items are already restricted to the selected cycles
+            return frame.new(data = data, cycles = None)
+        return frame.new(getattr(frame, '_freeze_type')(), data = data)
+
+    @staticmethod
+    def __unpin(frames) -> Iterator[TrackView]:
+        # the copy protects the pinned items from downstream actions
+        return iter(tuple(shallowcopy(i).withcopy(True) for i in frames))
+
 def poolchunk(items, nproc, iproc):
     "returns a chunk of keys"
     if isinstance(items, Iterator):
@@ -249,6 +328,10 @@ def pooledinput(
     if pool is None and not safe:
         return dict(frame)
 
+    with PROFILER.timed('pooledinput', frame.parents):
+        return _pooledinput(pool, data, frame, safe)
+
+def _pooledinput(pool, data, frame, safe) -> dict:
     res: dict = {}
     if pool is None:
         for i in frame.keys():
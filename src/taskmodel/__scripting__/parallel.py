@@ -1,29 +1,70 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"Runs tasks in parallel"
+"""
+Runs tasks in parallel
+
+Tracks are split into chunks of beads such that all jobs have a similar cost.
+Jobs are submitted from the most expensive to the least expensive to a single
+pool: idle workers take the next job, whichever track it belongs to.
+"""
 from typing                 import (Union, Sequence, Type, Dict, Generator,
-                                    Callable, List, cast)
-from concurrent.futures     import ProcessPoolExecutor, ThreadPoolExecutor
+                                    Callable, List, Tuple, Iterator, Optional,
+                                    NamedTuple, cast)
+from concurrent.futures     import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                    as_completed)
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing        import cpu_count
+from pathlib                import Path
+import atexit
 import pickle
+
+import numpy                as     np
 import pandas               as     pd
 
 from data.views              import TrackView
 from data.tracksdict         import TracksDict
 from data.track              import Track
-from taskcontrol.processor   import Processor, run as _runprocessors
+from data.trackio            import checkpath
+from taskcontrol.processor   import (Processor, DataSelectionProcessor,
+                                     run as _runprocessors)
 from taskcontrol.taskcontrol import register
-from ..track                 import TrackReaderTask, RootTask, Task
+from ..track                 import TrackReaderTask, RootTask, Task, DataSelectionTask
 from .tasks                  import Tasks
 
+PoolType = Union[ProcessPoolExecutor, ThreadPoolExecutor]
+JobArgs  = Union[bytes, Tuple[bytes, Tuple[int, ...]]]
+
+class _Job(NamedTuple):
+    track: int
+    chunk: int
+    cost:  float
+    args:  JobArgs
+
 class Parallel:
-    "Runs tasks in parallel"
+    """
+    Runs tasks in parallel
+
+    # Attributes
+
+    * `split`: whether to split tracks into chunks of beads. Tracks are never
+    split if one of the processors pools beads together.
+    * `oversplit`: the number of jobs per worker to aim for. More jobs means a
+    better balance between workers at the cost of a greater overhead.
+    """
+    split     = True
+    oversplit = 4
+    _POOL: Optional[ProcessPoolExecutor] = None
     def __init__(
             self,
             *tasks:     Union[Tasks, Task],
             roots:      Union[TracksDict, Sequence[RootTask]] = None,
-            processors: Dict[Type[Task], Type[Processor]] = None
+            processors: Dict[Type[Task], Type[Processor]]     = None,
+            split:      Optional[bool]                        = None
     ) -> None:
-        self.args: List[bytes] = []
+        self.args:  List[bytes]                             = []
+        self.beads: List[Tuple[Optional[List[int]], float]] = []
+        if split is not None:
+            self.split = split
         if roots is not None:
             self.extend(roots, *tasks, processors = processors)
 
@@ -34,9 +75,10 @@ class Parallel:
             processors: Dict[Type[Task], Type[Processor]] = None
     ) -> 'Parallel':
         "adds new jobs"
+        tracks = list(getattr(roots, 'values', lambda: roots)())
         lroots = [i if isinstance(i, RootTask) else
                   TrackReaderTask(path = i.path, key  = i.key, axis = i.axis.name)
-                  for i in getattr(roots, 'values', lambda: roots)()]
+                  for i in tracks]
         if len(lroots) == 0:
             return self
 
@@ -54,40 +96,182 @@ class Parallel:
             ])
             for i in lroots
         ]
+
+        cansplit    = self.split and self._cansplit(main)
+        self.beads += [self._beadsandcost(i, cansplit) for i in tracks]
         return self
 
+    @classmethod
+    def pool(cls, renew = False) -> ProcessPoolExecutor:
+        """
+        returns the process pool shared by all instances
+
+        The pool is created on demand and shut down at exit or by calling
+        `Parallel.shutdown`.
+        """
+        if renew or cls._POOL is None:
+            if cls._POOL is None:
+                atexit.register(cls.shutdown)
+            else:
+                cls._POOL.shutdown(wait = False)
+            cls._POOL = ProcessPoolExecutor()
+        return cls._POOL
+
+    @classmethod
+    def shutdown(cls, wait = True):
+        "shuts down the process pool shared by all instances, if any"
+        pool, cls._POOL = cls._POOL, None
+        if pool is not None:
+            atexit.unregister(cls.shutdown)
+            pool.shutdown(wait = wait)
+
+    def jobs(self, pool: PoolType = None) -> List[_Job]:
+        "returns the jobs, most expensive first"
+        nworkers = (
+            getattr(pool, 'nworkers', None)
+            or getattr(pool, '_max_workers', None)
+            or cpu_count()
+        )
+        total    = sum(cost for _, cost in self.beads)
+        target   = total / max(1, nworkers * self.oversplit)
+
+        out: List[_Job] = []
+        for itrack, (args, (beads, cost)) in enumerate(zip(self.args, self.beads)):
+            nchunks = (
+                1 if not (self.split and beads) or target <= 0. else
+                min(len(beads), int(np.ceil(cost/target)))
+            )
+            if nchunks <= 1:
+                out.append(_Job(itrack, 0, cost, args))
+                continue
+
+            allbeads = frozenset(beads)
+            for ichunk, chunk in enumerate(np.array_split(np.array(beads), nchunks)):
+                others = tuple(sorted(allbeads.difference(chunk.tolist())))
+                out.append(_Job(itrack, ichunk, cost*len(chunk)/len(beads), (args, others)))
+
+        out.sort(key = lambda i: -i.cost)
+        return out
+
+    def stream(self, pool: PoolType = None) -> Iterator[Tuple[int, int, Tuple]]:
+        """
+        Yields the track index, the chunk index and the results of each job as
+        soon as these are available.
+
+        Results for a single track are split over as many jobs as the track
+        was split into.
+        """
+        jobs = self.jobs(pool)
+        if len(jobs) == 1:
+            # if only 1 job, do directly
+            yield jobs[0].track, jobs[0].chunk, self.run(jobs[0].args)
+            return
+
+        if not hasattr(pool, 'submit'):
+            pool = self.pool()
+
+        try:
+            futs = {cast(PoolType, pool).submit(self.run, i.args): i for i in jobs}
+        except BrokenProcessPool:
+            if pool is not self._POOL:
+                raise
+            pool = self.pool(True)
+            futs = {pool.submit(self.run, i.args): i for i in jobs}
+
+        try:
+            for fut in as_completed(futs):
+                yield futs[fut].track, futs[fut].chunk, fut.result()
+        finally:
+            for fut in futs:
+                fut.cancel()
+
     def process(
             self,
-            pool: Union[ProcessPoolExecutor, ThreadPoolExecutor] = None,
+            pool: PoolType = None,
             endaction: Union[str, Callable] = None
     ):
         "processes the parallel task"
-        pmap = (
-            map                  if len(self.args) == 1  else  # if only 1 arg, do directly
-            getattr(pool, 'map') if hasattr(pool, 'map') else
-            ProcessPoolExecutor().map
-        )
-
         if endaction in (pd.concat, 'concat', 'concatenate'):
+            lst: List[Tuple[int, int, int, pd.DataFrame]] = []
+            for itrack, ichunk, res in self.stream(pool):
+                if isinstance(res, (list, tuple)):
+                    lst.extend((itrack, ichunk, k, j) for k, j in enumerate(res) if j is not None)
+                elif res is not None:
+                    lst.append((itrack, ichunk, 0, res))
+            lst.sort(key = lambda i: i[:3])
+            return pd.concat([i[-1] for i in lst], sort = False)
 
-            lst: List[pd.DataFrame] = []
-            for i in pmap(self.run, self.args):
-                if isinstance(i, (list, tuple)):
-                    lst.extend(j for j in i if j is not None)
-                elif i is not None:
-                    lst.append(i)
-            return pd.concat(lst, sort = False)
-
+        res = self.__gather(pool)
         if callable(endaction):
-            return [cast(Callable, endaction)(i) for i in pmap(self.run, self.args)]
+            return [cast(Callable, endaction)(i) for i in res]
 
-        res = list(pmap(self.run, self.args))
         if all(len(i) == 1 for i in res):
             return [i[0] for i in res]
         return res
 
+    def __gather(self, pool: PoolType = None) -> List[Tuple]:
+        "gathers results per track, in the order in which tracks were added"
+        parts: Dict[int, Dict[int, Tuple]] = {}
+        for itrack, ichunk, res in self.stream(pool):
+            parts.setdefault(itrack, {})[ichunk] = res
+
+        out: List[Tuple] = []
+        for itrack in range(len(self.args)):
+            lst = [j for _, j in sorted(parts[itrack].items())]
+            if len(lst) == 1:
+                out.append(lst[0])
+            else:
+                out.append(tuple(self.__merge([i[j] for i in lst]) for j in range(len(lst[0]))))
+        return out
+
+    @staticmethod
+    def __merge(items: list):
+        "merges the results from a track's chunks"
+        if all(isinstance(i, pd.DataFrame) for i in items):
+            return pd.concat(items, sort = False)
+        if all(isinstance(i, tuple) for i in items):
+            return sum(items, ())
+        return items
+
+    @staticmethod
+    def _cansplit(procs: Sequence[Processor]) -> bool:
+        "whether the tasks may be run on chunks of beads"
+        return not any(
+            i.canpool() or getattr(i.task, 'transform', None)
+            for i in procs
+        )
+
+    @staticmethod
+    def _beadsandcost(track, cansplit: bool) -> Tuple[Optional[List[int]], float]:
+        """
+        Returns the beads in the track and an estimation of its cost.
+
+        The beads are only returned when the track can be split and they are
+        known without reading the full track.
+        """
+        if isinstance(track, Track) and track.isloaded:
+            beads = list(track.beads.keys())
+            return (beads if cansplit else None), float(track.nframes*len(beads))
+
+        paths = (
+            track.pathinfo.paths if isinstance(track, Track) else
+            [Path(str(i)) for i in np.ravel([getattr(track, 'path', None)]) if i]
+        )
+        cost  = float(sum(i.stat().st_size for i in paths if i.exists()))
+        if not (cansplit and isinstance(track, Track) and track.path):
+            return None, cost
+
+        try:
+            if not checkpath(track).partialread:
+                return None, cost
+            cpy = track.shallowcopy()
+            cpy.load(slice(0, 1))
+        except Exception:  # pylint: disable=broad-except
+            return None, cost
+        return list(cpy.beads.keys()), cost
+
     @staticmethod
-    def run(args: bytes):
+    def run(args: JobArgs):
         "runs one task"
         def _cnv(res):
             if isinstance(res, TrackView):
@@ -96,14 +280,19 @@ class Parallel:
                     res = tuple((i, tuple(j)) for i, j in res)
             return res
 
+        if isinstance(args, tuple):
+            # only a chunk of beads: discard the others right after the root
+            procs = pickle.loads(args[0])
+            procs.insert(1, DataSelectionProcessor(DataSelectionTask(discarded = list(args[1]))))
+            args  = procs
         return tuple(_cnv(i) for i in _runprocessors(args))
 
 def parallel(
         roots:      Union[TracksDict, Sequence[RootTask]],
         *tasks:     Task,
-        processors: Dict[Type[Task], Type[Processor]]              = None,
-        pool:       Union[ProcessPoolExecutor, ThreadPoolExecutor] = None,
-        endaction:  Union[str, Callable]                           = None
+        processors: Dict[Type[Task], Type[Processor]] = None,
+        pool:       PoolType                          = None,
+        endaction:  Union[str, Callable]              = None
 ):
     "Runs tasks in parallel"
-    return Parallel(roots, *tasks, processors = processors).process(pool, endaction)
+    return Parallel(*tasks, roots = roots, processors = processors).process(pool, endaction)
@@ -284,7 +284,7 @@ class Tasks(Enum):  # pylint: disable=too-many-public-methods
     def tasklist(cls, *tasks, **kwa) -> List[Task]:
         "Return as create except that a list may be completed as necessary"
         if len(tasks) == 1 and isinstance(tasks[0], (str, Path)):
-            mdl = taskstore.load(tasks[0])
+            mdl = taskstore.memoload(tasks[0])
             if mdl is None:
                 raise ValueError("Could not load model")
             return mdl
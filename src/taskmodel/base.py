@@ -123,6 +123,9 @@ class DataFunctorTask(Task):
 
         if self.copy:
             fcn = lambda val: cpy(np.copy(val)) # pylint: disable=not-callable
+            if callable(getattr(cpy, 'batch', None)):
+                # views filter whole beads or tracks in a single native call
+                fcn.batch = lambda vals: cpy.batch([np.copy(i) for i in vals])  # type: ignore
             return lambda dat: dat.withfunction(fcn)
 
         return lambda dat: dat.withfunction(cpy)
@@ -22,12 +22,17 @@ class DataFrameTask(Task):
     depending on the level the task is applied to.
     * `measures`: the name of a column and the function for creating its values.
     * `transform`: actions to be performed on the finalized dataframe.
+    * `export`: a *.parquet* or *.feather* file where merged columns are written
+    directly, prior to any `transform`. There is one file per track: `{track}`
+    in the path is replaced by the track name, which is otherwise appended to
+    the file's stem.
     """
     level                                      = Level.none
     merge                                      = False
     indexes:   Sequence[str]                   = ['hpin', 'track', 'bead', 'cycle', 'event']
     measures:  Dict[str, Union[bool, Callable, str]] = {}
     transform: Optional[List[Callable]]              = None
+    export:    Optional[str]                         = None
     @initdefaults(frozenset(locals()))
     def __init__(self, **kwa):
         super().__init__(**kwa)
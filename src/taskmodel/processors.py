@@ -73,8 +73,17 @@ class TaskCacheList:
         return None
 
     def update(self, tsk):
-        "clears data starting at *tsk*"
-        return self.data.delcache(tsk)
+        """
+        Clears data starting at *tsk*.
+
+        The output of the previous enabled task is pinned: the next run starts
+        from it rather than from the root task.
+        """
+        ind  = self.data.index(tsk)
+        prev = next((i for i in range(ind-1, 0, -1) if not self.model[i].disabled), None)
+        if prev is not None:
+            self.data.pin(prev)
+        return self.data.delcache(ind)
 
     def cleancopy(self) -> 'TaskCacheList':
         "returns a cache with only the processors"
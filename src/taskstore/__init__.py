@@ -10,3 +10,4 @@ from anastore import (
 )
 from ._default  import __TASKS__, __CONFIGS__
 from ._local    import LocalPatch
+from ._memo     import MemoizedStore, memodumps, memoloads, memoload
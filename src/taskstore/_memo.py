@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memoized serialization of tasks.
+
+The anastore encoding is slow: it walks the python objects and then runs the
+patch pipeline on loading. Task lists are instead identified by the pickled
+state of each task, which is computed in C. Any change to a task changes that
+state, hence invalidates the memoized encoding.
+
+Pickling is itself avoided for task attributes which are immutable and still
+the same objects as when last pickled: only attributes holding mutable values,
+which can change in place, are pickled on every call.
+"""
+from   collections import OrderedDict
+from   enum        import Enum
+from   pathlib     import Path
+from   threading   import Lock
+from   typing      import Any, Optional, Tuple, Union
+from   weakref     import WeakKeyDictionary
+import pickle
+
+from   anastore    import dumps, loads, load
+
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), range, slice, Enum)
+
+def _isimmutable(val: Any) -> bool:
+    if isinstance(val, (tuple, frozenset)):
+        return all(_isimmutable(i) for i in val)
+    return isinstance(val, _IMMUTABLE)
+
+def _pickle(item: Any) -> Optional[bytes]:
+    try:
+        return pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+class MemoizedStore:
+    "Memoizes task encodings until one of the tasks changes"
+    maxsize = 512
+
+    def __init__(self, maxsize: Optional[int] = None):
+        if maxsize is not None:
+            self.maxsize = maxsize
+        self._lock    = Lock()
+        self._dumped: OrderedDict       = OrderedDict()
+        self._loaded: OrderedDict       = OrderedDict()
+        self._files:  OrderedDict       = OrderedDict()
+        self._tasks:  WeakKeyDictionary = WeakKeyDictionary()
+
+    def clear(self):
+        "clears the memoized encodings"
+        with self._lock:
+            self._dumped.clear()
+            self._loaded.clear()
+            self._files.clear()
+            self._tasks.clear()
+
+    def state(self, item: Any) -> Optional[Tuple]:
+        """
+        returns a key which changes whenever the item does or None if the item
+        cannot be pickled
+        """
+        if isinstance(item, (list, tuple)):
+            out = tuple(self.state(i) for i in item)
+            return None if None in out else (type(item), out)
+        return self.__taskstate(item)
+
+    def dumps(self, item: Any, **kwa) -> str:
+        "same as `anastore.dumps` but memoized"
+        state = self.state(item)
+        if state is None:
+            return dumps(item, **kwa)
+
+        key = state, tuple(sorted(kwa.items()))
+        with self._lock:
+            out = self._dumped.get(key, None)
+            if out is not None:
+                self._dumped.move_to_end(key)
+                return out
+
+        out = dumps(item, **kwa)
+        cpy = _pickle(item)
+        with self._lock:
+            self.__add(self._dumped, key, out)
+            if cpy is not None:
+                # encodings created by this process are current: no need to patch them
+                self.__add(self._loaded, out, cpy)
+        return out
+
+    def loads(self, info: str, **kwa) -> Any:
+        """
+        same as `anastore.loads` but the patch pipeline is only run the first
+        time a given string is decoded
+        """
+        if kwa:
+            return loads(info, **kwa)
+
+        with self._lock:
+            cpy = self._loaded.get(info, None)
+        if cpy is not None:
+            return pickle.loads(cpy)
+
+        out = loads(info)
+        cpy = _pickle(out)
+        if cpy is not None:
+            with self._lock:
+                self.__add(self._loaded, info, cpy)
+        return out
+
+    def load(self, path: Union[str, Path], **kwa) -> Any:
+        """
+        same as `anastore.load` but the file is only decoded and patched again
+        once it has changed on disk
+        """
+        try:
+            stat = Path(path).stat()
+        except (OSError, TypeError):
+            stat = None
+        if kwa or stat is None:
+            return load(path, **kwa)
+
+        key = str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size
+        with self._lock:
+            cpy = self._files.get(key, None)
+        if cpy is not None:
+            return pickle.loads(cpy)
+
+        out = load(path)
+        cpy = _pickle(out)
+        if cpy is not None:
+            with self._lock:
+                self.__add(self._files, key, cpy)
+        return out
+
+    def __taskstate(self, item: Any) -> Optional[Tuple]:
+        attrs = getattr(item, '__dict__', None)
+        if attrs is None:
+            cpy = _pickle(item)
+            return None if cpy is None else (cpy,)
+
+        with self._lock:
+            try:
+                old = self._tasks.get(item, None)
+            except TypeError:  # neither hashable nor weakly referenceable
+                old = None
+
+        # immutable attributes are pickled again only if they were replaced
+        fixed = {i: j for i, j in attrs.items() if _isimmutable(j)}
+        if (
+                old is None
+                or old[0].keys() != fixed.keys()
+                or any(old[0][i] is not j for i, j in fixed.items())
+        ):
+            cpy = _pickle((type(item), sorted(fixed.items())))
+            if cpy is None:
+                return None
+            try:
+                with self._lock:
+                    self._tasks[item] = old = (fixed, cpy)
+            except TypeError:
+                old = (fixed, cpy)
+
+        others = _pickle(sorted((i, j) for i, j in attrs.items() if i not in fixed))
+        return None if others is None else (old[1], others)
+
+    def __add(self, store: OrderedDict, key, value):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.maxsize:
+            store.popitem(last = False)
+
+MEMO = MemoizedStore()
+
+def memodumps(item: Any, **kwa) -> str:
+    "same as `anastore.dumps` but memoized until the item changes"
+    return MEMO.dumps(item, **kwa)
+
+def memoloads(info: str, **kwa) -> Any:
+    "same as `anastore.loads` but patches a given string only once"
+    return MEMO.loads(info, **kwa)
+
+def memoload(path: Union[str, Path], **kwa) -> Any:
+    "same as `anastore.load` but patches a given file only once until it changes"
+    return MEMO.load(path, **kwa)
@@ -3,7 +3,9 @@
 "Utils for dealing with the JS side of the view"
 from typing                  import TypeVar
 from abc                     import abstractmethod
+from time                    import perf_counter
 from taskcontrol.modelaccess import TaskPlotModelAccess, TaskAccess
+from taskcontrol.processor   import PROFILER
 from .base                   import PlotCreator, PlotModelType, CACHE_TYPE
 
 TModelType = TypeVar('TModelType', bound = TaskPlotModelAccess)
@@ -14,7 +16,14 @@ class TaskPlotCreator(PlotCreator[TModelType, PlotModelType]):
 
     def _onchangetask(self, parent = None, task = None, calllater = None, **_):
         if self._model.impacts(parent, task):
-            calllater.append(lambda: self.reset(False))
+            start = perf_counter()
+            calllater.append(lambda: self.__resetafteredit(start))
+
+    def __resetafteredit(self, start: float):
+        "resets the plot, recording the edit-to-redraw latency if profiling"
+        self.reset(False)
+        if PROFILER.enabled:
+            PROFILER.record('edit-to-redraw', type(self).__name__, start, perf_counter(), 0)
 
     def _onchangedisplay(self, old = None, calllater = None, **_):
         calllater.append(lambda: self.reset('taskcache' in old))
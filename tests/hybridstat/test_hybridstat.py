@@ -218,6 +218,17 @@ def test_reporting():
     _ = next(tasks)
     assert Path(out).exists()
 
+def test_beadqueue():
+    "tests the precomputation order"
+    from hybridstat.view._model._jobs import BeadQueue
+    queue = BeadQueue(range(10), {3})
+    assert len(queue) == 9
+    assert queue.pop(5, 3) == [5, 6, 4]
+    assert queue.pop(5, 3) == [7, 8, 2]
+    assert queue.pop(1, 2, {0}) == [1, 9]
+    assert queue.pop(1, 2) == []
+    assert len(queue) == 0
+
 if __name__ == '__main__':
     test_ids()
     test_excelprocessor()
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 u"testing peakcalling"
 # pylint: disable=import-error,no-name-in-module
+import gc
 from concurrent.futures         import ProcessPoolExecutor
 from itertools                  import product
 import numpy  as np
@@ -162,6 +163,58 @@ def test_toref_dataframe():
         'referenceposition', 'avg', 'length', 'start', 'modification', 'status'
     }
 
+def test_toref_defaultdata():
+    "tests reference comparison when the reference is a list of processors"
+    # pylint: disable=protected-access
+    from peakcalling.processor.fittoreference import REFERENCES
+    peaks = np.array([.1, .5, .6, 1.], dtype = 'f4')
+    root  = ByPeaksEventSimulatorTask(bindings       = peaks[::-1],
+                                      brownianmotion = .01,
+                                      onrates        = 1.,
+                                      baseline       = None,
+                                      nbeads         = 2,
+                                      ncycles        = 5)
+    ref   = create(root)
+    tsk   = FitToReferenceTask(fitalg  = ChiSquareHistogramFit())
+    tsk.defaultdata = ref.data
+
+    REFERENCES.clear()
+    root.bindings = peaks[::-1]/.99 + .05
+    beads         = next(iter(create(root, tsk).run()))
+    for _, bead in beads:
+        assert_allclose(bead.params, [.99, 0.05], rtol = 5e-3, atol = 5e-3)
+
+    assert len(REFERENCES._items) == 1
+    entry = next(iter(REFERENCES._items.values()))
+    assert set(entry.data) == {0, 1}
+    assert REFERENCES.get(ref.data, tsk.fitalg, 0) is entry.data[0]
+
+    # the reference data is discarded with the reference
+    del ref, tsk, beads, entry
+    gc.collect()
+    assert len(REFERENCES._items) == 0
+
+def test_toref_cachedreference():
+    "tests that a reference with cached processors is computed once"
+    # pylint: disable=protected-access
+    from peakcalling.processor.fittoreference import REFERENCES
+    tasks = (TrackReaderTask(path = utpath("big_selected")), EventDetectionTask(),
+             PeakSelectorTask())
+    ref   = create(*tasks)
+    tsk   = FitToReferenceTask(fitalg  = ChiSquareHistogramFit())
+    tsk.defaultdata = ref.data
+
+    REFERENCES.clear()
+    beads = next(iter(create(*tasks, tsk).run()))
+    keys  = list(beads.keys())[:2]
+    assert_allclose(beads[keys[0]].params, [1., 0.], rtol = 5e-3, atol = 5e-3)
+    entry = next(iter(REFERENCES._items.values()))
+    assert_allclose(beads[keys[1]].params, [1., 0.], rtol = 5e-3, atol = 5e-3)
+
+    assert len(REFERENCES._items) == 1
+    assert next(iter(REFERENCES._items.values())) is entry
+    assert set(entry.data) == set(keys)
+
 def test_cost_value():
     u"Tests peakcalling.cost.compute"
     bead1 = np.arange(10, dtype = 'f4')
@@ -200,6 +253,14 @@ def test_match():
     assert (match.compute(bead1, [.8, 35., 37.])-[[0,0], [3, 1]]).sum() == 0
     assert (match.compute(bead1, [-100., 5., 37.])-[[1,1], [3, 2]]).sum() == 0
 
+def test_match_assign():
+    u"Tests peakcalling.match.assign"
+    bead1 = np.array([1, 5, 10, 32], dtype = np.float32)
+    exp   = [np.array([.8, 6., .8, 35.], dtype = 'f4'), np.array([-100., 5., 37.], dtype = 'f4')]
+    out   = match.assign([bead1, bead1], exp, 20.)
+    assert_allclose(out, [1., 5., 1., 32., np.NaN, 5., 32.])
+    assert len(match.assign([], [], 20.)) == 0
+
 def test_onehairpincost():
     u"tests hairpin cost method"
     truth = np.array([0., .1, .2, .5, 1.,  1.5], dtype = 'f4')/8.8e-4
@@ -207,6 +268,25 @@ def test_onehairpincost():
     res   = GaussianProductFit(peaks = truth).optimize(bead[:-1])
     assert_allclose((bead-res[2])*res[1], truth, rtol = 1e-4, atol = 1e-2)
 
+def test_screenedhairpincost():
+    u"tests that screening seeds identifies the same hairpins as the full grid"
+    truth = [np.array([0., .1, .2, .5, 1.,  1.5], dtype = 'f4')/8.8e-4,
+             np.array([0., .1,     .5, 1.2, 1.5], dtype = 'f4')/8.8e-4,
+             np.array([0., .3, .4, .7, 1.3, 1.5], dtype = 'f4')/8.8e-4]
+    rnd   = np.random.RandomState(0)
+    for itruth, (stretch, bias) in product(range(3), zip(rnd.uniform(.95, 1.05, 4),
+                                                         rnd.uniform(-.01, .01, 4))):
+        bead = ((truth[itruth][:-1]*stretch)*8.8e-4+bias).astype('f4')
+        full = [GaussianProductFit(peaks = i).optimize(bead) for i in truth]
+        scr  = [GaussianProductFit(peaks = i, basins = 3).optimize(bead) for i in truth]
+        assert np.argmin([i[0] for i in scr]) == np.argmin([i[0] for i in full])
+
+        full = [PeakGridFit(peaks = i).optimize(bead) for i in truth]
+        scr  = [PeakGridFit(peaks = i, screen = True, timebudget = 1e3).optimize(bead)
+                for i in truth]
+        for i, j in zip(scr, full):
+            assert tuple(i) == approx(tuple(j))
+
 def test_onehairpinid():
     u"tests haipin id method"
     truth = np.array([0., .1, .2, .5, 1.,  1.5], dtype = 'f4')/8.8e-4
@@ -422,6 +502,25 @@ def test_hp_dataframe(record):
     assert 'modification' in pair.columns
     assert hasattr(pair, 'tasklist')
 
+def test_hp_dataframe_batched(monkeypatch):
+    "test that merged fit to hp dataframes are the same, whether batched or not"
+    from peakcalling.processor.fittohairpin._dataframe import FitsDataFrameFactory
+    def _run():
+        return next(iter(create(
+            TrackReaderTask(path = utpath("big_legacy")),
+            EventDetectionTask(),
+            PeakSelectorTask(),
+            FitToHairpinTask(
+                sequence = utpath("hairpins.fasta"),
+                oligos   = "4mer",
+                fit      = ChiSquareFit()
+            ),
+            DataFrameTask(merge = True),
+        ).run()))
+
+    batched = _run()
+    monkeypatch.setattr(FitsDataFrameFactory, 'BATCHED', False)
+    pd.testing.assert_frame_equal(batched, _run(), check_dtype = False)
 
 if __name__ == '__main__':
     test_hp_dataframe(None)
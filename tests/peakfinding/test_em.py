@@ -10,6 +10,7 @@ import numpy as np
 from numpy.testing       import assert_allclose
 
 from peakfinding.groupby import MaxCov
+from peakfinding._core   import emrunners # pylint: disable=import-error
 from tests.testingcore   import path as utfilepath
 
 EMFITTER = MaxCov()
@@ -65,5 +66,56 @@ def test_emstep():
     # ratio of events assigned to each of the 2 peaks
     assert_allclose(rates,np.array([[0.45054946],
                                     [0.54945054]]))
+
+def test_emrunners():
+    'tests fitting multiple starting points at once'
+    inits = [
+        (0.5*np.ones((2,1)), np.array([[0,10,0.,1.5e+01], [0,11,0.,8.8e+01]])),
+        (0.5*np.ones((2,1)), np.array([[0,9,0.,2e+01],    [0,12,0.,9e+01]])),
+        (np.ones((1,1)),     np.array([[0,10,0.,5e+01]]))
+    ]
+    def _run(groups, **kwa):
+        return emrunners(DATA, [i[0] for i in inits], [i[1] for i in inits], groups,
+                         100, 1e-9, 1e-4, **kwa)
+
+    outs = _run([0, 1, 2])
+    assert not any(i.abandoned for i in outs)
+    for (rates, params), out in zip(inits, outs):
+        rates, params = EMFITTER.cfit(DATA,rates,params,100,tol=1e-4)
+        assert_allclose(out.rates,  rates)
+        assert_allclose(out.params, params)
+
+    # runs are independent unless abandoned: threads change nothing
+    for one, other in zip(outs, _run([0, 1, 2], nthreads = 4)):
+        assert_allclose(one.rates,  other.rates)
+        assert_allclose(one.params, other.params)
+        assert one.llikelihood == other.llikelihood
+
+def test_emabandon():
+    'tests abandoning fits which lag the best in their group'
+    inits = [
+        (0.5*np.ones((2,1)), np.array([[0,10,0.,1.5e+01], [0,11,0.,8.8e+01]])),
+        (np.ones((1,1)),     np.array([[0,10,0.,5e+01]]))
+    ]
+    def _run(groups, **kwa):
+        return emrunners(DATA, [i[0] for i in inits], [i[1] for i in inits], groups,
+                         100, 1e-9, 1e-4, minsteps = 1, **kwa)
+
+    # abandoning is off by default
+    assert not any(i.abandoned for i in _run([0, 0]))
+    assert not any(i.abandoned for i in _run([0, 1], abandon = 1e-6))
+
+    # a single peak cannot match the likelihood of the converged 2 peak fit
+    outs = _run([0, 0], abandon = 1e-6)
+    assert not outs[0].abandoned
+    assert outs[1].abandoned
+
+    # abandoning fits is done on a single thread, whatever is asked
+    for _ in range(5):
+        assert [i.abandoned for i in _run([0, 0], abandon = 1e-6, nthreads = 4)] == [False, True]
+
+    assert MaxCov().abandon == 0.
+    assert MaxCov().nthreads == 0
+
 if __name__ == '__main__':
     test_emstep()
@@ -23,7 +23,8 @@ from peakfinding.processor       import (PeakSelectorTask, PeakProbabilityTask,
                                          BaselinePeakTask, MinBiasPeakAlignmentTask,
                                          GELSPeakAlignmentTask)
 from peakfinding.histogram       import Histogram
-from peakfinding.groupby         import CWTPeakFinder,ZeroCrossingPeakFinder, PeakFlagger
+from peakfinding.groupby         import (CWTPeakFinder,ZeroCrossingPeakFinder, PeakFlagger,
+                                         ByGaussianMix)
 from peakfinding.alignment       import PeakCorrelationAlignment, PeakExpectedPositionAlignment
 from peakfinding.reporting.batch import computereporters
 from tests.testingcore           import path as utfilepath
@@ -181,6 +182,30 @@ def test_peakgroupby():
     for i in ret:
         assert all(i == np.array([0, 0, 1, 2]))
 
+def test_gaussianmix():
+    "tests that growing mixtures finds the same peaks as an exhaustive search"
+    data   = randpeaks(30,
+                       seed     = 0,
+                       peaks    = [1., 5., 10., 20.],
+                       brownian = .1,
+                       stretch  = .05,
+                       bias     = .05,
+                       rates    = 1.)
+    events = np.array([[None for j in i] for i in data])
+    for i, j in zip(events, data):
+        for k, val in enumerate(j):
+            i[k] = np.repeat(val, 5)
+
+    def _peaks(**kwa):
+        np.random.seed(0)
+        sel = PeakSelector(finder = ByGaussianMix(**kwa))
+        return np.array([i for i, _ in sel(events, precision = 1.)])
+
+    truth = _peaks(grow = False, critpatience = None)
+    assert len(truth) == 4
+    for patience in (2, 10, None):
+        assert_allclose(_peaks(critpatience = patience), truth, atol = 5e-2)
+
 def test_peakselector():
     "tests peak finding"
     peaks  = [1., 5., 10., 20.]
@@ -311,6 +336,41 @@ def test_dataframe():
     assert 'cycle' in data.index.names
     assert 'peakposition' in data
 
+def test_dataframe_export(tmp_path):
+    "tests writing merged columns to a file per track"
+    import pytest
+    pytest.importorskip("pyarrow")
+    def _run(path):
+        return next(create(utfilepath('big_selected'),
+                           EventDetectionTask(),
+                           PeakSelectorTask(),
+                           DataFrameTask(merge = True, export = str(path))).run())
+
+    data  = _run(tmp_path/"{track}.parquet").reset_index()
+    files = list(tmp_path.glob("*.parquet"))
+    assert [i.name for i in files] == [f"{data.track[0]}.parquet"]
+
+    out   = pd.read_parquet(files[0])
+    assert out.shape[0] == data.shape[0]
+    assert_equal(out.bead.values, data.bead.values)
+    assert_allclose(out.peakposition.values, data.peakposition.values)
+
+    _run(tmp_path/"other.feather")
+    assert (tmp_path/f"other_{data.track[0]}.feather").exists()
+
+def test_dataframe_batched(monkeypatch):
+    "tests that merged dataframes are the same, whether batched or not"
+    from peakfinding.processor.dataframe import PeaksDataFrameFactory
+    def _run():
+        return next(create(utfilepath('big_selected'),
+                           EventDetectionTask(),
+                           PeakSelectorTask(),
+                           DataFrameTask(merge = True, measures = dict(events = True))).run())
+
+    batched = _run()
+    monkeypatch.setattr(PeaksDataFrameFactory, 'BATCHED', False)
+    pd.testing.assert_frame_equal(batched, _run(), check_dtype = False)
+
 def test_singlestrandpeak():
     "test single strand peak"
     data  = Experiment(baseline = None, thermaldrift = None).track(seed = 1)
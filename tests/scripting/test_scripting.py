@@ -186,6 +186,44 @@ def test_tracksdict_custom_dataframe(scriptingcleaner):
     assert 'std' in frame.columns
 
 
+@integrationmark
+def test_tracksdict_split_dataframe(scriptingcleaner):
+    "test that splitting tracks into chunks of beads changes nothing"
+    from concurrent.futures import ThreadPoolExecutor
+    from scripting          import TracksDict
+    from tests.testingcore  import path as utpath
+    import pandas as pd
+    tracks = TracksDict()
+    tracks['xxx'] = utpath("big_legacy")
+    tracks['yyy'] = utpath("big_legacy")
+
+    par  = tracks.peaks.dataframe(process = False)
+    jobs = par.jobs(ThreadPoolExecutor(4))
+    assert len(jobs) > 2
+    assert sorted({i.track for i in jobs}) == [0, 1]
+    assert all(jobs[i].cost >= jobs[i+1].cost for i in range(len(jobs)-1))
+
+    with ThreadPoolExecutor(4) as pool:
+        split = par.process(pool, 'concat')
+    par.split = False
+    nosplit   = par.process(None, 'concat')
+    assert isinstance(split, pd.DataFrame)
+    assert split.shape == nosplit.shape
+    # chunks of beads are concatenated in a different order
+    pd.testing.assert_frame_equal(
+        split.sort_index(kind = 'mergesort'),
+        nosplit.sort_index(kind = 'mergesort')
+    )
+
+    # the shared pool is created on demand and can be shut down
+    from taskmodel.__scripting__.parallel import Parallel
+    pool = Parallel.pool()
+    assert Parallel.pool() is pool
+    Parallel.shutdown()
+    assert Parallel._POOL is None  # pylint: disable=protected-access
+    assert Parallel.pool() is not pool
+    Parallel.shutdown()
+
 @integrationmark
 def test_tracksdict_cleaning_dataframe(scriptingcleaner):
     "test TracksDict.basedataframe"
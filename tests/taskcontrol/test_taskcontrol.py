@@ -3,12 +3,16 @@
 "Test control"
 # pylint: disable=import-error,missing-docstring
 import  numpy
+import  numpy.testing
 from    data.views                  import Cycles, Beads, TrackView
-from    taskcontrol.taskcontrol     import TaskController
-from    taskcontrol.processor       import Processor, Cache, Runner
+from    taskcontrol.taskcontrol     import TaskController, create
+from    taskcontrol.processor       import Processor, Cache, Runner, PROFILER
 from    taskcontrol.processor.track import UndersamplingProcessor
 from    taskcontrol.processor.cache import CacheReplacement
+from    taskcontrol.processor.budget import CacheBudget, BoundedCache
+from    taskcontrol.processor.dataframe import ColumnBuffers
 import  taskmodel                   as     tasks
+from    cleaning.processor          import DataCleaningTask
 
 from    tests.testingcore           import path as utpath
 
@@ -310,5 +314,193 @@ def test_undersampling():
     proc.task.framerate = 30.
     assert proc.binwidth(proc.task, 100.) == 3
 
+def test_columnbuffers():
+    "test the accumulation of columns"
+    buf = ColumnBuffers()
+    assert buf.append(dict(a = numpy.arange(3), b = numpy.ones(3, dtype = 'f4'))) == 3
+    assert buf.append(dict(a = numpy.arange(2), c = 'x')) == 2
+    assert buf.append(dict(a = [], b = [])) == 0
+    assert buf.sizes == [3, 2, 0]
+
+    cols = buf.columns()
+    assert list(cols) == ['a', 'b', 'c']
+    assert list(cols['a']) == [0, 1, 2, 0, 1]
+    assert list(cols['b'][:3]) == [1.]*3 and numpy.isnan(cols['b'][3:]).all()
+    assert list(cols['c'][3:]) == ['x', 'x']
+    assert ColumnBuffers().columns() == {}
+
+def test_profiler():
+    "test profiling processor actions"
+    proc = create(tasks.TrackReaderTask(path = utpath("big_legacy")), DataCleaningTask())
+    with PROFILER(trace = True) as prof:
+        prof.clear()
+        assert next(iter(proc.run()))[0] is not None
+
+    tbl = prof.dataframe()
+    assert 'DataCleaningProcessor' in set(tbl.processor)
+    assert set(tbl[tbl.processor == 'DataCleaningProcessor'].bead) == {0}
+    assert (tbl.calls > 0).all()
+    assert (tbl.bytes > 0).any()
+
+    trace = prof.chrometrace()['traceEvents']
+    assert len(trace) == tbl.calls.sum()
+    assert all(i['ph'] == 'X' and i['dur'] >= 0 for i in trace)
+
+    # nothing is recorded once disabled
+    assert next(iter(proc.run()))[0] is not None
+    assert len(prof.chrometrace()['traceEvents']) == len(trace)
+
+def test_cachebudget():
+    "test the memory-bounded processor caches"
+    budget = CacheBudget(maxbytes = 5*8000+1000)
+    cheap  = BoundedCache(name = 'cheap', cost = 1., budget = budget)
+    costly = BoundedCache(name = 'costly', cost = 10., budget = budget)
+    for i in range(4):
+        cheap[i] = numpy.zeros(1000)
+    assert cheap.get(0) is not None
+    for i in range(3):
+        costly[i] = numpy.zeros(1000)
+
+    # the least recently used cheap entries are evicted first
+    assert sorted(cheap) == [0, 3]
+    assert sorted(costly) == [0, 1, 2]
+    assert budget.nbytes == cheap.nbytes + costly.nbytes <= budget.maxbytes
+    assert [i.name for i in budget.usage()] == ['costly', 'cheap']
+
+    del cheap
+    assert budget.nbytes == costly.nbytes
+
+    proc  = create(tasks.TrackReaderTask(path = utpath("big_legacy")), DataCleaningTask())
+    assert next(iter(proc.run()))[0] is not None
+    cache = proc.data[1].cache()
+    assert isinstance(cache, BoundedCache)
+    assert proc.data[1].nbytes > 0
+
+def _countcalls(monkeypatch):
+    "counts the calls to the track reader and the data cleaning processors"
+    from taskcontrol.processor.track           import TrackReaderProcessor
+    from cleaning.processor._datacleaning      import DataCleaningProcessor
+    calls = {'reader': 0, 'cleaning': 0, 'action': 0}
+
+    def _count(name, fcn):
+        def _fcn(*args, **kwa):
+            calls[name] += 1
+            return fcn(*args, **kwa)
+        return _fcn
+
+    monkeypatch.setattr(TrackReaderProcessor,  'run', _count('reader', TrackReaderProcessor.run))
+    monkeypatch.setattr(DataCleaningProcessor, 'run', _count('cleaning', DataCleaningProcessor.run))
+    monkeypatch.setattr(DataCleaningProcessor, '_compute',
+                        classmethod(_count('action', DataCleaningProcessor._compute.__func__)))
+    return calls
+
+def test_pinnedoutput(monkeypatch):
+    "test restarting downstream tasks from the pinned output of upstream tasks"
+    from taskcontrol.processor.runner import PinnedItems
+    tsks  = (tasks.TrackReaderTask(path = utpath("big_legacy")),
+             DataCleaningTask(), tasks.CycleCreatorTask())
+    ref   = next(iter(create(*tsks).run()))[0,0]
+    calls = _countcalls(monkeypatch)
+
+    proc  = create(*tsks)
+    proc.update(tsks[2])
+    assert proc.data[1].pinning
+    numpy.testing.assert_allclose(next(iter(proc.run()))[0,0], ref)
+    assert calls == {'reader': 1, 'cleaning': 1, 'action': 1}
+
+    pinned = proc.data[1].pinned[1][0].data
+    assert isinstance(pinned, PinnedItems)
+    assert 0 in pinned.store
+    assert 0 in tuple(pinned.keys())
+
+    # editing a downstream task keeps the pinned output: upstream tasks are not walked again
+    calls.update(reader = 0, cleaning = 0, action = 0)
+    proc.update(tsks[2])
+    assert proc.data[1].pinned[1][0].data is pinned
+    numpy.testing.assert_allclose(next(iter(proc.run()))[0,0], ref)
+    numpy.testing.assert_allclose(next(iter(proc.run()))[0,0], ref)
+    assert calls == {'reader': 0, 'cleaning': 0, 'action': 0}
+
+    # editing the pinned task discards its output
+    proc.update(tsks[1])
+    assert proc.data[1].pinned is None and not proc.data[1].pinning
+    numpy.testing.assert_allclose(next(iter(proc.run()))[0,0], ref)
+    assert calls == {'reader': 1, 'cleaning': 1, 'action': 1}
+
+    # as does editing an earlier task
+    proc.update(tsks[2])
+    assert next(iter(proc.run()))[0,0] is not None
+    assert proc.data[1].pinned is not None
+    proc.data.delcache(0)
+    assert proc.data[1].pinned is None and not proc.data[1].pinning
+
+def test_pinnedlatency(monkeypatch):
+    "test the edit-to-redraw latency recorded by plots, with and without pinned outputs"
+    from taskview.plots.tasks import TaskPlotCreator
+
+    class _Model:
+        impacted = True
+        def impacts(self, *_):
+            return self.impacted
+
+    class _Plot(TaskPlotCreator):  # pylint: disable=abstract-method
+        def __init__(self, proc): # pylint: disable=super-init-not-called
+            self._model = _Model()
+            self.proc   = proc
+
+        def reset(self, _):
+            assert next(iter(self.proc.run()))[0,0] is not None
+
+        def _addtodoc(self, ctrl, doc, *_):
+            pass
+
+        def _reset(self, cache):
+            pass
+
+    tsks  = (tasks.TrackReaderTask(path = utpath("big_legacy")),
+             DataCleaningTask(), tasks.CycleCreatorTask())
+    calls = _countcalls(monkeypatch)
+
+    def _redraw(name, edit):
+        proc = create(*tsks)
+        plot = type(name, (_Plot,), {})(proc)
+        edit(proc)
+        plot.reset(False)
+        calls.update(reader = 0, cleaning = 0, action = 0)
+        for _ in range(5):
+            edit(proc)
+            later: list = []
+            plot._onchangetask(parent = None, task = tsks[2], calllater = later)
+            assert len(later) == 1
+            later[0]()
+
+        plot._model.impacted = False
+        later = []
+        plot._onchangetask(parent = None, task = tsks[2], calllater = later)
+        assert later == []
+        return dict(calls)
+
+    with PROFILER() as prof:
+        prof.clear()
+        walked = _redraw('walked', lambda proc: proc.data.delcache(2))
+        pinned = _redraw('pinned', lambda proc: proc.update(tsks[2]))
+
+    # pinned outputs spare walking through upstream tasks
+    assert walked == {'reader': 5, 'cleaning': 5, 'action': 0}
+    assert pinned == {'reader': 0, 'cleaning': 0, 'action': 0}
+
+    tbl = prof.dataframe()
+    tbl = tbl[tbl.processor == 'edit-to-redraw'].set_index('bead')
+    assert sorted(tbl.index) == ['pinned', 'walked']
+    assert (tbl.calls == 5).all()
+
+    # nothing is recorded once disabled
+    size  = len(prof.dataframe())
+    plot  = _Plot(create(*tsks))
+    later = []
+    plot._onchangetask(parent = None, task = tsks[2], calllater = later)
+    later[0]()
+    assert len(prof.dataframe()) == size
+
 if __name__ == '__main__':
     test_undersampling()
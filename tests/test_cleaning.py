@@ -97,6 +97,32 @@ def test_datacleaning():
     assert list(out.min) == []
     assert list(out.max) == list(range(10))
 
+def test_fusedcleaning():
+    "test that all rules evaluated in a single pass give the same results"
+    setseed(0)
+    bead = np.random.normal(.1, 3e-3, 1000).astype('f4')
+    for i in range(70, 1000, 100):
+        bead[i:i+10] += .02
+    bead[250:300]       += 1
+    bead[400:500:3]      = np.NaN
+    bead[600:700]       *= 10.
+
+    core  = cleaningcore.DataCleaning()
+    cycs  = list(range(0, 1000, 100)), list(range(100, 1001, 100))
+    sat   = (list(range(0, 1000, 100)), list(range(30, 1000, 100)),
+             list(range(50, 1000, 100)), list(range(90, 1000, 100)))
+    truth = (core.population(bead, *cycs), core.hfsigma(bead, *cycs),
+             core.extent(bead, *cycs),     core.pingpong(bead, *cycs),
+             core.saturation(bead, *sat))
+    for ppc in ((5., 95.), (10., 90.)):
+        core.pingpongpercentiles = ppc
+        truth = truth[:3] + (core.pingpong(bead, *cycs),) + truth[4:]
+        for i, j in zip(core.fused(bead, *cycs, *sat), truth):
+            assert i.name == j.name
+            assert_equal(i.min,    j.min)
+            assert_equal(i.max,    j.max)
+            assert_equal(i.values, j.values)
+
 def test_phasejump():
     "test phase jumps"
     num_jumps = 7
@@ -4,6 +4,7 @@
 import pickle
 from   typing                 import cast
 
+import pytest
 import pandas as pd
 import numpy  as np
 from   numpy.testing             import assert_allclose
@@ -27,7 +28,7 @@ from eventdetection.alignment import (ExtremumAlignment, CorrelationAlignment,
 from eventdetection.processor import (ExtremumAlignmentProcessor, AlignmentTactic,
                                       EventDetectionTask, ExtremumAlignmentTask,
                                       BiasRemovalTask)
-from eventdetection.data      import Events
+from eventdetection.data      import Events, EventIndex, EventIndexCache
 from eventdetection           import samples
 from taskcontrol.taskcontrol  import create
 from simulator                import randtrack
@@ -80,6 +81,26 @@ def test_cpp_splits():
     ints = MultiGradeSplitDetector()(data, 3e-3)
     assert tuple(tuple(i) for i in ints) == ((0,12), (19, 41), (44,48), (52, 70))
 
+def test_cpp_splits_allcycles():
+    "test splitting all cycles at once, with threads"
+    np.random.seed(0)
+    data   = np.random.normal(0, 3e-3, 5000).astype('f4')
+    data  += np.repeat(np.arange(100, dtype = 'f4')*.05, 50)
+    data[::37] = np.NaN
+    first  = np.arange(0, 4900, 97, dtype = 'i4')
+    last   = (first+np.arange(len(first), dtype = 'i4') % 7 * 10 + 40).astype('i4')
+    for cnf in (MultiGradeSplitDetector(), DerivateSplitDetector(), ChiSquareSplitDetector()):
+        ref = [cnf(data[i:j], 3e-3) for i, j in zip(first, last)]
+        for nthreads in (1, 4, 0):
+            out = cnf(data, 3e-3, first, last, nthreads)
+            assert len(out) == len(ref)
+            assert all(np.array_equal(i, j) for i, j in zip(out, ref))
+
+    det = Events().events
+    ref = [det.compute(data[i:j], 3e-3) for i, j in zip(first, last)]
+    out = det.computeall(data, 3e-3, first, last, nthreads = 4)
+    assert all(np.array_equal(i, j) for i, j in zip(out, ref))
+
 def test_detectsplits():
     "Tests flat stretches detection"
     inst  = PyDerivateSplitDetector(precision = 1., confidence = 0.1, window = 1, erode = 0)
@@ -346,6 +367,34 @@ def test_minmaxalign():
     for tpe in 'left', 'right':
         assert_allclose(PhaseEdgeAlignment.run(data, edge = tpe), truth)
 
+def test_beadbiases():
+    "all phase biases in a single native call"
+    from eventdetection._core import (  # pylint: disable=import-error,no-name-in-module
+        beadbiases, measureend, PhaseEdgeAlignment as _Edge, PhaseEdgeAlignmentMode
+    )
+    track = randtrack(driftargs = None, baselineargs = (.1, .05, 'rand'))
+    bead  = np.copy(track.beads[0])
+    cols  = [PHASE.initial, PHASE.initial+1, PHASE.pull, PHASE.pull+1,
+             PHASE.measure, PHASE.measure+1]
+    table = np.ascontiguousarray(track.phase.select(..., cols).T, dtype = 'i4')
+    res   = beadbiases(bead, table, 15, PhaseEdgeAlignmentMode.left, 25.)
+    assert len(res) == 3
+    for i, (mode, perc) in enumerate([('left', 25.), ('left', 75.), ('right', 25.)]):
+        align = _Edge(window     = 15,
+                      mode       = getattr(PhaseEdgeAlignmentMode, mode),
+                      percentile = perc)
+        assert_allclose(res[i], align.compute(bead, table[2*i], table[2*i+1]))
+
+    cols  = [0, PHASE.measure, PHASE.measure+1, PHASE.relax, PHASE.relax+1]
+    table = np.ascontiguousarray(track.phase.select(..., cols).T, dtype = 'i4')
+    truth = np.copy(bead)
+    ends  = np.append(table[0,1:], len(truth))
+    for i in range(track.ncycles):
+        truth[table[0,i]:ends[i]] -= np.nanmean(truth[table[1,i]:table[2,i]][-10:])
+    pos   = measureend(bead, table, -10, -30)
+    assert_allclose(bead, truth, atol = 1e-5)
+    assert_allclose(pos, [np.nanmean(truth[i:j][-30:]) for i, j in table[3:].T], atol = 1e-5)
+
 def test_minmaxprocessor():
     "align on min/max value"
     track   = randtrack(driftargs = None, baselineargs = (.1, None, 'rand'))
@@ -469,6 +518,63 @@ def test_precision():
     sim   = np.sum(sizes >= data.events.select.minduration, 1)
     assert list(np.nonzero(found-sim-1)[0]) == []
 
+def test_eventindex():
+    "tests the per-bead event index"
+    track  = randtrack(durations = [15,  30,  15,  60,  60, 200,  15, 100],
+                       drift     = None,
+                       baseline  = None,
+                       poisson   = dict(rates = [.05, .05, .1, .1, .2, .2],
+                                        sizes = [20,   10, 20, 10, 20, 10],
+                                        peaks = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
+                                        store = ['sizes']),
+                       seed      = 0,
+                       nbeads    = 2,
+                       ncycles   = 20)
+
+    data            = track.beads.new(Events)
+    data.indexcache = EventIndexCache()
+    index           = data.eventindex(1)
+    assert isinstance(index, EventIndex)
+    assert data.eventindex(1) is index
+    assert data[...].eventindex(1) is index
+
+    cycles = list(data[1,...])
+    assert list(index.cycles) == [i[1] for i, _ in cycles]
+    assert len(index)         == sum(len(i) for _, i in cycles)
+    for icyc, evts in cycles:
+        rng = index.cycleslice(icyc[1])
+        assert list(index.start[rng])  == list(evts['start'])
+        assert list(index.length[rng]) == [len(i) for i in evts['data']]
+        assert_allclose(index.mean[rng], [np.nanmean(i) for i in evts['data']], rtol = 1e-5)
+        assert_allclose(index.std[rng],  [np.nanstd(i)  for i in evts['data']],
+                        rtol = 1e-3, atol = 1e-6)
+    assert index.cycleslice(1000) is None
+
+    # copies share their data with the index, read-only
+    copies = index.readonlyevents()
+    assert len(copies) == len(index.events)
+    for cpy, orig in zip(copies, index.events):
+        assert cpy is not orig
+        assert list(cpy['start']) == list(orig['start'])
+        for i, j in zip(cpy['data'], orig['data']):
+            np.testing.assert_equal(i, j)
+            assert np.shares_memory(i, j)
+            with pytest.raises(ValueError):
+                i[:] = -1000.
+        if len(cpy):
+            cpy['data'][0] = cpy['data'][0]-1000.
+    assert not any((j <= -900.).any() for i in index.events for j in i['data'])
+
+    # indexes count against a memory budget and are recomputed once evicted
+    from taskcontrol.processor.budget import CacheBudget
+    data.indexcache = EventIndexCache(budget = CacheBudget())
+    index           = data.eventindex(1)
+    assert data.indexcache.nbytes > 0
+    data.indexcache.budget.evict(0)
+    assert len(data.indexcache) == 0
+    assert data.eventindex(1) is not index
+    assert list(data.eventindex(1).cycles) == list(index.cycles)
+
 def test_dataframe():
     "tests dataframe production"
     data = next(create(utfilepath('big_selected'),
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"Tests excel & csv reports"
+import openpyxl
+
+from excelreports.creation import writecolumns
+
+# more lines than are written at once
+ITEMS = [('ints',   list(range(10000))),
+         ('floats', [i*.5 for i in range(5000)])]
+
+def test_xlsx(tmp_path):
+    "tests writing then reading an xlsx file"
+    path = tmp_path/"report.xlsx"
+    writecolumns(path, "sheet", ITEMS)
+
+    book = openpyxl.load_workbook(str(path), read_only = True)
+    rows = list(book["sheet"].iter_rows(values_only = True))
+    book.close()
+
+    assert rows[0] == ('ints', 'floats')
+    assert len(rows) == 10001
+    assert [i[0] for i in rows[1:]] == ITEMS[0][1]
+    assert [i[1] for i in rows[1:5001]] == ITEMS[1][1]
+    assert all(len(i) < 2 or i[1] is None for i in rows[5001:])
+
+def test_csv(tmp_path):
+    "tests writing then reading a csv file"
+    path = tmp_path/"report.csv"
+    writecolumns(path, "sheet", ITEMS)
+
+    with open(path, encoding = 'utf-8') as stream:
+        rows = [
+            [j.strip() for j in i.split(';')[:-1]]
+            for i in stream
+            if i.strip() and not i.startswith('#')
+        ]
+
+    assert rows[0] == ['ints', 'floats']
+    assert len(rows) == 10001
+    assert [int(i[0]) for i in rows[1:]] == ITEMS[0][1]
+    assert [float(i[1]) for i in rows[1:5001]] == ITEMS[1][1]
+    assert all(i[1] == '' for i in rows[5001:])
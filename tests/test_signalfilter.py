@@ -6,7 +6,8 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from signalfilter  import (ForwardBackwardFilter, NonLinearFilter, hfsigma, nanhfsigma,
-                           nancount, nanthreshold)
+                           nancount, nanthreshold, PrecisionAlg, PrecisionCache,
+                           PRECISIONS)
 
 
 def test_nl_bf_filters():
@@ -37,6 +38,32 @@ def test_nl_bf_filters():
         assert_allclose(truth[47:53], arr[47:53], atol = 1e-5)
         assert_allclose(truth[55:], arr[55:])
 
+def test_batch_filters():
+    u"Tests filtering many arrays in one call"
+    from data.views import TrackView
+    rng = np.random.RandomState(0)
+    for cls in (ForwardBackwardFilter, NonLinearFilter):
+        args   = cls()
+        ragged = [rng.normal(size = i).astype('f4') for i in (50, 100, 3, 0, 75)]
+        truth  = [args(np.copy(i)) for i in ragged]
+        res    = args.batch([np.copy(i) for i in ragged], nthreads = 2)
+        assert len(res) == len(truth)
+        for i, j in zip(res, truth):
+            assert_allclose(i, j)
+
+        block  = rng.normal(size = (4, 60)).astype('f4')
+        truth  = np.array([args(np.copy(i)) for i in block])
+        assert_allclose(args.batch(block), truth)
+        assert_allclose(block, truth)
+
+        data   = {i: j for i, j in enumerate(ragged)}
+        view   = TrackView(data = {i: np.copy(j) for i, j in data.items()})
+        view.batchsize = 2
+        res    = dict(view.withfunction(args))
+        assert set(res) == set(data)
+        for i, j in res.items():
+            assert_allclose(j, args(np.copy(data[i])))
+
 def test_hfsigma():
     u"Tests ForwardBackwardFilter, NonLinearFilter"
     arr = np.arange(10)*1.
@@ -51,6 +78,31 @@ def test_hfsigma():
     arr = np.insert(arr, range(0, 20, 2), np.nan)
     assert nanhfsigma(arr) == np.median(np.diff(arr[np.isfinite(arr)]))
 
+def test_precisioncache():
+    u"Tests the memoized precisions"
+    cache = PrecisionCache(maxsize = 2)
+    arr   = np.random.normal(0., 1e-2, 1000).astype('f4')
+    arr[::7] = np.nan
+    assert cache.hfsigma(arr) == nanhfsigma(arr)
+    assert cache.hfsigma(np.copy(arr)) == nanhfsigma(arr)
+    assert len(cache) == 1
+
+    arr[::2] *= 2.  # changes in place are detected
+    assert cache.hfsigma(arr) == nanhfsigma(arr)
+    assert len(cache) == 2
+
+    assert cache.hfsigma(arr[::3]) == nanhfsigma(arr[::3])
+    assert len(cache) == 2
+
+    assert cache.hfsigma([1., 2., 4.]) == nanhfsigma([1., 2., 4.])
+    assert len(cache) == 2
+
+    PRECISIONS.clear()
+    alg = PrecisionAlg()
+    assert alg.getprecision(None, arr) == max(alg.MINPRECISION, nanhfsigma(arr))
+    assert alg.getprecision(None, arr) == max(alg.MINPRECISION, nanhfsigma(arr))
+    assert len(PRECISIONS) == 1
+
 def test_nancount():
     u"Tests ForwardBackwardFilter, NonLinearFilter"
     arr = np.arange(10)*1.
@@ -47,6 +47,21 @@ def test_track_simulator():
     assert_allclose(bline[0], [1.]*149)
     assert_allclose(bline[1], [np.cos(.4*np.pi)]*149)
 
+def test_batched_track_simulator():
+    u"testing batched & parallel raw data simulation"
+    sim  = TrackSimulator(ncycles = 20)
+    one  = sim.track(5, seed = 1, nprocs = 1)
+    two  = sim.track(5, seed = 1, nprocs = 2)
+    assert set(one.data) == set(two.data) == set(range(5))
+    for i in range(5):
+        assert one.data[i].shape == (149*20,)
+        assert_allclose(one.data[i], two.data[i])
+
+    # each bead only depends on the seed and its index
+    assert_allclose(sim.batch(1, [3])[0][3], one.data[3])
+    assert any(one.data[0] != one.data[1])
+    assert any(one.data[0] != sim.track(1, seed = 2, nprocs = 1).data[0])
+
 def test_peak_simulator():
     u"testing peak data simulation"
     res = randpeaks(100, peaks = np.array([10, 20, 30]), rates = .5, seed = 0)
@@ -130,5 +145,22 @@ def test_bindings():
 
     assert_allclose([hfsigma(_bind.Baseline()(3000))], [_bind.Baseline().sigma], atol = 1e-4)
 
+def test_gaussianmix_benchmark():
+    "tests comparing grown and exhaustive gaussian mixtures on simulated beads"
+    # pylint: disable=import-outside-toplevel
+    from simulator.benchmark import GaussianMixBenchmark, PeakBenchmarkJob
+    out = GaussianMixBenchmark(job = PeakBenchmarkJob(nbeads = 2)).run(1, nthreads = 1)
+    assert sorted(out.index) == ['exhaustive', 'grown']
+    assert (out.clock > 0).all()
+    assert 'bind' in out.columns
+
+def test_hairpinscreening_benchmark():
+    "tests comparing screened and exhaustive hairpin fits on simulated beads"
+    # pylint: disable=import-outside-toplevel
+    from simulator.benchmark import HairpinScreeningBenchmark
+    out = HairpinScreeningBenchmark().run(5)
+    assert sorted(out.index) == ['GaussianProductFit', 'PeakGridFit']
+    assert out.agreement['PeakGridFit'] == 1.
+
 if __name__ == '__main__':
     test_bindings()
@@ -15,7 +15,7 @@ from   data.trackio     import LegacyGRFilesIO, savetrack, PickleIO, LegacyTrack
 from   data.trackio     import MuWellsFilesIO
 from   data.track       import FoV, Track
 from   data.trackops    import (
-    concatenatetracks, selectcycles, dropbeads, clone, dataframe, undersample
+    concatenatetracks, selectcycles, dropbeads, selectbeads, clone, dataframe, undersample
 )
 from   data.tracksdict  import TracksDict
 from   tests.testingcore      import path as utpath
@@ -217,6 +217,34 @@ def test_cycles_copy():
     vals1[:] = 0
     assert not np.array_equal(vals1, vals2)
 
+def test_copyelision():
+    "tests that copies are only made when needed"
+    from data.views         import allocates, inplace, viewing
+    from data.views._config import _m_copy, _m_elide
+    alloc = allocates(lambda _, i: i, lambda _, i: i)
+    view  = viewing(lambda _, i: i)
+    inpl  = inplace(lambda _, i: i)
+    other = lambda _, i: i
+    assert _m_elide([_m_copy, alloc],        False) == ([alloc],                 True)
+    assert _m_elide([_m_copy, view, inpl],   False) == ([view, _m_copy, inpl],   True)
+    assert _m_elide([_m_copy, inpl, alloc],  False) == ([_m_copy, inpl, alloc.owned], True)
+    assert _m_elide([_m_copy, other, alloc], False) == ([_m_copy, other, alloc], True)
+    assert _m_elide([_m_copy, inpl],         True)  == ([inpl],                  True)
+    assert _m_elide([view],                  False) == ([view],                  False)
+
+    def _double(_, info):
+        info[1][:] *= 2.
+        return info
+
+    track = data.Track(path = utpath("big_legacy"))
+    orig  = np.copy(track.data[0])
+    inner = track.beads.withcopy(True).withaction(inplace(_double))
+    outer = inner.new().withcopy(True).withaction(inplace(_double))
+    assert outer.ownsdata()
+    assert outer.getaction(outer.actions[:1]) is None
+    assert_allclose(outer[0], orig*4.)
+    assert_equal(track.data[0], orig)
+
 def test_loadgrdir():
     paths = utpath("big_legacy"), utpath("big_grlegacy")
     for time in range(2):
@@ -282,6 +310,29 @@ def test_muwells(tmp_path):
     ))
     assert paths
 
+    cnf  = MuWellsFilesIO.DEFAULT
+    fast = MuWellsFilesIO.readframes(paths[1], cnf)
+    slow = MuWellsFilesIO.readframes(paths[1], type(cnf)(fastparse = False))
+    assert fast.shape == slow.shape
+    assert_allclose(fast.values, slow.values)
+
+    # the cached frame is shared but never written to
+    values = MuWellsFilesIO.readframes(paths[1], cnf).values.copy()
+    MuWellsFilesIO.open(paths)
+    assert_allclose(MuWellsFilesIO.readframes(paths[1], cnf).values, values)
+
+    # the cache is bounded by the memory it uses
+    cache          = type(MuWellsFilesIO.CACHE)()
+    cache.maxbytes = int(cache.nbytes(fast)*1.5)
+    cache.set('fast', fast)
+    assert cache.get('fast') is fast
+    cache.set('slow', slow)
+    assert cache.get('fast') is None
+    assert cache.get('slow') is slow
+    cache.maxbytes = 10
+    cache.set('fast', fast)
+    assert cache.get('fast') is None
+
     output = MuWellsFilesIO.open(paths)
     assert output['phases'].shape == (32, 8)
     assert output['sequencelength'] == {0: None}
@@ -461,6 +512,55 @@ def test_selectcycles():
     assert set(other.beads.keys()) == set(trk.beads.keys())
     assert_allclose(other.phases[0,:], trk.phases[0,:]-trk.phases[0,0])
 
+def test_selectcycles_nocopy():
+    'test that contiguous cycle selections share the original memory'
+    trk   = Track(path = utpath("big_legacy"))
+    other = selectcycles(trk, range(2, 5))
+    assert not trk.isloaded
+    assert other.ncycles == 3
+
+    trk.load()
+    first = trk.phases[0,0]
+    i1, i2, i4, i5 = (trk.phases[i,0]-first for i in (2, 3, 4, 5))
+    ref   = selectcycles(trk, [2, 3, 4])
+    assert_allclose(other.phases, ref.phases)
+    for i, j in ref.beads:
+        assert_equal(other.data[i], j)
+        assert_equal(j, trk.data[i][i1:i5])
+        assert np.shares_memory(ref.data[i], trk.data[i])
+    assert_equal(other.secondaries.zmag, ref.secondaries.zmag)
+
+    # non-contiguous selections are copied
+    copied = selectcycles(trk, [2, 4])
+    for i, j in copied.beads:
+        assert_equal(j, np.concatenate([trk.data[i][i1:i2], trk.data[i][i4:i5]]))
+        assert not np.shares_memory(j, trk.data[i])
+    assert_equal(copied.data[0][:i2-i1], ref.data[0][:i2-i1])
+
+    # contiguous selections alias the parent: in-place changes are shared
+    ref.data[0][0] = 123.25
+    assert trk.data[0][i1] == 123.25
+    assert copied.data[0][0] != 123.25
+
+def test_dropbeads_partialread():
+    'test that beads can be dropped before reading the track'
+    trk   = Track(path = utpath("big_legacy"))
+    other = dropbeads(trk, 0, 1)
+    assert not trk.isloaded
+    assert other.isloaded
+
+    trk.load()
+    assert set(other.data.keys()) == set(trk.data.keys()) - {0, 1}
+    assert set(other.fov.beads) == set(trk.fov.beads) - {0, 1}
+    for i in other.data:
+        assert_equal(other.data[i], trk.data[i])
+    assert_equal(other.secondaries.zmag, trk.secondaries.zmag)
+    assert_equal(other.phases, trk.phases)
+
+    sel = selectbeads(Track(path = utpath("big_legacy")), 2, 3)
+    assert set(sel.data.keys()) == {2, 3}
+    assert_equal(sel.data[2], trk.data[2])
+
 def test_dataframe():
     'test whether two Track stack properly'
     trk = Track(path = utpath("small_legacy"))
@@ -541,6 +641,26 @@ def test_beadstats():
     trk1.rawprecision("normalized")
     assert abs(trk1.rawprecision(0) - 0.0018470539168144264) < 1e-5
 
+def test_beadstats_batch():
+    "test batch bead statistics are those computed bead per bead"
+    trk1  = Track(path = utpath("big_legacy"))
+    beads = list(trk1.beads.keys())
+    exts  = trk1.beadextensions(beads)
+    pos   = trk1.phasepositions(1, beads)
+    for i in beads:
+        assert np.isnan(exts[i]) == np.isnan(trk1.beadextension(i))
+        assert np.nan_to_num(abs(exts[i] - trk1.beadextension(i))) < 1e-5
+        assert np.nan_to_num(abs(pos[i] - trk1.phaseposition(1, i))) < 1e-5
+
+    for phases in (None, (1, 5), {1: .5, 3: .5}):
+        computer = trk1._rawprecisions.computer.function(trk1.beads, phases)
+        batch    = dict(trk1.rawprecision(beads, phases))
+        assert all(abs(batch[i] - computer(i)) < 1e-6 for i in beads)
+
+    trk1._rawprecisions.cache.clear()
+    dict(trk1.rawprecision(...))
+    assert set(trk1._rawprecisions.cache) == set(beads)
+
 def test_resampling():
     "test resampling"
     track = Track(path = utpath("big_legacy"))
@@ -16,5 +16,94 @@ def test_file():
             assert taskstore.load(i) is not None
         assert taskstore.load(_utpath("reportv2.xlsx"), fromxlsx = True) is not None
 
+def test_memo():
+    "tests memoized encodings"
+    # pylint: disable=import-outside-toplevel
+    from taskmodel.track          import TrackReaderTask, CycleSamplingTask
+    from eventdetection.processor import EventDetectionTask
+    from peakfinding.processor    import PeakSelectorTask
+    model = [TrackReaderTask(path = "dummy.trk"), CycleSamplingTask(cycles = slice(0, 10)),
+             EventDetectionTask(), PeakSelectorTask()]
+    store = taskstore.MemoizedStore()
+    first = store.dumps(model, sort_keys = True)
+    assert first == taskstore.dumps(model, sort_keys = True)
+    assert store.dumps(model, sort_keys = True) is first
+
+    model[1].cycles = slice(0, 5)
+    second = store.dumps(model, sort_keys = True)
+    assert second != first
+    assert second == taskstore.dumps(model, sort_keys = True)
+
+    loaded = store.loads(second)
+    assert taskstore.dumps(loaded, sort_keys = True) == second
+    assert loaded[2] is not model[2]
+
+    # mutable attributes can change in place
+    model[0].path = ["dummy.trk"]
+    third         = store.dumps(model, sort_keys = True)
+    model[0].path.append("other.trk")
+    fourth        = store.dumps(model, sort_keys = True)
+    assert third != fourth
+    assert fourth == taskstore.dumps(model, sort_keys = True)
+
+    # strings encoded elsewhere are patched only once
+    foreign = taskstore.dumps(model)
+    assert store.loads(foreign) == model
+    assert store.loads(foreign) is not store.loads(foreign)
+    assert store.loads(foreign) == model
+
+def test_memoload(tmp_path):
+    "tests memoized file loads"
+    # pylint: disable=import-outside-toplevel
+    from taskmodel.track          import TrackReaderTask
+    from eventdetection.processor import EventDetectionTask
+    path  = tmp_path/"model.ana"
+    store = taskstore.MemoizedStore()
+    model = [TrackReaderTask(path = "dummy.trk")]
+    path.write_text(taskstore.dumps(model), encoding = "utf-8")
+    first = store.load(path)
+    assert first == taskstore.load(path)
+    assert store.load(path) == first
+    assert store.load(path) is not first
+
+    model.append(EventDetectionTask())
+    path.write_text(taskstore.dumps(model), encoding = "utf-8")
+    assert len(store.load(path)) == 2
+
+def test_memo_models(monkeypatch):
+    "tests that realistic model sets are encoded only once"
+    # pylint: disable=import-outside-toplevel
+    from taskmodel.track          import TrackReaderTask, CycleSamplingTask
+    from cleaning.processor       import DataCleaningTask
+    from eventdetection.processor import ExtremumAlignmentTask, EventDetectionTask
+    from peakfinding.processor    import PeakSelectorTask
+    import taskstore._memo        as     memo
+    models = [
+        [
+            TrackReaderTask(path = f"dummy{i}.trk"),
+            CycleSamplingTask(cycles = slice(0, 10+i)),
+            DataCleaningTask(),
+            ExtremumAlignmentTask(),
+            EventDetectionTask(),
+            PeakSelectorTask()
+        ]
+        for i in range(20)
+    ]
+    ref   = [taskstore.dumps(i, sort_keys = True) for i in models]
+    calls = []
+    def _dumps(*args, **kwa):
+        calls.append(args[0])
+        return taskstore.dumps(*args, **kwa)
+    monkeypatch.setattr(memo, 'dumps', _dumps)
+
+    store = taskstore.MemoizedStore()
+    for _ in range(5):
+        assert [store.dumps(i, sort_keys = True) for i in models] == ref
+    assert len(calls) == len(models)
+
+    models[3][1].cycles = slice(0, 5)
+    assert store.dumps(models[3], sort_keys = True) != ref[3]
+    assert len(calls) == len(models)+1
+
 if __name__ == '__main__':
     test_file()